@@ -1,3 +1,4 @@
 from app.api.endpoints.file import router as file_router
 from app.api.endpoints.health import router as health_router
+from app.api.endpoints.job import router as job_router
 from app.api.endpoints.transform import router as transform_router
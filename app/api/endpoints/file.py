@@ -1,19 +1,29 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile
 
+from app.dtos.upload.response import FileSchemaResponse
 from app.services.file import upload_service
 
 router = APIRouter()
 
 
 @router.post("/upload")
-async def store_file(file: UploadFile = File(...)):
+async def store_file(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Store CSV file in a local directory with a unique ID as the filename.
 
     Args:
         file: CSV file to store
     """
-    return await upload_service.upload_file(file)
+    return await upload_service.upload_file(file, background_tasks)
+
+
+@router.get("/{filename}/schema", response_model=FileSchemaResponse)
+async def get_file_schema(filename: str):
+    """
+    Get the schema of an uploaded file: column names, dtypes, whether they
+    have missing values and the categories of low-cardinality text columns.
+    """
+    return await upload_service.get_schema(filename)
 
 
 @router.delete("/{filename}")
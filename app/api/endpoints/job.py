@@ -0,0 +1,79 @@
+from dataclasses import asdict
+
+import aiofiles
+from fastapi import APIRouter, status
+from fastapi.responses import StreamingResponse
+
+from app.api.endpoints.transform import execution_options
+from app.configs.base import settings
+from app.dtos.base import OkResponse
+from app.dtos.transform.request import TransformFromJsonRequest
+from app.dtos.transform.response import JobResponse
+from app.services.jobs import job_manager
+from app.services.transform.pipeline import TransformationPipeline
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobResponse,
+)
+async def submit_job(request: TransformFromJsonRequest):
+    """
+    Queue a pipeline execution and return its job without waiting for it.
+
+    Args:
+        filename: CSV file to transform
+        pipeline: Pipeline configuration in request body
+        streaming: Whether to execute the pipeline chunk by chunk
+        project_columns: Whether to load and return only referenced columns
+        optimize: Whether to execute an optimized plan of the pipeline
+        engine: Engine executing the steps, 'pandas' or 'polars'
+        limit: Maximum number of result rows to keep
+        offset: Number of result rows to skip
+    """
+    pipeline = TransformationPipeline.from_config(request.pipeline.model_dump())
+    job = job_manager.submit(request.filename, pipeline, execution_options(request))
+    return JobResponse(**asdict(job))
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+)
+async def get_job(job_id: str):
+    """
+    Get the status of a job, including the number of steps completed.
+    """
+    return JobResponse(**asdict(job_manager.get(job_id)))
+
+
+@router.get(
+    "/{job_id}/result",
+)
+async def get_job_result(job_id: str):
+    """
+    Get the rows produced by a succeeded job as newline-delimited JSON.
+    """
+    result_path = job_manager.result_path(job_id)
+
+    async def read_chunks():
+        async with aiofiles.open(result_path, "rb") as file:
+            while chunk := await file.read(settings.MAX_READ_CHUNK_BYTES):
+                yield chunk
+
+    return StreamingResponse(read_chunks(), media_type="application/x-ndjson")
+
+
+@router.delete(
+    "/{job_id}",
+    response_model=OkResponse,
+)
+async def delete_job(job_id: str):
+    """
+    Delete a finished job and its result.
+    """
+    job_manager.delete(job_id)
+    return OkResponse()
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, HTTPException
+import os
+from typing import Optional, Union
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from app.dtos.transform.request import (
     AiGeneratePipelineRequest,
+    BatchTransformRequest,
+    ExecuteTransformRequest,
+    ExecutionOptionsRequest,
+    MultiFileTransformRequest,
     PipelineConfig,
     RegistryConfig,
     TransformFromJsonRequest,
     TransformFromYamlRequest,
 )
 from app.dtos.transform.response import (
+    BatchTransformResponse,
+    MultiFileTransformResponse,
     PipelineConfigResponse,
     TransformationsResponse,
     TransformHealthCheckResponse,
@@ -16,12 +26,97 @@ from app.dtos.transform.response import (
     TransformValidationResponse,
     UpdatePipelineConfigResponse,
 )
+from app.enums.transform import ResultFormat
+from app.exception.errors import AppError, ValidationError
 from app.services import registry
-from app.services.transform import pipeline_executor
+from app.services.file import dataframe_cache
+from app.services.transform import pipeline_executor, prefix_cache, result_cache
+from app.services.transform.executor import resolve_files
+from app.services.transform.options import ExecutionOptions
 from app.services.transform.pipeline import TransformationPipeline
+from app.services.transform.serializers import (
+    arrow_stream,
+    batch_ndjson_stream,
+    csv_gzip_stream,
+    json_array_stream,
+    ndjson_stream,
+    parquet_stream,
+)
+from app.utils.response_util import FastJSONResponse
 
 router = APIRouter()
 
+STREAM_SERIALIZERS = {
+    ResultFormat.NDJSON: (ndjson_stream, "application/x-ndjson"),
+    ResultFormat.JSON_STREAM: (json_array_stream, "application/json"),
+    ResultFormat.ARROW: (arrow_stream, "application/vnd.apache.arrow.stream"),
+    ResultFormat.PARQUET: (parquet_stream, "application/vnd.apache.parquet"),
+    ResultFormat.CSV: (csv_gzip_stream, "application/gzip"),
+}
+
+# Formats returned as a file download, which can also be requested through
+# the Accept header
+DOWNLOAD_EXTENSIONS = {
+    ResultFormat.ARROW: ".arrow",
+    ResultFormat.PARQUET: ".parquet",
+    ResultFormat.CSV: ".csv.gz",
+}
+
+
+def execution_options(request: ExecutionOptionsRequest) -> ExecutionOptions:
+    return ExecutionOptions(
+        streaming=request.streaming,
+        project_columns=request.project_columns,
+        optimize=request.optimize,
+        engine=request.engine.value if request.engine else None,
+        limit=request.limit,
+        offset=request.offset,
+        arrow_strings=request.arrow_strings,
+    )
+
+
+def result_format(
+    request: ExecuteTransformRequest, accept: Optional[str]
+) -> ResultFormat:
+    """
+    Get the requested result format, from the request body or else from the
+    media types accepted by the client.
+    """
+    if "format" in request.model_fields_set or not accept:
+        return request.format
+
+    for media_range in accept.split(","):
+        media_type = media_range.split(";")[0].strip()
+        for download_format in DOWNLOAD_EXTENSIONS:
+            if STREAM_SERIALIZERS[download_format][1] == media_type:
+                return download_format
+    return request.format
+
+
+async def _execute(
+    request: ExecuteTransformRequest,
+    pipeline: TransformationPipeline,
+    accept: Optional[str] = None,
+):
+    options = execution_options(request)
+    response_format = result_format(request, accept)
+    if response_format not in STREAM_SERIALIZERS:
+        result = await pipeline_executor.execute_pipeline(
+            request.filename, pipeline, options
+        )
+        return FastJSONResponse(result)
+
+    stream = pipeline_executor.stream_pipeline(request.filename, pipeline, options)
+    serializer, media_type = STREAM_SERIALIZERS[response_format]
+    headers = None
+    if response_format in DOWNLOAD_EXTENSIONS:
+        name = os.path.splitext(request.filename)[0]
+        extension = DOWNLOAD_EXTENSIONS[response_format]
+        headers = {"Content-Disposition": f'attachment; filename="{name}{extension}"'}
+    # Streams are produced as they are sent, holding a place in the pool
+    content = pipeline_executor.pool.hold(serializer(stream))
+    return StreamingResponse(content, media_type=media_type, headers=headers)
+
 
 @router.get(
     "",
@@ -50,6 +145,9 @@ async def status():
         status="healthy",
         transformations_available=len(registry.list_available()),
         registry_config=registry.get_configuration(),
+        dataframe_cache=dataframe_cache.stats(),
+        result_cache=result_cache.stats(),
+        prefix_cache=prefix_cache.stats(),
     )
 
 
@@ -84,6 +182,9 @@ async def update_registry_config(config: RegistryConfig):
     """
     try:
         registry.set_configuration(config.config)
+        # Results depend on the transformations available when they were made
+        result_cache.clear()
+        prefix_cache.clear()
         return UpdatePipelineConfigResponse(
             message="Registry configuration updated successfully",
             new_config=registry.get_configuration(),
@@ -128,17 +229,30 @@ async def ai_generate_pipeline(request: AiGeneratePipelineRequest):
     "/execute/json",
     response_model=TransformResponse,
 )
-async def transform_data_json(request: TransformFromJsonRequest):
+async def transform_data_json(
+    request: TransformFromJsonRequest, accept: Optional[str] = Header(None)
+):
     """
     Transform CSV data using a pipeline defined in the request body as JSON.
 
     Args:
         filename: CSV file to transform
         pipeline: Pipeline configuration in request body
+        streaming: Whether to execute the pipeline chunk by chunk
+        project_columns: Whether to load and return only referenced columns
+        optimize: Whether to execute an optimized plan of the pipeline
+        engine: Engine executing the steps, 'pandas' or 'polars'
+        limit: Maximum number of result rows to return
+        offset: Number of result rows to skip
+        format: Response format, 'ndjson' or 'json_stream' to stream the rows,
+            'arrow', 'parquet' or 'csv' (gzip) to download them. Without it, the
+            download formats are also chosen by their media type in Accept
     """
     try:
         pipeline = TransformationPipeline.from_config(request.pipeline.model_dump())
-        return await pipeline_executor.execute_pipeline(request.filename, pipeline)
+        return await _execute(request, pipeline, accept)
+    except AppError:
+        raise
     except Exception as e:
         logger.error(f"Error transforming data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -148,13 +262,24 @@ async def transform_data_json(request: TransformFromJsonRequest):
     "/execute/yaml",
     response_model=TransformResponse,
 )
-async def transform_data_yaml(request: TransformFromYamlRequest):
+async def transform_data_yaml(
+    request: TransformFromYamlRequest, accept: Optional[str] = Header(None)
+):
     """
     Transform CSV data using a pipeline defined in YAML format.
 
     Args:
         filename: CSV file to transform
         pipeline: YAML string of pipeline configuration
+        streaming: Whether to execute the pipeline chunk by chunk
+        project_columns: Whether to load and return only referenced columns
+        optimize: Whether to execute an optimized plan of the pipeline
+        engine: Engine executing the steps, 'pandas' or 'polars'
+        limit: Maximum number of result rows to return
+        offset: Number of result rows to skip
+        format: Response format, 'ndjson' or 'json_stream' to stream the rows,
+            'arrow', 'parquet' or 'csv' (gzip) to download them. Without it, the
+            download formats are also chosen by their media type in Accept
     """
     try:
         try:
@@ -164,8 +289,99 @@ async def transform_data_yaml(request: TransformFromYamlRequest):
                 status_code=400, detail=f"Invalid YAML pipeline configuration: {str(e)}"
             )
 
-        return await pipeline_executor.execute_pipeline(request.filename, pipeline)
+        return await _execute(request, pipeline, accept)
+
+    except AppError:
+        raise
+    except Exception as e:
+        logger.error(f"Error transforming data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/execute/batch",
+    response_model=BatchTransformResponse,
+)
+async def transform_data_batch(request: BatchTransformRequest):
+    """
+    Transform CSV data with several pipelines, reading the file only once.
+
+    Leading steps shared by pipelines are executed once and the pipelines run
+    concurrently.
+
+    Args:
+        filename: CSV file to transform
+        pipelines: Pipeline configurations in request body, by name
+        project_columns: Whether to load only columns referenced by any pipeline
+        optimize: Whether to execute an optimized plan of the pipelines
+        engine: Engine executing the steps, 'pandas' or 'polars'
+        limit: Maximum number of result rows to return
+        offset: Number of result rows to skip
+        format: Response format, 'ndjson' to stream the results as they complete
+    """
+    if request.format in DOWNLOAD_EXTENSIONS:
+        raise ValidationError(
+            message=f"Format '{request.format.value}' is not supported for batches",
+            details={"format": request.format.value},
+        )
+
+    try:
+        pipelines = {
+            name: TransformationPipeline.from_config(config.model_dump())
+            for name, config in request.pipelines.items()
+        }
+        options = execution_options(request)
+        if request.format != ResultFormat.NDJSON:
+            results = await pipeline_executor.execute_batch(
+                request.filename, pipelines, options
+            )
+            return FastJSONResponse({"results": results})
+
+        batch = pipeline_executor.stream_batch(request.filename, pipelines, options)
+        return StreamingResponse(
+            pipeline_executor.pool.hold(batch_ndjson_stream(batch)),
+            media_type="application/x-ndjson",
+        )
+
+    except AppError:
+        raise
+    except Exception as e:
+        logger.error(f"Error transforming data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/execute/files",
+    response_model=Union[TransformResponse, MultiFileTransformResponse],
+)
+async def transform_files(request: MultiFileTransformRequest):
+    """
+    Transform several CSV files with one pipeline, in parallel.
+
+    Args:
+        filenames: CSV files to transform
+        pattern: Glob pattern selecting the CSV files to transform, instead of
+            filenames
+        pipeline: Pipeline configuration in request body
+        combine: 'concat' to transform the files as one dataset, 'per_file'
+            to get the result of each file
+        streaming: Whether to process each file in chunks
+        project_columns: Whether to load only columns referenced by the pipeline
+        optimize: Whether to execute an optimized plan of the pipeline
+        engine: Engine executing the steps, 'pandas' or 'polars'
+        limit: Maximum number of result rows to return
+        offset: Number of result rows to skip
+    """
+    try:
+        filenames = resolve_files(request.filenames, request.pattern)
+        pipeline = TransformationPipeline.from_config(request.pipeline.model_dump())
+        result = await pipeline_executor.execute_files(
+            filenames, pipeline, execution_options(request), request.combine
+        )
+        return FastJSONResponse(result)
 
+    except AppError:
+        raise
     except Exception as e:
         logger.error(f"Error transforming data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -189,7 +405,7 @@ async def validate_pipeline(pipeline_config: PipelineConfig):
         return TransformValidationResponse(
             valid=len(validation_errors) == 0,
             errors=validation_errors,
-            pipeline_info=pipeline.get_pipeline_info(),
+            pipeline_info=pipeline.optimize().get_pipeline_info(),
         )
 
     except Exception as e:
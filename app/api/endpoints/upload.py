@@ -1,4 +1,4 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile
 
 from app.services.file import upload_service
 
@@ -6,11 +6,11 @@ router = APIRouter()
 
 
 @router.post("")
-async def store_file(file: UploadFile = File(...)):
+async def store_file(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     Store CSV file in a local directory with a unique ID as the filename.
 
     Args:
         file: CSV file to store
     """
-    return await upload_service.upload_file(file)
+    return await upload_service.upload_file(file, background_tasks)
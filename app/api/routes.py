@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import file_router, health_router, transform_router
+from app.api.endpoints import file_router, health_router, job_router, transform_router
 
 router = APIRouter()
 
@@ -15,6 +15,12 @@ router.include_router(
     prefix="/transformations",
 )
 
+router.include_router(
+    job_router,
+    tags=["jobs"],
+    prefix="/transformations/jobs",
+)
+
 
 router.include_router(
     file_router,
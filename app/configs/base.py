@@ -5,9 +5,11 @@ from pydantic_settings import SettingsConfigDict
 
 from app.configs.file import UploadSettings
 from app.configs.groq_ai import GroqAISettings
+from app.configs.job import JobSettings
+from app.configs.transform import TransformSettings
 
 
-class Settings(GroqAISettings, UploadSettings):
+class Settings(GroqAISettings, UploadSettings, TransformSettings, JobSettings):
     APP_NAME: str = "backend"
     API_PREFIX: str
     ENV: str
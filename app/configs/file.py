@@ -11,3 +11,10 @@ class UploadSettings(BaseSettings):
     ALLOWED_FILE_EXTENSIONS: List[str] = os.getenv(
         "ALLOWED_FILE_EXTENSIONS", ".csv"
     ).split(",")
+    COLUMNAR_SIDECAR_ENABLED: bool = os.getenv("COLUMNAR_SIDECAR_ENABLED", True)
+    SCHEMA_SIDECAR_ENABLED: bool = os.getenv("SCHEMA_SIDECAR_ENABLED", True)
+    SCHEMA_CATEGORY_MAX_VALUES: int = os.getenv("SCHEMA_CATEGORY_MAX_VALUES", 1000)
+    SCHEMA_CATEGORY_MAX_RATIO: float = os.getenv("SCHEMA_CATEGORY_MAX_RATIO", 0.5)
+    DATAFRAME_CACHE_MAX_BYTES: int = os.getenv(
+        "DATAFRAME_CACHE_MAX_BYTES", 256 * 1024 * 1024
+    )
@@ -0,0 +1,10 @@
+import os
+
+from pydantic_settings import BaseSettings
+
+
+class JobSettings(BaseSettings):
+    JOBS_DIRECTORY: str = os.getenv("JOBS_DIRECTORY", "jobs")
+    JOBS_POOL_TYPE: str = os.getenv("JOBS_POOL_TYPE", "thread")
+    JOBS_WORKERS: int = os.getenv("JOBS_WORKERS", 2)
+    JOBS_QUEUE_SIZE: int = os.getenv("JOBS_QUEUE_SIZE", 100)
@@ -0,0 +1,28 @@
+import os
+
+from pydantic_settings import BaseSettings
+
+
+class TransformSettings(BaseSettings):
+    STREAMING_CHUNK_ROWS: int = os.getenv("STREAMING_CHUNK_ROWS", 100_000)
+    EXTERNAL_SORT_RUN_ROWS: int = os.getenv("EXTERNAL_SORT_RUN_ROWS", 1_000_000)
+    EXTERNAL_SORT_DIRECTORY: str = os.getenv("EXTERNAL_SORT_DIRECTORY", "")
+    PREDICATE_PUSHDOWN_MIN_BYTES: int = os.getenv(
+        "PREDICATE_PUSHDOWN_MIN_BYTES", 4 * 1024 * 1024
+    )
+    EXECUTOR_POOL_TYPE: str = os.getenv("EXECUTOR_POOL_TYPE", "thread")
+    EXECUTOR_POOL_SIZE: int = os.getenv("EXECUTOR_POOL_SIZE", os.cpu_count() or 1)
+    EXECUTOR_QUEUE_SIZE: int = os.getenv("EXECUTOR_QUEUE_SIZE", 32)
+    EXECUTOR_JOB_TIMEOUT: float = os.getenv("EXECUTOR_JOB_TIMEOUT", 300)
+    PARTITION_POOL_TYPE: str = os.getenv("PARTITION_POOL_TYPE", "process")
+    PANDAS_COPY_ON_WRITE: bool = os.getenv("PANDAS_COPY_ON_WRITE", False)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", True)
+    RESULT_CACHE_MAX_BYTES: int = os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+    RESULT_CACHE_TTL: float = os.getenv("RESULT_CACHE_TTL", 300)
+    RESULT_CACHE_DIRECTORY: str = os.getenv("RESULT_CACHE_DIRECTORY", "")
+    RESULT_CACHE_DISK_MAX_BYTES: int = os.getenv(
+        "RESULT_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024
+    )
+    PREFIX_CACHE_ENABLED: bool = os.getenv("PREFIX_CACHE_ENABLED", True)
+    PREFIX_CACHE_MAX_BYTES: int = os.getenv("PREFIX_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+    EXECUTION_ENGINE: str = os.getenv("EXECUTION_ENGINE", "pandas")
@@ -0,0 +1,4 @@
+COLUMNAR_SIDECAR_SUFFIX = ".arrow"
+SCHEMA_SIDECAR_SUFFIX = ".schema.json"
+
+SIDECAR_SUFFIXES = (COLUMNAR_SIDECAR_SUFFIX, SCHEMA_SIDECAR_SUFFIX)
@@ -1,6 +1,8 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.enums.transform import Engine, FileResultMode, ResultFormat
 
 
 class RegistryConfig(BaseModel):
@@ -15,11 +17,74 @@ class BaseTransformRequest(BaseModel):
     filename: str = Field(..., description="Filename of the file to transform")
 
 
-class TransformFromJsonRequest(BaseTransformRequest):
+class ExecutionOptionsRequest(BaseModel):
+    streaming: bool = Field(
+        False,
+        description="Read the file in chunks and apply row-wise steps per chunk",
+    )
+    project_columns: bool = Field(
+        False,
+        description="Load and return only the columns referenced by the pipeline",
+    )
+    optimize: bool = Field(
+        True,
+        description="Rewrite the pipeline into an equivalent but cheaper plan",
+    )
+    engine: Optional[Engine] = Field(
+        None,
+        description="Engine executing the steps, defaults to the configured engine",
+    )
+    limit: Optional[int] = Field(
+        None, ge=1, description="Maximum number of result rows to return"
+    )
+    offset: int = Field(0, ge=0, description="Number of result rows to skip")
+    arrow_strings: bool = Field(
+        False,
+        description="Read string columns as Arrow-backed strings (string[pyarrow])",
+    )
+
+
+class ExecuteTransformRequest(BaseTransformRequest, ExecutionOptionsRequest):
+    format: ResultFormat = Field(
+        ResultFormat.JSON,
+        description=(
+            "Response format, 'ndjson' and 'json_stream' stream row batches, "
+            "'arrow', 'parquet' and 'csv' (gzip) stream a file download"
+        ),
+    )
+
+
+class TransformFromJsonRequest(ExecuteTransformRequest):
     pipeline: PipelineConfig = Field(..., description="Pipeline configuration")
 
 
-class TransformFromYamlRequest(BaseTransformRequest):
+class BatchTransformRequest(ExecuteTransformRequest):
+    pipelines: Dict[str, PipelineConfig] = Field(
+        ..., min_length=1, description="Pipeline configurations, by name"
+    )
+
+
+class MultiFileTransformRequest(ExecutionOptionsRequest):
+    filenames: Optional[List[str]] = Field(
+        None, min_length=1, description="Filenames of the files to transform"
+    )
+    pattern: Optional[str] = Field(
+        None, description="Glob pattern selecting uploaded files, e.g. 'sales-*.csv'"
+    )
+    pipeline: PipelineConfig = Field(..., description="Pipeline configuration")
+    combine: FileResultMode = Field(
+        FileResultMode.CONCAT,
+        description="'concat' to return one result, 'per_file' for one per file",
+    )
+
+    @model_validator(mode="after")
+    def check_files(self) -> "MultiFileTransformRequest":
+        if (self.filenames is None) == (self.pattern is None):
+            raise ValueError("Exactly one of 'filenames' and 'pattern' is required")
+        return self
+
+
+class TransformFromYamlRequest(ExecuteTransformRequest):
     pipeline: str = Field(..., description="YAML pipeline configuration")
 
 
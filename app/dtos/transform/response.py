@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from app.enums.transform import JobStatus
+
 
 class TransformResponse(BaseModel):
     original_shape: Tuple[int, int] = Field(
@@ -14,12 +16,33 @@ class TransformResponse(BaseModel):
     data: List[Dict[str, Any]] = Field(..., description="Transformed data")
 
 
+class BatchTransformResponse(BaseModel):
+    results: Dict[str, TransformResponse] = Field(
+        ..., description="Transformation results, by pipeline name"
+    )
+
+
+class MultiFileTransformResponse(BaseModel):
+    results: Dict[str, TransformResponse] = Field(
+        ..., description="Transformation results, by file name"
+    )
+
+
 class TransformHealthCheckResponse(BaseModel):
     status: str = Field(..., description="Status of the transform")
     transformations_available: int = Field(
         ..., description="Number of transformations available"
     )
     registry_config: Dict[str, Any] = Field(..., description="Registry configuration")
+    dataframe_cache: Dict[str, int] = Field(
+        ..., description="Hit, miss and eviction counters of the DataFrame cache"
+    )
+    result_cache: Dict[str, int] = Field(
+        ..., description="Hit, miss and eviction counters of the result cache"
+    )
+    prefix_cache: Dict[str, int] = Field(
+        ..., description="Hit, miss and eviction counters of the step-prefix cache"
+    )
 
 
 class TransformValidationResponse(BaseModel):
@@ -45,3 +68,24 @@ class TransformationsResponse(BaseModel):
         ..., description="List of transformations"
     )
     count: int = Field(..., description="Number of transformations")
+
+
+class JobResponse(BaseModel):
+    id: str = Field(..., description="Id of the job")
+    filename: str = Field(..., description="Filename of the file to transform")
+    status: JobStatus = Field(..., description="Status of the job")
+    created_at: str = Field(..., description="Time the job was queued")
+    started_at: Optional[str] = Field(None, description="Time the job started")
+    finished_at: Optional[str] = Field(None, description="Time the job finished")
+    completed_steps: int = Field(..., description="Number of steps completed")
+    total_steps: int = Field(..., description="Number of steps to execute")
+    original_shape: Optional[Tuple[int, int]] = Field(
+        None, description="Original shape of the data"
+    )
+    transformed_shape: Optional[Tuple[int, int]] = Field(
+        None, description="Transformed shape of the data"
+    )
+    pipeline_info: Optional[Dict[str, Any]] = Field(
+        None, description="Pipeline information"
+    )
+    error: Optional[Dict[str, Any]] = Field(None, description="Error of a failed job")
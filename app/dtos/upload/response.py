@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -7,3 +7,16 @@ class UploadFileResponse(BaseModel):
     filename: str
     status: str
     errors: List[str] = []
+
+
+class ColumnSchema(BaseModel):
+    name: str
+    dtype: str
+    nullable: bool
+    categories: Optional[List[str]] = None
+
+
+class FileSchemaResponse(BaseModel):
+    filename: str
+    rows: int
+    columns: List[ColumnSchema]
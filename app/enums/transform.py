@@ -0,0 +1,27 @@
+from enum import Enum
+
+
+class ResultFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    JSON_STREAM = "json_stream"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+    CSV = "csv"
+
+
+class Engine(str, Enum):
+    PANDAS = "pandas"
+    POLARS = "polars"
+
+
+class FileResultMode(str, Enum):
+    CONCAT = "concat"
+    PER_FILE = "per_file"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
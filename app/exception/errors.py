@@ -61,3 +61,47 @@ class AIError(AppError):
             error_code="AI_ERROR",
             details=details,
         )
+
+
+class ExecutorBusyError(AppError):
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            error_code="EXECUTOR_BUSY",
+            details=details,
+        )
+
+
+class ExecutionTimeoutError(AppError):
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            error_code="EXECUTION_TIMEOUT",
+            details=details,
+        )
+
+
+class JobNotFoundError(AppError):
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="JOB_NOT_FOUND",
+            details=details,
+        )
+
+
+class JobNotReadyError(AppError):
+
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_409_CONFLICT,
+            error_code="JOB_NOT_READY",
+            details=details,
+        )
@@ -1,3 +1,4 @@
+from app.services.file.cache import dataframe_cache
 from app.services.file.upload import FileUploadService
 
 upload_service = FileUploadService()
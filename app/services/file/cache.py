@@ -0,0 +1,60 @@
+import os
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from app.configs.base import settings
+from app.utils.cache_util import MemoryBudgetLRUCache
+
+
+class DataFrameCache:
+    """
+    Process-level cache of parsed uploads.
+
+    Entries are keyed by filename plus the file's mtime and size, so a file
+    that changes on disk is never served from a stale entry. Uploads parsed
+    with Arrow-backed strings are cached apart from the default parse.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._cache = MemoryBudgetLRUCache(max_bytes)
+
+    def __contains__(self, filename: str) -> bool:
+        key = self._key(filename)
+        return key is not None and key in self._cache
+
+    def get(self, filename: str, arrow_strings: bool = False) -> Optional[pd.DataFrame]:
+        key = self._key(filename, arrow_strings)
+        if key is None:
+            return None
+        return self._cache.get(key)
+
+    def put(
+        self, filename: str, data: pd.DataFrame, arrow_strings: bool = False
+    ) -> bool:
+        key = self._key(filename, arrow_strings)
+        if key is None:
+            return False
+        size = int(data.memory_usage(index=True, deep=True).sum())
+        return self._cache.put(key, data, size)
+
+    def invalidate(self, filename: str) -> int:
+        return self._cache.invalidate(lambda key: key[0] == filename)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    @staticmethod
+    def _key(filename: str, arrow_strings: bool = False):
+        file_path = os.path.join(settings.UPLOAD_DIRECTORY, filename)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return filename, stat.st_mtime_ns, stat.st_size, arrow_strings
+
+
+dataframe_cache = DataFrameCache(settings.DATAFRAME_CACHE_MAX_BYTES)
@@ -0,0 +1,162 @@
+import os
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from app.configs.base import settings
+from app.constants import COLUMNAR_SIDECAR_SUFFIX
+from app.services.file.schema import read_csv_typed
+from app.services.file.storage import get_sidecar_path, get_upload_file_path
+from app.utils.pandas_util import ARROW_STRING_DTYPE
+
+ARROW_STRING_TYPES = {
+    pa.string(): ARROW_STRING_DTYPE,
+    pa.large_string(): ARROW_STRING_DTYPE,
+}
+
+
+def get_columnar_sidecar_path(filename: str) -> Optional[str]:
+    """
+    Resolve the columnar copy of an uploaded file if it is usable.
+
+    A sidecar that is older than the CSV it was written from is ignored.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        Path to the Arrow IPC sidecar, or None if there is no fresh copy
+    """
+    if not settings.COLUMNAR_SIDECAR_ENABLED:
+        return None
+
+    file_path = get_upload_file_path(filename)
+    sidecar_path = get_sidecar_path(filename, COLUMNAR_SIDECAR_SUFFIX)
+    if not os.path.exists(sidecar_path):
+        return None
+    if os.path.getmtime(sidecar_path) < os.path.getmtime(file_path):
+        return None
+    return sidecar_path
+
+
+def write_columnar_sidecar(filename: str) -> None:
+    """
+    Write a typed Arrow IPC copy of an uploaded CSV file next to it.
+
+    The copy is written uncompressed so that it can be memory-mapped on read.
+    The CSV is parsed with the dtypes of its schema, so category candidates are
+    stored dictionary-encoded and read back as categoricals. Failures are
+    logged and leave the upload usable through the CSV path.
+
+    Args:
+        filename: Name of the uploaded file
+    """
+    sidecar_path = get_sidecar_path(filename, COLUMNAR_SIDECAR_SUFFIX)
+    temp_path = f"{sidecar_path}.tmp"
+
+    try:
+        data = read_csv_typed(filename)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        os.replace(temp_path, sidecar_path)
+        logger.info(f"Wrote columnar sidecar for {filename}")
+
+    except Exception as e:
+        logger.error(f"Error writing columnar sidecar for {filename}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_columnar_columns(filename: str) -> Optional[List[str]]:
+    """
+    Get the column names from the columnar copy of an uploaded file.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        List of column names, or None if there is no fresh copy
+    """
+    table = _open_table(filename)
+    if table is None:
+        return None
+    return table.column_names
+
+
+def read_columnar_sidecar(
+    filename: str, columns: List[str] = None, arrow_strings: bool = False
+) -> Optional[pd.DataFrame]:
+    """
+    Read the columnar copy of an uploaded file, memory-mapped.
+
+    Args:
+        filename: Name of the uploaded file
+        columns: Optional subset of columns to read
+        arrow_strings: Read strings as ``string[pyarrow]`` rather than objects
+
+    Returns:
+        DataFrame equal to parsing the CSV, or None if there is no fresh copy
+    """
+    table = _open_table(filename, columns)
+    if table is None:
+        return None
+    return _to_pandas(table, arrow_strings)
+
+
+def iter_columnar_sidecar(
+    filename: str,
+    chunk_size: int,
+    columns: List[str] = None,
+    arrow_strings: bool = False,
+) -> Optional[Iterator[pd.DataFrame]]:
+    """
+    Read the columnar copy of an uploaded file in chunks, memory-mapped.
+
+    Args:
+        filename: Name of the uploaded file
+        chunk_size: Number of rows per chunk
+        columns: Optional subset of columns to read
+        arrow_strings: Read strings as ``string[pyarrow]`` rather than objects
+
+    Returns:
+        Iterator of DataFrame chunks, or None if there is no fresh copy
+    """
+    table = _open_table(filename, columns)
+    if table is None:
+        return None
+    if table.num_rows == 0:
+        # One empty chunk keeps the columns known to the stream
+        return iter([_to_pandas(table, arrow_strings)])
+    return (
+        _to_pandas(pa.Table.from_batches([batch], schema=table.schema), arrow_strings)
+        for batch in table.to_batches(max_chunksize=chunk_size)
+    )
+
+
+def _open_table(filename: str, columns: List[str] = None) -> Optional[pa.Table]:
+    sidecar_path = get_columnar_sidecar_path(filename)
+    if sidecar_path is None:
+        return None
+    table = pa.ipc.open_file(pa.memory_map(sidecar_path, "r")).read_all()
+    # Unselected columns stay in the memory map and are never paged in
+    return table if columns is None else table.select(columns)
+
+
+def _to_pandas(table: pa.Table, arrow_strings: bool = False) -> pd.DataFrame:
+    if arrow_strings:
+        # Strings keep their Arrow buffers instead of becoming Python objects
+        return table.to_pandas(types_mapper=ARROW_STRING_TYPES.get)
+
+    data = table.to_pandas()
+    # Arrow restores missing strings as None where the CSV parser gives NaN
+    for column in data.select_dtypes(include=["object"]).columns:
+        if data[column].hasnans:
+            data[column] = data[column].fillna(np.nan)
+    return data
@@ -0,0 +1,191 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from app.configs.base import settings
+from app.constants import SCHEMA_SIDECAR_SUFFIX
+from app.services.file.storage import (
+    get_sidecar_path,
+    get_upload_file_path,
+    open_memory_mapped,
+)
+
+
+def infer_schema(data: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Describe the columns of a parsed upload.
+
+    Text columns with few distinct values, at most ``SCHEMA_CATEGORY_MAX_VALUES``
+    and ``SCHEMA_CATEGORY_MAX_RATIO`` of the rows, are category candidates:
+    they are parsed as categoricals, which store each distinct value once.
+
+    Args:
+        data: Upload parsed with inferred dtypes
+
+    Returns:
+        Schema with the number of rows and, for each column, its name, dtype,
+        whether it has missing values and its categories if it is a candidate
+    """
+    columns = []
+    for name in data.columns:
+        values = data[name]
+        categories = None
+        if values.dtype == object and _is_category_candidate(values):
+            categories = sorted(values.dropna().unique().tolist())
+        columns.append(
+            {
+                "name": name,
+                "dtype": str(values.dtype),
+                "nullable": bool(values.hasnans),
+                "categories": categories,
+            }
+        )
+    return {"rows": len(data), "columns": columns}
+
+
+def _is_category_candidate(values: pd.Series) -> bool:
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return False
+    distinct = values.nunique(dropna=True)
+    return (
+        distinct <= settings.SCHEMA_CATEGORY_MAX_VALUES
+        and distinct <= len(values) * settings.SCHEMA_CATEGORY_MAX_RATIO
+    )
+
+
+def write_schema_sidecar(filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Infer the schema of an uploaded CSV file and write it next to it.
+
+    Uploads are bounded by ``MAX_FILE_SIZE``, so the whole file is parsed and
+    the dtypes hold for every row. Failures are logged and leave the upload
+    readable with inferred dtypes.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        The schema, or None if it couldn't be inferred
+    """
+    sidecar_path = get_sidecar_path(filename, SCHEMA_SIDECAR_SUFFIX)
+    temp_path = f"{sidecar_path}.tmp"
+
+    try:
+        with open_memory_mapped(filename) as buffer:
+            schema = infer_schema(pd.read_csv(buffer))
+
+        with open(temp_path, "w") as file:
+            json.dump(schema, file)
+
+        os.replace(temp_path, sidecar_path)
+        logger.info(f"Wrote schema sidecar for {filename}")
+        return schema
+
+    except Exception as e:
+        logger.error(f"Error writing schema sidecar for {filename}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+
+def read_schema_sidecar(filename: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the schema of an uploaded file.
+
+    A sidecar that is older than the CSV it was inferred from is ignored.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        The schema, or None if there is no fresh one
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    if not settings.SCHEMA_SIDECAR_ENABLED:
+        return None
+
+    file_path = get_upload_file_path(filename)
+    sidecar_path = get_sidecar_path(filename, SCHEMA_SIDECAR_SUFFIX)
+    if not os.path.exists(sidecar_path):
+        return None
+    if os.path.getmtime(sidecar_path) < os.path.getmtime(file_path):
+        return None
+
+    with open(sidecar_path) as file:
+        return json.load(file)
+
+
+def get_schema(filename: str) -> Dict[str, Any]:
+    """
+    Get the schema of an uploaded file, inferring it if there is no fresh one.
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    schema = read_schema_sidecar(filename)
+    if schema is None:
+        get_upload_file_path(filename)
+        schema = write_schema_sidecar(filename)
+    if schema is None:
+        with open_memory_mapped(filename) as buffer:
+            schema = infer_schema(pd.read_csv(buffer))
+    return schema
+
+
+def schema_dtypes(filename: str, categories: bool = True) -> Optional[Dict[str, str]]:
+    """
+    Get the dtypes to parse an uploaded file with, from its schema.
+
+    Args:
+        filename: Name of the uploaded file
+        categories: Parse the category candidates as categoricals
+
+    Returns:
+        Dtypes by column name, or None if there is no fresh schema
+    """
+    schema = read_schema_sidecar(filename)
+    if schema is None:
+        return None
+    return {
+        column["name"]: (
+            "category"
+            if categories and column["categories"] is not None
+            else column["dtype"]
+        )
+        for column in schema["columns"]
+    }
+
+
+def read_csv_typed(
+    filename: str, columns: List[str] = None, categories: bool = True
+) -> pd.DataFrame:
+    """
+    Parse an uploaded CSV file with the dtypes of its schema.
+
+    Without a schema, or if the file doesn't match it, dtypes are inferred.
+
+    Args:
+        filename: Name of the uploaded file
+        columns: Optional subset of columns to read
+        categories: Parse the category candidates as categoricals
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    dtypes = schema_dtypes(filename, categories)
+    if dtypes is not None:
+        try:
+            with open_memory_mapped(filename) as buffer:
+                return pd.read_csv(buffer, usecols=columns, dtype=dtypes)
+        except (ValueError, TypeError) as e:
+            logger.warning(
+                f"{filename} doesn't match its schema, inferring dtypes: {str(e)}"
+            )
+
+    with open_memory_mapped(filename) as buffer:
+        return pd.read_csv(buffer, usecols=columns)
@@ -1,12 +1,19 @@
+import fnmatch
+import hashlib
+import mmap
 import os
-from typing import List
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import BinaryIO, Iterator, List
 
 import aiofiles
 from fastapi import UploadFile
 from loguru import logger
 
 from app.configs.base import settings
+from app.constants import SIDECAR_SUFFIXES
 from app.exception.errors import FileError
+from app.services.file.cache import dataframe_cache
 
 
 async def store_file(file: UploadFile, filename: str) -> None:
@@ -45,13 +52,147 @@ async def read_file_from_upload_directory(filename: str) -> bytes:
     return await read_file(file_path)
 
 
+def get_upload_file_path(filename: str) -> str:
+    """
+    Resolve the path of a file in the upload directory.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        Path to the file on disk
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    file_path = os.path.join(settings.UPLOAD_DIRECTORY, filename)
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File {filename} not found")
+    return file_path
+
+
+@contextmanager
+def open_memory_mapped(filename: str) -> Iterator[BinaryIO]:
+    """
+    Open an uploaded file as a read-only memory-mapped buffer.
+
+    The returned object is file-like, so parsers can consume it directly and
+    the file contents are paged in by the OS instead of being copied into
+    Python bytes first. Empty files, which cannot be mapped, are opened as
+    regular binary files.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Yields:
+        Memory-mapped, file-like view of the file
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    file_path = get_upload_file_path(filename)
+
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield file
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def list_upload_files(pattern: str) -> List[str]:
+    """
+    List the uploaded files matching a glob pattern.
+
+    Only file names are matched, the pattern cannot select files outside the
+    upload directory. Sidecars and files being written are never listed.
+
+    Args:
+        pattern: Glob pattern matched against the file names, e.g. '*.csv'
+
+    Returns:
+        Sorted list of matching file names
+
+    Raises:
+        FileError: If the pattern contains a path
+    """
+    if os.sep in pattern or "/" in pattern or pattern in (".", ".."):
+        raise FileError(
+            message="File pattern cannot contain a path", details={"pattern": pattern}
+        )
+    if not os.path.isdir(settings.UPLOAD_DIRECTORY):
+        return []
+
+    return sorted(
+        name
+        for name in os.listdir(settings.UPLOAD_DIRECTORY)
+        if fnmatch.fnmatchcase(name, pattern)
+        and os.path.splitext(name)[1] in settings.ALLOWED_FILE_EXTENSIONS
+        and os.path.isfile(os.path.join(settings.UPLOAD_DIRECTORY, name))
+    )
+
+
+def get_file_content_hash(filename: str) -> str:
+    """
+    Hash the content of an uploaded file.
+
+    Hashes are memoized by the file's mtime and size, so a file is only read
+    again after it changed.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        Hex digest of the file content
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    file_path = get_upload_file_path(filename)
+    stat = os.stat(file_path)
+    return _hash_file(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _hash_file(file_path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.blake2b()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_sidecar_path(filename: str, suffix: str) -> str:
+    """
+    Build the path of a file derived from an upload and stored next to it.
+
+    Args:
+        filename: Name of the uploaded file
+        suffix: Suffix identifying the kind of sidecar
+
+    Returns:
+        Path to the sidecar file
+    """
+    return os.path.join(settings.UPLOAD_DIRECTORY, f"{filename}{suffix}")
+
+
 async def delete_file(filename: str) -> None:
     """
-    Delete a file from the local directory.
+    Delete a file and its sidecars from the local directory, along with the
+    cached DataFrame and results computed from it.
     """
+    # Imported here, the result cache depends on this module
+    from app.services.transform.result_cache import result_cache
+
+    dataframe_cache.invalidate(filename)
+    result_cache.invalidate(filename)
     file_path = os.path.join(settings.UPLOAD_DIRECTORY, filename)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    for path in [file_path] + [
+        get_sidecar_path(filename, suffix) for suffix in SIDECAR_SUFFIXES
+    ]:
+        if os.path.exists(path):
+            os.remove(path)
 
 
 async def cleanup_temp_file(temp_path: str) -> None:
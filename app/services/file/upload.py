@@ -1,21 +1,40 @@
+import asyncio
 import uuid
 
-from fastapi import HTTPException, UploadFile, status
+from fastapi import BackgroundTasks, HTTPException, UploadFile, status
 from loguru import logger
 
-from app.dtos.upload.response import UploadFileResponse
+from app.configs.base import settings
+from app.dtos.upload.response import FileSchemaResponse, UploadFileResponse
+from app.exception.errors import FileError
+from app.services.file.columnar import write_columnar_sidecar
+from app.services.file.schema import get_schema, write_schema_sidecar
 from app.services.file.storage import delete_file, store_file
 from app.services.file.validation import validate_csv_file
 
 
+def write_sidecars(filename: str) -> None:
+    # The columnar copy is parsed with the dtypes of the schema
+    if settings.SCHEMA_SIDECAR_ENABLED:
+        write_schema_sidecar(filename)
+    if settings.COLUMNAR_SIDECAR_ENABLED:
+        write_columnar_sidecar(filename)
+
+
 class FileUploadService:
 
-    async def upload_file(self, file: UploadFile) -> UploadFileResponse:
+    async def upload_file(
+        self, file: UploadFile, background_tasks: BackgroundTasks = None
+    ) -> UploadFileResponse:
         """
         Handle file upload process including validation and storage.
 
+        The schema of the file and a columnar copy are written as well, in the
+        background when background tasks are given, before returning otherwise.
+
         Args:
             file: The uploaded file to process
+            background_tasks: Optional background tasks of the current request
 
         Returns:
             UploadFileResponse containing the saved filename
@@ -32,6 +51,11 @@ class FileUploadService:
 
             logger.info(f"Successfully saved file: {save_filename}")
 
+            if background_tasks is not None:
+                background_tasks.add_task(write_sidecars, save_filename)
+            else:
+                await asyncio.to_thread(write_sidecars, save_filename)
+
             return UploadFileResponse(
                 filename=save_filename,
                 status="success",
@@ -44,6 +68,21 @@ class FileUploadService:
                 detail="Error processing file",
             )
 
+    async def get_schema(self, filename: str) -> FileSchemaResponse:
+        """
+        Get the schema of an uploaded file, inferred when it was uploaded.
+
+        Raises:
+            FileError: If file doesn't exist
+        """
+        try:
+            schema = await asyncio.to_thread(get_schema, filename)
+        except FileNotFoundError:
+            raise FileError(
+                message=f"File not found: {filename}", details={"filename": filename}
+            )
+        return FileSchemaResponse(filename=filename, **schema)
+
     async def delete_file(self, filename: str) -> None:
         """
         Delete a file from the local directory.
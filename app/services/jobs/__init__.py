@@ -0,0 +1,3 @@
+from app.services.jobs.manager import JobManager
+
+job_manager = JobManager()
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.enums.transform import JobStatus
+
+
+@dataclass
+class Job:
+    """Persisted state of a pipeline execution running in the background."""
+
+    id: str
+    filename: str
+    steps: List[Dict[str, Any]]
+    options: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    created_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    completed_steps: int = 0
+    total_steps: int = 0
+    original_shape: Optional[List[int]] = None
+    transformed_shape: Optional[List[int]] = None
+    pipeline_info: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,211 @@
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from typing import List
+
+from loguru import logger
+
+from app.configs.base import settings
+from app.enums.transform import JobStatus
+from app.exception.errors import (
+    ExecutorBusyError,
+    FileError,
+    JobNotFoundError,
+    JobNotReadyError,
+    PipelineError,
+)
+from app.services import registry
+from app.services.file.storage import get_upload_file_path
+from app.services.jobs.job import Job, utc_now
+from app.services.jobs.runner import run_job
+from app.services.jobs.store import JobStore
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class JobManager:
+    """
+    Queue of pipeline executions running in the background.
+
+    Jobs run on a bounded pool of their own, so long executions neither hold
+    HTTP connections open nor take workers from the request pool. Their state
+    is persisted in a ``JobStore``: results survive restarts, and jobs that
+    were queued or running when the service stopped are queued again by
+    ``recover``.
+    """
+
+    POOL_TYPES = ("thread", "process")
+
+    def __init__(
+        self,
+        directory: str = None,
+        pool_type: str = None,
+        workers: int = None,
+        queue_size: int = None,
+    ):
+        self.store = JobStore(directory or settings.JOBS_DIRECTORY)
+        self.pool_type = pool_type or settings.JOBS_POOL_TYPE
+        if self.pool_type not in self.POOL_TYPES:
+            raise ValueError(
+                f"Unsupported pool type '{self.pool_type}', "
+                f"use one of {self.POOL_TYPES}"
+            )
+        self.workers = workers or settings.JOBS_WORKERS
+        self.queue_size = settings.JOBS_QUEUE_SIZE if queue_size is None else queue_size
+        self._executor: Executor = None
+        self._active = 0
+        # Reentrant, done callbacks run inline for jobs that already finished
+        self._lock = threading.RLock()
+
+    def submit(
+        self,
+        filename: str,
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions = None,
+    ) -> Job:
+        """
+        Queue the execution of a pipeline on a file.
+
+        The file and the pipeline are checked up front so that these errors are
+        reported to the caller rather than through the job.
+
+        Returns:
+            The queued job
+
+        Raises:
+            FileError: If file doesn't exist
+            PipelineError: If pipeline validation fails
+            ExecutorBusyError: If the job queue is full
+        """
+        try:
+            get_upload_file_path(filename)
+        except FileNotFoundError:
+            raise FileError(
+                message=f"File not found: {filename}", details={"filename": filename}
+            )
+
+        validation_errors = pipeline.validate_pipeline()
+        if validation_errors:
+            raise PipelineError(
+                message="Pipeline validation failed",
+                details={"errors": validation_errors},
+            )
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            steps=pipeline.steps,
+            options=asdict(options or ExecutionOptions()),
+            created_at=utc_now(),
+            total_steps=len(pipeline.steps),
+        )
+        with self._lock:
+            if self._active >= self.workers + self.queue_size:
+                raise ExecutorBusyError(
+                    message="Job queue is full, try again later",
+                    details={"active": self._active},
+                )
+            self.store.save(job)
+            self._start(job.id)
+
+        logger.info(f"Queued job {job.id} on {filename}")
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        Raises:
+            JobNotFoundError: If there is no job with that id
+        """
+        job = self.store.load(job_id)
+        if job is None:
+            raise JobNotFoundError(
+                message=f"Job not found: {job_id}", details={"job_id": job_id}
+            )
+        return job
+
+    def result_path(self, job_id: str) -> str:
+        """
+        Get the path of the NDJSON result of a job.
+
+        Raises:
+            JobNotFoundError: If there is no job with that id
+            JobNotReadyError: If the job has not succeeded
+        """
+        job = self.get(job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise JobNotReadyError(
+                message=f"Job {job_id} has no result, its status is {job.status}",
+                details={"job_id": job_id, "status": job.status},
+            )
+        return self.store.result_path(job_id)
+
+    def delete(self, job_id: str):
+        """
+        Delete a finished job and its result.
+
+        Raises:
+            JobNotFoundError: If there is no job with that id
+            JobNotReadyError: If the job is still queued or running
+        """
+        job = self.get(job_id)
+        if not job.is_finished:
+            raise JobNotReadyError(
+                message=f"Job {job_id} is still {job.status}",
+                details={"job_id": job_id, "status": job.status},
+            )
+        self.store.delete(job_id)
+
+    def recover(self) -> List[str]:
+        """
+        Queue again the jobs interrupted by a restart.
+
+        Returns:
+            Ids of the queued jobs
+        """
+        recovered = []
+        with self._lock:
+            for job in self.store.list():
+                if job.is_finished:
+                    continue
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                job.completed_steps = 0
+                self.store.save(job)
+                self._start(job.id)
+                recovered.append(job.id)
+
+        if recovered:
+            logger.info(f"Queued {len(recovered)} interrupted jobs again")
+        return recovered
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _start(self, job_id: str):
+        registry_config = (
+            registry.get_configuration() if self.pool_type == "process" else None
+        )
+        self._active += 1
+        future = self._get_executor().submit(
+            run_job, self.store.directory, job_id, registry_config
+        )
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self._active -= 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Job worker crashed: {future.exception()}")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="job"
+                )
+        return self._executor
@@ -0,0 +1,99 @@
+import os
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.enums.transform import JobStatus
+from app.services import registry
+from app.services.jobs.job import Job, utc_now
+from app.services.jobs.store import JobStore
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+from app.services.transform.serializers import ndjson_rows
+from app.services.transform.stream import PipelineStream
+
+
+def run_job(
+    directory: str, job_id: str, registry_config: Optional[Dict[str, bool]] = None
+):
+    """
+    Execute a queued job and persist its progress and result.
+
+    This is the unit of work submitted to the job pool. Like
+    ``run_pipeline_job`` it only takes plain arguments so that it can run in a
+    worker process, the job itself is read from the store.
+
+    Args:
+        directory: Directory of the job store
+        job_id: Id of the job to execute
+        registry_config: Registry configuration to apply before executing
+    """
+    if registry_config is not None:
+        registry.set_configuration(registry_config)
+
+    store = JobStore(directory)
+    job = store.load(job_id)
+    if job is None:
+        logger.warning(f"Job {job_id} was deleted before it started")
+        return
+
+    job.status = JobStatus.RUNNING
+    job.started_at = utc_now()
+    job.completed_steps = 0
+    store.save(job)
+
+    def progress(completed_steps: int):
+        # Chunked execution reports the same step once per chunk
+        if completed_steps != job.completed_steps:
+            job.completed_steps = completed_steps
+            store.save(job)
+
+    result_path = store.result_path(job.id)
+    temp_path = f"{result_path}.tmp"
+    try:
+        stream = PipelineStream(
+            job.filename,
+            TransformationPipeline(job.steps),
+            ExecutionOptions(**job.options),
+            progress=progress,
+        )
+        job.total_steps = len(stream.pipeline.steps)
+        job.pipeline_info = stream.pipeline_info
+        store.save(job)
+
+        with open(temp_path, "w") as file:
+            for rows in ndjson_rows(stream):
+                file.write(rows)
+        os.replace(temp_path, result_path)
+
+        job.status = JobStatus.SUCCEEDED
+        job.completed_steps = job.total_steps
+        job.original_shape = list(stream.original_shape)
+        job.transformed_shape = list(stream.transformed_shape)
+        job.pipeline_info = stream.pipeline_info
+        logger.info(f"Job {job.id} succeeded")
+
+    except Exception as e:
+        logger.error(f"Job {job.id} failed: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        job.status = JobStatus.FAILED
+        job.error = _error(job, e)
+
+    finally:
+        job.finished_at = utc_now()
+        store.save(job)
+
+
+def _error(job: Job, e: Exception) -> Dict:
+    if isinstance(e, FileNotFoundError):
+        return {
+            "code": "FILE_ERROR",
+            "message": f"File not found: {job.filename}",
+            "details": {"filename": job.filename},
+        }
+    return {
+        "code": "PIPELINE_ERROR",
+        "message": "Pipeline execution failed",
+        "details": {"error": str(e)},
+    }
@@ -0,0 +1,67 @@
+import json
+import os
+import re
+from contextlib import suppress
+from dataclasses import asdict
+from typing import List, Optional
+
+from app.enums.transform import JobStatus
+from app.services.jobs.job import Job
+
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+STATE_SUFFIX = ".json"
+RESULT_SUFFIX = ".ndjson"
+
+
+class JobStore:
+    """
+    Job states and results persisted as files in a directory.
+
+    Each job has a JSON state file, replaced atomically on every update so
+    that readers never see a partial state, and an NDJSON result file once it
+    succeeded. Workers in other processes update the same files.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def save(self, job: Job):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(job.id, STATE_SUFFIX)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(asdict(job), file, default=str)
+        os.replace(temp_path, path)
+
+    def load(self, job_id: str) -> Optional[Job]:
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        try:
+            with open(self._path(job_id, STATE_SUFFIX)) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        state["status"] = JobStatus(state["status"])
+        return Job(**state)
+
+    def list(self) -> List[Job]:
+        if not os.path.isdir(self.directory):
+            return []
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith(STATE_SUFFIX):
+                job = self.load(name[: -len(STATE_SUFFIX)])
+                if job is not None:
+                    jobs.append(job)
+        return jobs
+
+    def result_path(self, job_id: str) -> str:
+        return self._path(job_id, RESULT_SUFFIX)
+
+    def delete(self, job_id: str):
+        for suffix in (STATE_SUFFIX, RESULT_SUFFIX):
+            with suppress(FileNotFoundError):
+                os.remove(self._path(job_id, suffix))
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
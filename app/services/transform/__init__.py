@@ -1,3 +1,11 @@
+from app.configs.base import settings
 from app.services.transform.executor import PipelineExecutor
+from app.services.transform.prefix_cache import prefix_cache
+from app.services.transform.result_cache import result_cache
+from app.utils.pandas_util import set_copy_on_write
+
+# Applied on import so that worker processes of the execution pool use the same
+# mode as the API process
+set_copy_on_write(settings.PANDAS_COPY_ON_WRITE)
 
 pipeline_executor = PipelineExecutor()
@@ -0,0 +1,200 @@
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.configs.base import settings
+from app.services.transform.engines import get_engine
+from app.services.transform.loader import read_upload, read_upload_columns
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class _StepNode:
+    """Step of the trie merging the steps shared by the pipelines of a batch."""
+
+    def __init__(self, step: Optional[Dict[str, Any]] = None, depth: int = 0):
+        self.step = step
+        self.depth = depth
+        self.children: Dict[str, "_StepNode"] = {}
+        self.names: List[str] = []
+        self.ending: List[str] = []
+        self.pipeline: Optional[TransformationPipeline] = None
+
+    def child(self, step: Dict[str, Any]) -> "_StepNode":
+        key = json.dumps(step, sort_keys=True, default=str)
+        if key not in self.children:
+            self.children[key] = _StepNode(step, self.depth + 1)
+        return self.children[key]
+
+
+class PipelineBatch:
+    """
+    Execution of several pipelines over a single read of a file.
+
+    The pipelines share the parsed data, which is never modified. With the
+    pandas engine their steps are merged into a trie so that the leading steps
+    they have in common are executed once, and the branches where they differ
+    run concurrently. Other engines run each pipeline concurrently on the
+    shared data.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        pipelines: Dict[str, TransformationPipeline],
+        options: ExecutionOptions,
+    ):
+        self.filename = filename
+        self.options = options
+        self.engine = get_engine(options.engine or settings.EXECUTION_ENGINE)
+        self.pipelines = {
+            name: pipeline.optimize() if options.optimize else pipeline
+            for name, pipeline in pipelines.items()
+        }
+        self.pipeline_info = {
+            name: {**pipeline.get_pipeline_info(), "engine": self.engine.name}
+            for name, pipeline in self.pipelines.items()
+        }
+        if options.limit is not None or options.offset:
+            for info in self.pipeline_info.values():
+                info["pagination"] = {"offset": options.offset, "limit": options.limit}
+
+        self.available_columns: Optional[List[str]] = None
+        self.columns: Optional[List[str]] = None
+        if options.project_columns:
+            self.available_columns = read_upload_columns(filename)
+            self.columns = self._projected_columns()
+
+    def validate(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            Validation errors of the invalid pipelines, by pipeline name
+        """
+        errors = {}
+        for name, pipeline in self.pipelines.items():
+            validation_errors = pipeline.validate_pipeline()
+            if validation_errors:
+                errors[name] = validation_errors
+        return errors
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Execute the pipelines, yielding the results as they are completed.
+
+        Yields:
+            Tuple of (pipeline name, result) where the result holds the shapes,
+            the pipeline info and the transformed DataFrame
+        """
+        data = read_upload(self.filename, self.columns, self.options.arrow_strings)
+        original_shape = data.shape
+        if self.available_columns is not None:
+            original_shape = (original_shape[0], len(self.available_columns))
+
+        for name, result in self._results(data):
+            # Pipelines share intermediate results, so they are computed whole
+            # and only the requested page is kept
+            result = self._page(result)
+            yield name, {
+                "original_shape": original_shape,
+                "transformed_shape": result.shape,
+                "pipeline_info": self.pipeline_info[name],
+                "data": result,
+            }
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute the pipelines and return all results, in the order of the
+        pipelines.
+        """
+        results = dict(self)
+        return {name: results[name] for name in self.pipelines}
+
+    def _page(self, result: pd.DataFrame) -> pd.DataFrame:
+        end = None
+        if self.options.limit is not None:
+            end = self.options.offset + self.options.limit
+        return result.iloc[self.options.offset : end]
+
+    def _results(self, data: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+        if self.engine.name != "pandas":
+            branches = [(self._run_pipeline, name, data) for name in self.pipelines]
+            yield from self._run_concurrently(branches)
+            return
+
+        # Steps shared by every pipeline run once, before the first fork
+        node = self._build_trie()
+        while len(node.children) == 1 and not node.ending:
+            node = next(iter(node.children.values()))
+            data = self._run_step(node, data)
+
+        for name in node.ending:
+            yield name, data
+
+        branches = [(self._run_branch, child, data) for child in node.children.values()]
+        yield from self._run_concurrently(branches)
+
+    def _run_concurrently(
+        self, branches: List[Tuple]
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        if not branches:
+            return
+
+        workers = min(len(branches), settings.EXECUTOR_POOL_SIZE)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="batch"
+        ) as pool:
+            futures = [pool.submit(func, *args) for func, *args in branches]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def _run_branch(
+        self, node: _StepNode, data: pd.DataFrame
+    ) -> List[Tuple[str, pd.DataFrame]]:
+        # Depth first, so that each intermediate result is only kept while
+        # the pipelines sharing it are executed
+        data = self._run_step(node, data)
+        results = [(name, data) for name in node.ending]
+        for child in node.children.values():
+            results.extend(self._run_branch(child, data))
+        return results
+
+    def _run_pipeline(
+        self, name: str, data: pd.DataFrame
+    ) -> List[Tuple[str, pd.DataFrame]]:
+        result, details = self.engine.execute(self.pipelines[name], data)
+        self.pipeline_info[name].update(details)
+        return [(name, result)]
+
+    @staticmethod
+    def _run_step(node: _StepNode, data: pd.DataFrame) -> pd.DataFrame:
+        return node.pipeline._run_steps(data, [node.step], start=node.depth - 1)
+
+    def _build_trie(self) -> _StepNode:
+        root = _StepNode()
+        for name, pipeline in self.pipelines.items():
+            node = root
+            for step in pipeline.steps:
+                node = node.child(step)
+                node.names.append(name)
+                node.pipeline = node.pipeline or pipeline
+            node.ending.append(name)
+
+        for name, pipeline in self.pipelines.items():
+            shared_steps, node = 0, root
+            for step in pipeline.steps:
+                node = node.child(step)
+                shared_steps += len(node.names) > 1
+            self.pipeline_info[name]["shared_steps"] = shared_steps
+        return root
+
+    def _projected_columns(self) -> Optional[List[str]]:
+        # The data is shared, so it holds the columns needed by any pipeline
+        needed = set()
+        for pipeline in self.pipelines.values():
+            columns = pipeline.projected_columns(self.available_columns)
+            if columns is None:
+                return None
+            needed.update(columns)
+        return [column for column in self.available_columns if column in needed]
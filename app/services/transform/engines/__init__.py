@@ -0,0 +1,20 @@
+from app.services.transform.engines.base import ExecutionEngine
+from app.services.transform.engines.pandas_engine import PandasEngine
+from app.services.transform.engines.polars_engine import PolarsEngine
+
+ENGINES = {engine.name: engine for engine in (PandasEngine(), PolarsEngine())}
+
+
+def get_engine(name: str) -> ExecutionEngine:
+    """
+    Get an execution engine by name.
+
+    Raises:
+        ValueError: If no engine has that name
+    """
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown execution engine '{name}', expected one of {sorted(ENGINES)}"
+        )
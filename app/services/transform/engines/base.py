@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class ExecutionEngine(ABC):
+    """
+    Backend executing the steps of a pipeline over in-memory data.
+
+    Engines take and return pandas DataFrames so that reading files and
+    serializing results are the same whatever engine runs the steps.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def execute(
+        self,
+        pipeline: TransformationPipeline,
+        data: pd.DataFrame,
+        source: Optional[Hashable] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Execute the pipeline on the provided data.
+
+        Args:
+            pipeline: Pipeline to execute
+            data: Input DataFrame, which must not be modified
+            source: Identity of the input data, e.g. the hash of its file
+
+        Returns:
+            Tuple of (transformed DataFrame, details to add to the pipeline info)
+
+        Raises:
+            ValueError: If pipeline validation fails
+            Exception: If any transformation step fails
+        """
+        pass
@@ -0,0 +1,24 @@
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from app.services.transform.engines.base import ExecutionEngine
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class PandasEngine(ExecutionEngine):
+    """Eager execution of one step after another with pandas."""
+
+    name = "pandas"
+
+    def execute(
+        self,
+        pipeline: TransformationPipeline,
+        data: pd.DataFrame,
+        source: Optional[Hashable] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        result = pipeline.execute(data, source)
+        details = {}
+        if pipeline.prefix_cache_info is not None:
+            details["prefix_cache"] = pipeline.prefix_cache_info
+        return result, details
@@ -0,0 +1,134 @@
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from loguru import logger
+
+from app.services import registry
+from app.services.transform.engines.base import ExecutionEngine
+from app.services.transform.pipeline import TransformationPipeline
+from app.transformations.base import BaseTransformation
+from app.utils.pandas_util import (
+    is_nullable_dtype,
+    is_string_dtype,
+    to_arrow_strings,
+)
+
+
+class PolarsEngine(ExecutionEngine):
+    """
+    Execution of the pipeline as a lazy Polars query.
+
+    Consecutive steps supporting it are compiled into a single query, which
+    Polars optimizes and collects with its multi-threaded streaming engine.
+    Steps that only support pandas run on the data collected so far, and
+    execution goes on lazily from their result.
+    """
+
+    name = "polars"
+
+    def execute(
+        self,
+        pipeline: TransformationPipeline,
+        data: pd.DataFrame,
+        source: Optional[Hashable] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        pipeline._ensure_valid()
+
+        # Polars gives back strings as objects, they are converted again when
+        # the data was read with Arrow-backed strings
+        arrow_strings = any(is_string_dtype(dtype) for dtype in data.dtypes)
+        query = self._to_lazy(data)
+        nullable = _nullable_columns(data)
+        # Whether the query has steps that ``data`` doesn't have yet
+        lazy = False
+        pandas_steps: List[int] = []
+
+        for i, step in enumerate(pipeline.steps):
+            transformation_name = step["transformation"]
+            params = step.get("params", {})
+            transformation = registry.get_transformation(transformation_name)
+
+            if (
+                query is not None
+                and transformation.supports_lazy(params)
+                and not _reads_nullable(transformation, params, nullable)
+            ):
+                try:
+                    query = transformation.transform_lazy(query, params)
+                except NotImplementedError as e:
+                    logger.debug(
+                        f"Running {pipeline.describe_step(i)} with pandas: {e}"
+                    )
+                except Exception as e:
+                    raise Exception(
+                        f"Error in {pipeline.describe_step(i)} "
+                        f"({transformation_name}): {str(e)}"
+                    ) from e
+                else:
+                    renames = transformation.column_renames(params)
+                    nullable = {renames.get(column, column) for column in nullable}
+                    lazy = True
+                    continue
+
+            if lazy:
+                data = self._collect(query)
+                if arrow_strings:
+                    data = to_arrow_strings(data)
+            data = pipeline._run_steps(data, [step], start=i)
+            pandas_steps.append(i + 1)
+            query = self._to_lazy(data)
+            nullable = _nullable_columns(data)
+            lazy = False
+
+        if query is not None and pipeline.head is not None:
+            # Polars turns a sort followed by a head into a top-k selection
+            query = query.head(pipeline.head)
+        result = self._collect(query) if query is not None else data
+        if arrow_strings:
+            result = to_arrow_strings(result)
+        return result, {"pandas_steps": pandas_steps} if pandas_steps else {}
+
+    @staticmethod
+    def _to_lazy(data: pd.DataFrame) -> Optional[pl.LazyFrame]:
+        try:
+            # Categoricals from separate sources can't be compared in Polars
+            return (
+                pl.from_pandas(data)
+                .lazy()
+                .with_columns(pl.col(pl.Categorical).cast(pl.Utf8))
+            )
+        except Exception as e:
+            # e.g. object columns mixing types, the rest runs with pandas
+            logger.warning(f"Data cannot be converted to Polars: {e}")
+            return None
+
+    @staticmethod
+    def _collect(query: pl.LazyFrame) -> pd.DataFrame:
+        data = query.collect(streaming=True).to_pandas()
+        # Polars gives None for missing strings where pandas uses NaN
+        for column in data.select_dtypes(include=["object"]).columns:
+            if data[column].hasnans:
+                data[column] = data[column].fillna(np.nan)
+        return data
+
+
+def _nullable_columns(data: pd.DataFrame) -> Set[Hashable]:
+    return {column for column, dtype in data.dtypes.items() if is_nullable_dtype(dtype)}
+
+
+def _reads_nullable(
+    transformation: BaseTransformation, params: Dict[str, Any], nullable: Set
+) -> bool:
+    """
+    Whether the step depends on the missing values of columns whose missing
+    values are ``pd.NA``.
+
+    Polars can't tell them apart from missing values of other columns, so
+    these steps run with pandas, see ``BaseTransformation.reads_missing_values``.
+    """
+    if not nullable or not transformation.reads_missing_values(params):
+        return False
+    columns = transformation.input_columns(params)
+    return columns is None or not nullable.isdisjoint(columns)
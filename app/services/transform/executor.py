@@ -1,53 +1,497 @@
-import io
-from typing import Any, Dict
-
-import pandas as pd
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
+from app.configs.base import settings
+from app.enums.transform import FileResultMode
 from app.exception.errors import FileError, PipelineError
-from app.services.file.storage import read_file_from_upload_directory
+from app.services import registry
+from app.services.file.storage import get_upload_file_path, list_upload_files
+from app.services.transform.batch import PipelineBatch
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.partitions import PartitionPlan, combined_shape
 from app.services.transform.pipeline import TransformationPipeline
+from app.services.transform.result_cache import ResultCache, result_cache
+from app.services.transform.stream import PipelineStream
+from app.services.transform.worker_pool import ExecutionPool
+
+
+def run_pipeline_job(
+    filename: str,
+    steps: List[Dict[str, Any]],
+    options: ExecutionOptions,
+    registry_config: Optional[Dict[str, bool]] = None,
+) -> Dict[str, Any]:
+    """
+    Execute pipeline steps on a file, synchronously.
+
+    This is the unit of work submitted to the execution pool. It only takes
+    plain, cheaply picklable arguments so that it can run in a worker process,
+    where the registry configuration of the parent has to be applied again.
+
+    Args:
+        filename: Name of the file to transform
+        steps: Pipeline steps to execute
+        options: Execution options
+        registry_config: Registry configuration to apply before executing
+
+    Returns:
+        Dictionary containing transformation results
+
+    Raises:
+        FileError: If file doesn't exist
+        PipelineError: If pipeline validation or execution fails
+    """
+    result, _ = run_sized_pipeline_job(filename, steps, options, registry_config)
+    return result
+
+
+def run_sized_pipeline_job(
+    filename: str,
+    steps: List[Dict[str, Any]],
+    options: ExecutionOptions,
+    registry_config: Optional[Dict[str, bool]] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Execute pipeline steps on a file like ``run_pipeline_job``, also measuring
+    the result in the worker so that caching it costs nothing more.
+
+    Returns:
+        Tuple of (transformation results, size of the result data in bytes)
+    """
+    result = run_partition_job(filename, steps, options, registry_config)
+    size = int(result["data"].memory_usage(deep=True).sum())
+    return {**result, "data": result["data"].to_dict(orient="records")}, size
+
+
+def run_partition_job(
+    filename: str,
+    steps: List[Dict[str, Any]],
+    options: ExecutionOptions,
+    registry_config: Optional[Dict[str, bool]] = None,
+) -> Dict[str, Any]:
+    """
+    Execute pipeline steps on a file, synchronously, keeping the result as a
+    DataFrame to be combined with the results of other files.
+
+    Returns:
+        Dictionary containing transformation results, the data as a DataFrame
+
+    Raises:
+        FileError: If file doesn't exist
+        PipelineError: If pipeline execution fails
+    """
+    if registry_config is not None:
+        registry.set_configuration(registry_config)
+
+    pipeline = TransformationPipeline(steps)
+    try:
+        stream = PipelineStream(filename, pipeline, options)
+        result_data = stream.collect()
+
+        return {
+            "original_shape": stream.original_shape,
+            "transformed_shape": stream.transformed_shape,
+            "pipeline_info": stream.pipeline_info,
+            "data": result_data,
+        }
+
+    except FileNotFoundError:
+        raise FileError(
+            message=f"File not found: {filename}", details={"filename": filename}
+        )
+    except Exception as e:
+        raise PipelineError(
+            message="Pipeline execution failed", details={"error": str(e)}
+        )
+
+
+def run_batch_job(
+    filename: str,
+    pipelines: Dict[str, List[Dict[str, Any]]],
+    options: ExecutionOptions,
+    registry_config: Optional[Dict[str, bool]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Execute several pipelines on a single read of a file, synchronously.
+
+    Args:
+        filename: Name of the file to transform
+        pipelines: Steps of the pipelines to execute, by pipeline name
+        options: Execution options
+        registry_config: Registry configuration to apply before executing
+
+    Returns:
+        Dictionary containing the transformation results, by pipeline name
+
+    Raises:
+        FileError: If file doesn't exist
+        PipelineError: If pipeline validation or execution fails
+    """
+    if registry_config is not None:
+        registry.set_configuration(registry_config)
+
+    try:
+        batch = _prepare_batch(filename, pipelines, options)
+        return {
+            name: {**result, "data": result["data"].to_dict(orient="records")}
+            for name, result in batch.collect().items()
+        }
+    except (FileError, PipelineError):
+        raise
+    except FileNotFoundError:
+        raise FileError(
+            message=f"File not found: {filename}", details={"filename": filename}
+        )
+    except Exception as e:
+        raise PipelineError(
+            message="Pipeline execution failed", details={"error": str(e)}
+        )
+
+
+def resolve_files(
+    filenames: Optional[List[str]] = None, pattern: Optional[str] = None
+) -> List[str]:
+    """
+    Get the uploaded files selected by a list of names or a glob pattern.
+
+    Raises:
+        FileError: If a file doesn't exist or the pattern matches no file
+    """
+    if pattern is not None:
+        filenames = list_upload_files(pattern)
+        if not filenames:
+            raise FileError(
+                message=f"No file matches: {pattern}", details={"pattern": pattern}
+            )
+
+    for filename in filenames:
+        try:
+            get_upload_file_path(filename)
+        except FileNotFoundError:
+            raise FileError(
+                message=f"File not found: {filename}", details={"filename": filename}
+            )
+    return filenames
+
+
+def _prepare_batch(
+    filename: str,
+    pipelines: Dict[str, List[Dict[str, Any]]],
+    options: ExecutionOptions,
+) -> PipelineBatch:
+    try:
+        get_upload_file_path(filename)
+    except FileNotFoundError:
+        raise FileError(
+            message=f"File not found: {filename}", details={"filename": filename}
+        )
+
+    batch = PipelineBatch(
+        filename,
+        {name: TransformationPipeline(steps) for name, steps in pipelines.items()},
+        options,
+    )
+    validation_errors = batch.validate()
+    if validation_errors:
+        raise PipelineError(
+            message="Pipeline validation failed",
+            details={"errors": validation_errors},
+        )
+    return batch
 
 
 class PipelineExecutor:
 
-    @staticmethod
+    def __init__(
+        self,
+        pool: ExecutionPool = None,
+        cache: ResultCache = None,
+        partition_pool: ExecutionPool = None,
+    ):
+        self.pool = pool or ExecutionPool(
+            pool_type=settings.EXECUTOR_POOL_TYPE,
+            size=settings.EXECUTOR_POOL_SIZE,
+            queue_size=settings.EXECUTOR_QUEUE_SIZE,
+            timeout=settings.EXECUTOR_JOB_TIMEOUT,
+        )
+        self.cache = cache or result_cache
+        self.partition_pool = partition_pool or ExecutionPool(
+            pool_type=settings.PARTITION_POOL_TYPE,
+            size=settings.EXECUTOR_POOL_SIZE,
+            queue_size=settings.EXECUTOR_QUEUE_SIZE,
+            timeout=settings.EXECUTOR_JOB_TIMEOUT,
+        )
+
     async def execute_pipeline(
-        filename: str, pipeline: TransformationPipeline
+        self,
+        filename: str,
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions = None,
     ) -> Dict[str, Any]:
         """
-        Execute a transformation pipeline on a file.
+        Execute a transformation pipeline on a file in the execution pool.
+
+        Parsing, transforming and serializing are CPU-bound, running them in
+        the pool keeps the event loop responsive for other requests. Results
+        are cached by file content and pipeline, repeated executions are
+        served from the result cache without reaching the pool.
 
         Args:
             filename: Name of the file to transform
             pipeline: Pipeline to execute
+            options: Execution options, defaults to in-memory execution
 
         Returns:
             Dictionary containing transformation results
 
         Raises:
-            FileNotFoundError: If file doesn't exist
-            ValueError: If pipeline validation fails
-            Exception: If transformation fails
+            FileError: If file doesn't exist
+            PipelineError: If pipeline validation or execution fails
+            ExecutorBusyError: If the execution queue is full
+            ExecutionTimeoutError: If the execution exceeds the job timeout
         """
+        options = options or ExecutionOptions()
+        cache_key, cached = await asyncio.to_thread(
+            self._cached_result, filename, pipeline, options
+        )
+        if cached is not None:
+            return {
+                **cached,
+                "pipeline_info": {**cached["pipeline_info"], "cached": True},
+            }
+
+        registry_config = (
+            registry.get_configuration() if self.pool.is_process_pool else None
+        )
+        result, size = await self.pool.run(
+            run_sized_pipeline_job,
+            filename,
+            pipeline.steps,
+            options,
+            registry_config,
+        )
+
+        if cache_key is not None:
+            if self.cache.directory is None:
+                self.cache.put(cache_key, result, size)
+            else:
+                await asyncio.to_thread(self.cache.put, cache_key, result, size)
+        return result
+
+    def _cached_result(
+        self,
+        filename: str,
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions,
+    ) -> Tuple[Optional[Tuple[str, str]], Optional[Dict[str, Any]]]:
+        if not settings.RESULT_CACHE_ENABLED:
+            return None, None
+
         try:
-            content = await read_file_from_upload_directory(filename)
-            csv_data = pd.read_csv(io.StringIO(content.decode("utf-8")))
+            cache_key = self.cache.key(
+                filename, pipeline.steps, options, registry.get_configuration()
+            )
+        except FileNotFoundError:
+            # Reported by the execution itself
+            return None, None
+        return cache_key, self.cache.get(cache_key)
 
-            result_data = pipeline.execute(csv_data)
-            result_json = result_data.to_dict(orient="records")
+    async def execute_batch(
+        self,
+        filename: str,
+        pipelines: Dict[str, TransformationPipeline],
+        options: ExecutionOptions = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute several pipelines on a file in the execution pool.
 
-            return {
-                "original_shape": csv_data.shape,
-                "transformed_shape": result_data.shape,
-                "pipeline_info": pipeline.get_pipeline_info(),
-                "data": result_json,
+        The file is read once and shared by the pipelines, see
+        ``PipelineBatch``.
+
+        Args:
+            filename: Name of the file to transform
+            pipelines: Pipelines to execute, by name
+            options: Execution options, defaults to in-memory execution
+
+        Returns:
+            Dictionary containing the transformation results, by pipeline name
+
+        Raises:
+            FileError: If file doesn't exist
+            PipelineError: If pipeline validation or execution fails
+            ExecutorBusyError: If the execution queue is full
+            ExecutionTimeoutError: If the execution exceeds the job timeout
+        """
+        registry_config = (
+            registry.get_configuration() if self.pool.is_process_pool else None
+        )
+        return await self.pool.run(
+            run_batch_job,
+            filename,
+            {name: pipeline.steps for name, pipeline in pipelines.items()},
+            options or ExecutionOptions(),
+            registry_config,
+        )
+
+    async def execute_files(
+        self,
+        filenames: List[str],
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions = None,
+        combine: FileResultMode = FileResultMode.CONCAT,
+    ) -> Dict[str, Any]:
+        """
+        Execute a pipeline on several files, in parallel in the partition pool.
+
+        With ``concat`` the files are transformed as one dataset, see
+        ``PartitionPlan``, and a single result is returned. With ``per_file``
+        the pipeline runs on each file independently and the results are
+        returned by file name. At most one execution per worker is in flight,
+        so that a request for many files does not fill the pool queue.
+
+        Args:
+            filenames: Names of the files to transform
+            pipeline: Pipeline to execute
+            options: Execution options, defaults to in-memory execution
+            combine: How the results of the files are returned
+
+        Returns:
+            Dictionary containing the transformation results, with ``concat``,
+            or containing them by file name in ``results``, with ``per_file``
+
+        Raises:
+            FileError: If a file doesn't exist
+            PipelineError: If pipeline validation or execution fails
+            ExecutorBusyError: If the execution queue is full
+            ExecutionTimeoutError: If an execution exceeds the job timeout
+        """
+        options = options or ExecutionOptions()
+        validation_errors = pipeline.validate_pipeline()
+        if validation_errors:
+            raise PipelineError(
+                message="Pipeline validation failed",
+                details={"errors": validation_errors},
+            )
+
+        registry_config = (
+            registry.get_configuration()
+            if self.partition_pool.is_process_pool
+            else None
+        )
+        slots = asyncio.Semaphore(self.partition_pool.size)
+
+        async def run(job, filename, steps, job_options):
+            async with slots:
+                return await self.partition_pool.run(
+                    job, filename, steps, job_options, registry_config
+                )
+
+        if combine == FileResultMode.PER_FILE:
+            results = await asyncio.gather(
+                *(
+                    run(run_pipeline_job, filename, pipeline.steps, options)
+                    for filename in filenames
+                )
+            )
+            return {"results": dict(zip(filenames, results))}
+
+        pipeline = pipeline.optimize() if options.optimize else pipeline.copy()
+        if options.limit is not None:
+            pipeline.head = options.offset + options.limit
+        plan = PartitionPlan(pipeline)
+        partition_options = plan.partition_options(options)
+        results = await asyncio.gather(
+            *(
+                run(
+                    run_partition_job, filename, plan.partition_steps, partition_options
+                )
+                for filename in filenames
+            )
+        )
+
+        data = await asyncio.to_thread(
+            plan.combine, [result["data"] for result in results], options
+        )
+        pipeline_info = {
+            **pipeline.get_pipeline_info(),
+            **plan.get_plan_info(),
+            "engine": results[0]["pipeline_info"]["engine"],
+            "files": filenames,
+        }
+        if options.limit is not None or options.offset:
+            pipeline_info["pagination"] = {
+                "offset": options.offset,
+                "limit": options.limit,
             }
+        return {
+            "original_shape": combined_shape(
+                [result["original_shape"] for result in results]
+            ),
+            "transformed_shape": data.shape,
+            "pipeline_info": pipeline_info,
+            "data": await asyncio.to_thread(data.to_dict, orient="records"),
+        }
+
+    def shutdown(self):
+        self.pool.shutdown()
+        self.partition_pool.shutdown()
+
+    @staticmethod
+    def stream_pipeline(
+        filename: str,
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions = None,
+    ) -> PipelineStream:
+        """
+        Prepare a pipeline for execution with the result produced in batches.
 
+        The file and the pipeline are checked up front so that these errors are
+        reported before any part of the response is sent.
+
+        Args:
+            filename: Name of the file to transform
+            pipeline: Pipeline to execute
+            options: Execution options, defaults to in-memory execution
+
+        Returns:
+            PipelineStream yielding the transformed rows in batches
+
+        Raises:
+            FileError: If file doesn't exist
+            PipelineError: If pipeline validation fails
+        """
+        try:
+            get_upload_file_path(filename)
         except FileNotFoundError:
             raise FileError(
                 message=f"File not found: {filename}", details={"filename": filename}
             )
-        except Exception as e:
+
+        validation_errors = pipeline.validate_pipeline()
+        if validation_errors:
             raise PipelineError(
-                message="Pipeline execution failed", details={"error": str(e)}
+                message="Pipeline validation failed",
+                details={"errors": validation_errors},
             )
+
+        return PipelineStream(filename, pipeline, options or ExecutionOptions())
+
+    @staticmethod
+    def stream_batch(
+        filename: str,
+        pipelines: Dict[str, TransformationPipeline],
+        options: ExecutionOptions = None,
+    ) -> PipelineBatch:
+        """
+        Prepare several pipelines for execution with their results produced
+        as they are completed.
+
+        Raises:
+            FileError: If file doesn't exist
+            PipelineError: If pipeline validation fails
+        """
+        return _prepare_batch(
+            filename,
+            {name: pipeline.steps for name, pipeline in pipelines.items()},
+            options or ExecutionOptions(),
+        )
@@ -0,0 +1,211 @@
+import os
+import pickle
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from app.configs.base import settings
+
+
+def external_sort(
+    chunks: Iterable[pd.DataFrame],
+    columns: List[str],
+    ascending: List[bool],
+    head: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stable sort of a stream of chunks that may not fit in memory.
+
+    Chunks are buffered until ``EXTERNAL_SORT_RUN_ROWS`` rows are held, the
+    buffer is then sorted and spilled to a temporary file as a sorted run.
+    Once every chunk is read the runs are merged, reading and producing
+    ``STREAMING_CHUNK_ROWS`` rows at a time, so memory holds one block per run
+    rather than the whole data. Data fitting in a single run is sorted in
+    memory without spilling.
+
+    Rows with equal keys keep their incoming order and missing values sort
+    last, like ``SortTransformation``.
+
+    Args:
+        chunks: DataFrames to sort, in their incoming order
+        columns: Sort columns
+        ascending: Sort direction of each column
+        head: Number of leading sorted rows needed, None for all
+
+    Yields:
+        Sorted DataFrames
+    """
+    run_rows = settings.EXTERNAL_SORT_RUN_ROWS
+    block_rows = settings.STREAMING_CHUNK_ROWS
+    buffer: List[pd.DataFrame] = []
+    buffered = 0
+
+    with tempfile.TemporaryDirectory(
+        prefix="sort-", dir=settings.EXTERNAL_SORT_DIRECTORY or None
+    ) as directory:
+        runs: List[Tuple[str, int]] = []
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= run_rows:
+                run = _sort(pd.concat(buffer), columns, ascending).iloc[:head]
+                runs.append(_spill(run, directory, len(runs), block_rows))
+                buffer, buffered = [], 0
+
+        if not runs:
+            if buffer:
+                yield _sort(pd.concat(buffer), columns, ascending).iloc[:head]
+            return
+
+        if buffered:
+            run = _sort(pd.concat(buffer), columns, ascending).iloc[:head]
+            runs.append(_spill(run, directory, len(runs), block_rows))
+        buffer = []
+        logger.info(f"Merging {len(runs)} sorted runs spilled to disk")
+
+        remaining = head
+        for block in _merge(runs, columns, ascending):
+            if remaining is not None:
+                block = block.iloc[:remaining]
+                remaining -= len(block)
+            yield block
+            if remaining == 0:
+                return
+
+
+def _sort(data: pd.DataFrame, columns: List[str], ascending: List[bool]):
+    return data.sort_values(by=columns, ascending=ascending, kind="stable")
+
+
+def _spill(
+    run: pd.DataFrame, directory: str, index: int, block_rows: int
+) -> Tuple[str, int]:
+    """
+    Write a sorted run as a sequence of pickled blocks.
+
+    Returns:
+        Tuple of (path of the run, number of blocks)
+    """
+    path = os.path.join(directory, f"run-{index}.pkl")
+    blocks = 0
+    with open(path, "wb") as file:
+        for start in range(0, len(run), block_rows):
+            pickle.dump(
+                run.iloc[start : start + block_rows],
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            blocks += 1
+    return path, blocks
+
+
+def _read_blocks(path: str) -> Iterator[pd.DataFrame]:
+    with open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _merge(
+    runs: List[Tuple[str, int]], columns: List[str], ascending: List[bool]
+) -> Iterator[pd.DataFrame]:
+    """
+    K-way merge of sorted runs, one block of each run in memory at a time.
+
+    Rows are ordered by their keys, then by run, then by position in the run,
+    which is their incoming order. Each round finds the smallest last loaded
+    row among the runs that have blocks left to read: no row still on disk
+    comes before it, so every loaded row up to it is merged and produced. Its
+    run is then entirely consumed and its next block is loaded.
+    """
+    readers = [_read_blocks(path) for path, _ in runs]
+    try:
+        yield from _merge_blocks(readers, runs, columns, ascending)
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+def _merge_blocks(
+    readers: List[Iterator[pd.DataFrame]],
+    runs: List[Tuple[str, int]],
+    columns: List[str],
+    ascending: List[bool],
+) -> Iterator[pd.DataFrame]:
+    blocks_left = [blocks for _, blocks in runs]
+    buffers: List[pd.DataFrame] = []
+    for i, reader in enumerate(readers):
+        buffers.append(next(reader))
+        blocks_left[i] -= 1
+
+    while True:
+        active = [i for i, buffer in enumerate(buffers) if len(buffer)]
+        pending = [i for i in active if blocks_left[i]]
+        if not pending:
+            if active:
+                yield _sort(pd.concat([buffers[i] for i in active]), columns, ascending)
+            return
+
+        last_rows = pd.concat([buffers[i].iloc[-1:] for i in pending])
+        cut = pending[_first_position(last_rows, columns, ascending)]
+        cut_row = buffers[cut].iloc[-1]
+
+        merged = []
+        for i in active:
+            if i == cut:
+                take = len(buffers[i])
+            else:
+                take = int(
+                    _precedes(buffers[i], cut_row, columns, ascending, i < cut).sum()
+                )
+            merged.append(buffers[i].iloc[:take])
+            buffers[i] = buffers[i].iloc[take:]
+        yield _sort(pd.concat(merged), columns, ascending)
+
+        for i in active:
+            if not len(buffers[i]) and blocks_left[i]:
+                buffers[i] = next(readers[i])
+                blocks_left[i] -= 1
+
+
+def _first_position(
+    data: pd.DataFrame, columns: List[str], ascending: List[bool]
+) -> int:
+    """Position of the first row of the data once stably sorted."""
+    positions = data.reset_index(drop=True)
+    return int(_sort(positions, columns, ascending).index[0])
+
+
+def _precedes(
+    data: pd.DataFrame,
+    row: pd.Series,
+    columns: List[str],
+    ascending: List[bool],
+    ties: bool,
+) -> np.ndarray:
+    """
+    Mask of the rows of the data sorting before a row, with missing values
+    last. Rows with keys equal to the row are included when ``ties`` is set.
+    """
+    before = np.zeros(len(data), dtype=bool)
+    equal = np.ones(len(data), dtype=bool)
+    for column, column_ascending in zip(columns, ascending):
+        values, value = data[column], row[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Categories are sorted, so codes and values sort alike
+            values = values.astype(values.cat.categories.dtype)
+        missing = values.isna().to_numpy()
+        if pd.isna(value):
+            column_before, column_equal = ~missing, missing
+        else:
+            compared = values < value if column_ascending else values > value
+            column_before = compared.to_numpy(dtype=bool) & ~missing
+            column_equal = (values == value).to_numpy(dtype=bool)
+        before |= equal & column_before
+        equal &= column_equal
+    return before | equal if ties else before
@@ -0,0 +1,161 @@
+from typing import Iterator, List
+
+import pandas as pd
+
+from app.configs.base import settings
+from app.services.file.cache import dataframe_cache
+from app.services.file.columnar import (
+    iter_columnar_sidecar,
+    read_columnar_columns,
+    read_columnar_sidecar,
+)
+from app.services.file.schema import (
+    read_csv_typed,
+    read_schema_sidecar,
+    schema_dtypes,
+)
+from app.services.file.storage import open_memory_mapped
+from app.utils.pandas_util import to_arrow_strings
+
+
+def read_upload_columns(filename: str) -> List[str]:
+    """
+    Get the column names of an uploaded file without loading its rows.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        List of column names, in file order
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    cached = dataframe_cache.get(filename)
+    if cached is not None:
+        return list(cached.columns)
+
+    columns = read_columnar_columns(filename)
+    if columns is not None:
+        return columns
+
+    schema = read_schema_sidecar(filename)
+    if schema is not None:
+        return [column["name"] for column in schema["columns"]]
+
+    with open_memory_mapped(filename) as buffer:
+        return list(pd.read_csv(buffer, nrows=0).columns)
+
+
+def read_upload(
+    filename: str, columns: List[str] = None, arrow_strings: bool = False
+) -> pd.DataFrame:
+    """
+    Read an uploaded file into a single DataFrame.
+
+    Parsed uploads are served from the DataFrame cache. On a miss the
+    columnar sidecar is used when there is a fresh one, the CSV is parsed
+    otherwise, with the dtypes of its schema, and the result is cached.
+    Reads of a subset of the columns only load those columns and are not
+    cached.
+
+    Args:
+        filename: Name of the uploaded file
+        columns: Optional subset of columns to read, in file order
+        arrow_strings: Read string columns as ``string[pyarrow]``
+
+    Returns:
+        Parsed DataFrame
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    data = dataframe_cache.get(filename, arrow_strings)
+    if data is not None:
+        return data if columns is None else data[columns]
+
+    data = read_columnar_sidecar(filename, columns, arrow_strings)
+    if data is None:
+        data = read_csv_typed(filename, columns)
+        if arrow_strings:
+            data = to_arrow_strings(data)
+
+    if columns is None:
+        dataframe_cache.put(filename, data, arrow_strings)
+    return data
+
+
+def iter_upload_chunks(
+    filename: str,
+    chunk_size: int = None,
+    columns: List[str] = None,
+    arrow_strings: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read an uploaded file as a stream of DataFrames.
+
+    A cached DataFrame is sliced into chunks, otherwise the file is read
+    chunk by chunk without being added to the cache.
+
+    Args:
+        filename: Name of the uploaded file
+        chunk_size: Number of rows per chunk
+        columns: Optional subset of columns to read, in file order
+        arrow_strings: Read string columns as ``string[pyarrow]``
+
+    Yields:
+        DataFrame chunks in file order
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_ROWS
+
+    cached = dataframe_cache.get(filename, arrow_strings)
+    if cached is not None:
+        if columns is not None:
+            cached = cached[columns]
+        for start in range(0, max(len(cached), 1), chunk_size):
+            yield cached.iloc[start : start + chunk_size]
+        return
+
+    chunks = iter_columnar_sidecar(filename, chunk_size, columns, arrow_strings)
+    if chunks is not None:
+        yield from chunks
+        return
+
+    # Categories found in separate chunks would differ, so category candidates
+    # are read as text
+    dtypes = schema_dtypes(filename, categories=False)
+    with open_memory_mapped(filename) as buffer:
+        with pd.read_csv(
+            buffer, chunksize=chunk_size, usecols=columns, dtype=dtypes
+        ) as reader:
+            empty = True
+            for chunk in reader:
+                empty = False
+                yield to_arrow_strings(chunk) if arrow_strings else chunk
+
+        if empty:
+            # One empty chunk keeps the columns known to the stream
+            buffer.seek(0)
+            chunk = pd.read_csv(buffer, nrows=0, usecols=columns, dtype=dtypes)
+            yield to_arrow_strings(chunk) if arrow_strings else chunk
+
+
+class ShapeTracker:
+    """Count rows and columns of chunks as they flow through a stream."""
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = 0
+
+    @property
+    def shape(self):
+        return self.rows, self.columns
+
+    def track(self, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        for chunk in chunks:
+            self.rows += len(chunk)
+            self.columns = len(chunk.columns)
+            yield chunk
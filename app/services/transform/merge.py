@@ -0,0 +1,32 @@
+from typing import List
+
+import pandas as pd
+
+
+def merge_sorted(
+    frames: List[pd.DataFrame], column: str, ascending: bool
+) -> pd.DataFrame:
+    """
+    Merge DataFrames that are each sorted on a column into one sorted DataFrame.
+
+    The result is the stable sort of their concatenation: rows with equal keys
+    keep the order of the frames, then their order within each frame. Each
+    frame is one sorted run of the concatenated keys, which the stable sort
+    (timsort) detects and merges pairwise, so merging n rows from k frames
+    costs O(n log k) rather than a full sort.
+
+    Args:
+        frames: DataFrames sorted on ``column``, missing values last
+        column: Sort column
+        ascending: Sort direction of the frames
+
+    Returns:
+        Merged DataFrame with a fresh index
+    """
+    frames = [frame for frame in frames if not frame.empty] or frames[:1]
+    merged = pd.concat(frames, ignore_index=True)
+    if len(frames) == 1:
+        return merged
+    return merged.sort_values(
+        column, ascending=ascending, kind="stable", ignore_index=True
+    )
@@ -0,0 +1,250 @@
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services import registry
+from app.transformations.implementations import (
+    FilterTransformation,
+    MapColumnTransformation,
+    SortTransformation,
+    UppercaseTransformation,
+)
+
+MAX_PASSES = 10
+
+
+class PipelineOptimizer:
+    """
+    Rule-based rewriter producing an equivalent but cheaper list of steps.
+
+    The rules only reason about the built-in transformations, any other step
+    is left in place and acts as a barrier:
+
+    - filters are pushed ahead of steps that don't change the columns they
+      read, following renames
+    - adjacent filters are fused into a single filter evaluating one mask
+    - sorts whose keys are all covered by a later sort are dropped
+    - consecutive renames are collapsed into a single rename
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]]):
+        self.steps = copy.deepcopy(steps)
+        self.applied: List[str] = []
+        # Numbers of the original steps each step was made from
+        self.sources: List[List[int]] = [[i + 1] for i in range(len(steps))]
+
+    def optimize(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Apply the rules until the plan stops changing.
+
+        Returns:
+            Tuple of (optimized steps, descriptions of the applied rewrites)
+        """
+        for _ in range(MAX_PASSES):
+            changed = self._push_down_filters()
+            changed |= self._fuse_filters()
+            changed |= self._drop_superseded_sorts()
+            changed |= self._collapse_renames()
+            if not changed:
+                break
+        return self.steps, self.applied
+
+    def _push_down_filters(self) -> bool:
+        changed = False
+        for i in range(1, len(self.steps)):
+            if not self._is(i, FilterTransformation):
+                continue
+
+            position = i
+            while position > 0:
+                swapped = self._move_filter_before(
+                    self.steps[position], self.steps[position - 1]
+                )
+                if swapped is None:
+                    break
+                self.applied.append(
+                    f"Moved filter on {self._filter_columns(swapped)} ahead of "
+                    f"{self.steps[position - 1]['transformation']}"
+                )
+                self.steps[position] = self.steps[position - 1]
+                self.steps[position - 1] = swapped
+                self._swap_sources(position - 1, position)
+                position -= 1
+                changed = True
+        return changed
+
+    def _move_filter_before(
+        self, filter_step: Dict[str, Any], previous: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Rewrite a filter so that it can run before the previous step.
+
+        Returns:
+            The rewritten filter step, or None if the steps don't commute
+        """
+        transformation = registry.get_transformation(previous["transformation"])
+        params = previous.get("params", {})
+        columns = set(self._filter_columns(filter_step))
+
+        if isinstance(transformation, SortTransformation):
+            return filter_step
+
+        if isinstance(transformation, UppercaseTransformation):
+            touched = params.get("columns", "all")
+            if touched == "all" or columns & set(touched):
+                return None
+            return filter_step
+
+        if isinstance(transformation, MapColumnTransformation):
+            if params["type"] == "value_map":
+                return None if params["column"] in columns else filter_step
+
+            mapping = params["mapping"]
+            renamed = {}
+            for column in columns:
+                sources = [old for old, new in mapping.items() if new == column]
+                if column in mapping and not sources:
+                    # The column no longer exists after the rename
+                    return None
+                if len(sources) > 1:
+                    return None
+                renamed[column] = sources[0] if sources else column
+
+            rewritten = copy.deepcopy(filter_step)
+            self._rename_conditions(rewritten["params"], renamed)
+            return rewritten
+
+        return None
+
+    def _fuse_filters(self) -> bool:
+        changed = False
+        i = 0
+        while i < len(self.steps) - 1:
+            if self._is(i, FilterTransformation) and self._is(
+                i + 1, FilterTransformation
+            ):
+                conditions = self._conditions(self.steps[i]["params"])
+                conditions += self._conditions(self.steps[i + 1]["params"])
+                self.steps[i] = {
+                    "transformation": self.steps[i]["transformation"],
+                    "params": {"and": conditions},
+                }
+                del self.steps[i + 1]
+                self._merge_sources(i)
+                self.applied.append(f"Fused adjacent filters at step {i + 1}")
+                changed = True
+            else:
+                i += 1
+        return changed
+
+    def _drop_superseded_sorts(self) -> bool:
+        for i in range(len(self.steps)):
+            if self._is(i, SortTransformation) and self._is_superseded_sort(i):
+                column = self.steps[i]["params"]["column"]
+                self.applied.append(
+                    f"Removed sort on {column!r} made pointless by a later sort"
+                )
+                del self.steps[i]
+                del self.sources[i]
+                return True
+        return False
+
+    def _is_superseded_sort(self, index: int) -> bool:
+        """
+        Whether a later sort covers every key of the sort at ``index``.
+
+        Later sorts are stable, so ties in their keys keep the order produced by
+        earlier steps. If those keys include every key of the earlier sort, the
+        tied rows have equal values for those keys too and the earlier sort has
+        no effect on them.
+        """
+        keys = set(self._sort_keys(self.steps[index]["params"]))
+
+        for step in self.steps[index + 1 :]:
+            transformation = registry.get_transformation(step["transformation"])
+            params = step.get("params", {})
+
+            if isinstance(transformation, SortTransformation):
+                if keys <= set(self._sort_keys(params)):
+                    return True
+            elif isinstance(transformation, FilterTransformation):
+                continue
+            elif isinstance(transformation, UppercaseTransformation):
+                touched = params.get("columns", "all")
+                if touched == "all" or keys & set(touched):
+                    return False
+            elif isinstance(transformation, MapColumnTransformation):
+                if params["type"] == "value_map":
+                    if params["column"] in keys:
+                        return False
+                else:
+                    keys = {params["mapping"].get(key, key) for key in keys}
+            else:
+                return False
+        return False
+
+    def _collapse_renames(self) -> bool:
+        for i in range(len(self.steps) - 1):
+            if self._is_rename(i) and self._is_rename(i + 1):
+                first = self.steps[i]["params"]["mapping"]
+                second = self.steps[i + 1]["params"]["mapping"]
+
+                mapping = {old: second.get(new, new) for old, new in first.items()}
+                for old, new in second.items():
+                    if old not in first.values() and old not in first:
+                        mapping[old] = new
+
+                self.steps[i] = {
+                    "transformation": self.steps[i]["transformation"],
+                    "params": {"type": "rename", "mapping": mapping},
+                }
+                del self.steps[i + 1]
+                self._merge_sources(i)
+                self.applied.append(f"Collapsed consecutive renames at step {i + 1}")
+                return True
+        return False
+
+    def _swap_sources(self, first: int, second: int):
+        self.sources[first], self.sources[second] = (
+            self.sources[second],
+            self.sources[first],
+        )
+
+    def _merge_sources(self, index: int):
+        """Merge the sources of the step after ``index``, which was removed."""
+        self.sources[index] = sorted(self.sources[index] + self.sources.pop(index + 1))
+
+    def _is(self, index: int, transformation_class: type) -> bool:
+        transformation = registry.get_transformation(
+            self.steps[index]["transformation"]
+        )
+        return isinstance(transformation, transformation_class)
+
+    def _is_rename(self, index: int) -> bool:
+        return (
+            self._is(index, MapColumnTransformation)
+            and self.steps[index]["params"]["type"] == "rename"
+        )
+
+    @staticmethod
+    def _sort_keys(params: Dict[str, Any]) -> List[str]:
+        column = params["column"]
+        return column if isinstance(column, list) else [column]
+
+    @staticmethod
+    def _conditions(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return list(params["and"]) if "and" in params else [params]
+
+    @staticmethod
+    def _filter_columns(filter_step: Dict[str, Any]) -> List[str]:
+        transformation = registry.get_transformation(filter_step["transformation"])
+        return transformation.input_columns(filter_step["params"])
+
+    @classmethod
+    def _rename_conditions(cls, params: Dict[str, Any], renamed: Dict[str, str]):
+        if "and" in params or "or" in params:
+            for condition in params.get("and", params.get("or")):
+                cls._rename_conditions(condition, renamed)
+        elif "not" in params:
+            cls._rename_conditions(params["not"], renamed)
+        else:
+            params["column"] = renamed.get(params["column"], params["column"])
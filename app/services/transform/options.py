@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ExecutionOptions:
+    streaming: bool = False
+    project_columns: bool = False
+    optimize: bool = True
+    engine: Optional[str] = None
+    limit: Optional[int] = None
+    offset: int = 0
+    arrow_strings: bool = False
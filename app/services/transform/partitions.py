@@ -0,0 +1,86 @@
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.services.transform.merge import merge_sorted
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class PartitionPlan:
+    """
+    Execution of a pipeline on several files as one dataset.
+
+    Each file is a partition. The leading row-wise steps give the same rows
+    whether they run on the partitions or on their concatenation, so they run
+    on each partition independently. A single sort following them runs on the
+    partitions as well, the sorted partitions are then merged. Any other steps
+    run once, on the combined partitions.
+    """
+
+    def __init__(self, pipeline: TransformationPipeline):
+        self.pipeline = pipeline
+        self.partition_steps, self.remaining_steps = pipeline.split_row_wise()
+        self.merge_sort: Optional[Dict[str, Any]] = None
+        if (
+            len(self.remaining_steps) == 1
+            and self.remaining_steps[0]["transformation"] == "sort"
+        ):
+            self.merge_sort = self.remaining_steps[0].get("params", {})
+            self.partition_steps, self.remaining_steps = list(pipeline.steps), []
+
+    def partition_options(self, options: ExecutionOptions) -> ExecutionOptions:
+        """
+        Options of the executions of the partition steps.
+
+        The pipeline is already optimized, and when steps remain after the
+        partition steps the columns they need are not known to the partitions,
+        so no projection is done. Pagination applies to the combined result.
+        """
+        # Without remaining steps the page is within the first rows of each
+        # partition
+        limit = None
+        if options.limit is not None and not self.remaining_steps:
+            limit = options.offset + options.limit
+        return replace(
+            options,
+            optimize=False,
+            project_columns=options.project_columns and not self.remaining_steps,
+            limit=limit,
+            offset=0,
+        )
+
+    def combine(
+        self, results: List[pd.DataFrame], options: ExecutionOptions
+    ) -> pd.DataFrame:
+        """
+        Combine the transformed partitions, in file order, run the remaining
+        steps on them and keep the requested page.
+        """
+        if self.merge_sort is not None:
+            data = merge_sorted(
+                results, self.merge_sort["column"], self.merge_sort["ascending"]
+            )
+        else:
+            # Empty partitions are left out, as in ``merge_sorted``
+            results = [result for result in results if not result.empty] or results[:1]
+            data = pd.concat(results, ignore_index=True)
+            if self.remaining_steps:
+                start = len(self.partition_steps)
+                data = self.pipeline._run_steps(data, self.remaining_steps, start=start)
+
+        end = None
+        if options.limit is not None:
+            end = options.offset + options.limit
+        return data.iloc[options.offset : end]
+
+    def get_plan_info(self) -> Dict[str, Any]:
+        return {
+            "partition_steps": len(self.partition_steps),
+            "merged_sort": self.merge_sort is not None,
+        }
+
+
+def combined_shape(shapes: List[Tuple[int, int]]) -> Tuple[int, int]:
+    return sum(rows for rows, _ in shapes), max((cols for _, cols in shapes), default=0)
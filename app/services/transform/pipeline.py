@@ -1,22 +1,48 @@
+import copy
 import json
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import pandas as pd
 import yaml
 from loguru import logger
 
 from app.adapters import groq_ai_adapter
+from app.configs.base import settings
 from app.services import registry
 from app.services.file.storage import get_csv_columns, read_file
+from app.services.transform.external_sort import external_sort
+from app.services.transform.optimizer import PipelineOptimizer
+from app.services.transform.prefix_cache import prefix_cache
 from app.services.transform.prompts import (
     ai_generate_pipeline_prompt,
     user_prompt_to_generate_pipeline,
 )
+from app.transformations.implementations import SortTransformation
+from app.utils.pandas_util import copy_on_write
 
 
 class TransformationPipeline:
     def __init__(self, steps: List[Dict[str, Any]] = None):
         self.steps = steps or []
+        self.original_steps: Optional[List[Dict[str, Any]]] = None
+        # Numbers of the original steps each optimized step was made from
+        self.step_sources: Optional[List[List[int]]] = None
+        self.optimizations: List[str] = []
+        self.prefix_cache_info: Optional[Dict[str, int]] = None
+        # Called with the number of completed steps after each step
+        self.progress: Optional[Callable[[int], None]] = None
+        # Number of leading result rows needed, None for the whole result
+        self.head: Optional[int] = None
 
     def add_step(self, transformation_name: str, params: Dict[str, Any]):
         step = {"transformation": transformation_name, "params": params}
@@ -59,12 +85,26 @@ class TransformationPipeline:
 
         return errors
 
-    def execute(self, data: pd.DataFrame) -> pd.DataFrame:
+    def execute(
+        self, data: pd.DataFrame, source: Optional[Hashable] = None
+    ) -> pd.DataFrame:
         """
         Execute the pipeline on the provided data.
 
+        The input is not copied up front, each step returns a new frame that
+        may share unmodified columns with its input. Steps that may modify
+        their input receive a private copy, see
+        ``BaseTransformation.modifies_input``.
+
+        When the identity of the data is given, the result of every step is
+        kept in the prefix cache and execution resumes from the longest prefix
+        of steps already computed for the same data. The number of steps
+        skipped and the size of the reused frame are then recorded in
+        ``prefix_cache_info``.
+
         Args:
             data: Input DataFrame
+            source: Identity of the input data, e.g. the hash of its file
 
         Returns:
             Transformed DataFrame
@@ -73,42 +113,281 @@ class TransformationPipeline:
             ValueError: If pipeline validation fails
             Exception: If any transformation step fails
         """
+        self._ensure_valid()
+        if source is None or not settings.PREFIX_CACHE_ENABLED:
+            return self._run_steps(data, self.steps)
+
+        keys = prefix_cache.keys(source, self.steps)
+        depth, cached, size = prefix_cache.lookup(keys)
+        self.prefix_cache_info = {"hit_depth": depth, "bytes_saved": size}
+        if cached is not None:
+            logger.info(f"Resuming from cached result of step {depth}")
+            data = cached
+
+        def cache_result(i: int, result: pd.DataFrame):
+            # The last step only produced the head of its result
+            if self.head is None or i < len(self.steps) - 1:
+                prefix_cache.put(keys[i], result)
+
+        return self._run_steps(
+            data, self.steps[depth:], start=depth, on_step=cache_result
+        )
+
+    def execute_chunks(
+        self, chunks: Iterable[pd.DataFrame], filters_only: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute the pipeline over a stream of chunks.
+
+        The leading row-wise steps are applied to every chunk as it arrives,
+        the remaining steps run once over the concatenated, reduced data.
+        When every step is row-wise the transformed chunks are yielded as they
+        are produced. When only a sort remains, it runs as an external merge
+        sort over the transformed chunks, see ``external_sort``.
+
+        Args:
+            chunks: Iterable of input DataFrames sharing the same columns
+            filters_only: Only apply the leading row filters chunk by chunk
+
+        Yields:
+            Transformed DataFrames
+
+        Raises:
+            ValueError: If pipeline validation fails
+            Exception: If any transformation step fails
+        """
+        self._ensure_valid()
+        chunk_steps, remaining_steps = (
+            self.split_leading_filters() if filters_only else self.split_row_wise()
+        )
+
+        transformed = (
+            self._run_steps(chunk, chunk_steps, verbose=False) for chunk in chunks
+        )
+        if not remaining_steps:
+            yield from transformed
+            return
+
+        if self._is_sort(remaining_steps):
+            yield from self._sort_chunks(transformed, len(chunk_steps))
+            return
+
+        reduced = pd.concat(list(transformed))
+        logger.info(
+            f"Steps {len(chunk_steps)}/{len(self.steps)} completed over all chunks. "
+            f"Data shape: {reduced.shape}"
+        )
+        yield self._run_steps(reduced, remaining_steps, start=len(chunk_steps))
+
+    @staticmethod
+    def _is_sort(steps: List[Dict[str, Any]]) -> bool:
+        return len(steps) == 1 and isinstance(
+            registry.get_transformation(steps[0]["transformation"]),
+            SortTransformation,
+        )
+
+    def _sort_chunks(
+        self, chunks: Iterable[pd.DataFrame], index: int
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run the sort at ``index`` over transformed chunks, spilling sorted runs
+        to disk when the data exceeds ``EXTERNAL_SORT_RUN_ROWS`` rows.
+        """
+        step = self.steps[index]
+        logger.info(f"Executing step {index + 1}/{len(self.steps)}: external sort")
+        columns, ascending = SortTransformation.sort_keys(step.get("params", {}))
+        yield from external_sort(chunks, columns, ascending, head=self.head)
+
+        logger.info(f"Step {index + 1} completed.")
+        if self.progress is not None:
+            self.progress(index + 1)
+
+    def split_row_wise(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split the steps into the leading row-wise steps and the rest.
+
+        Returns:
+            Tuple of (row-wise prefix, remaining steps)
+        """
+        return self._split_prefix(lambda t, params: t.is_row_wise(params))
+
+    def split_leading_filters(
+        self,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split the steps into the leading row filters and the rest.
+
+        Returns:
+            Tuple of (row filter prefix, remaining steps)
+        """
+        return self._split_prefix(lambda t, params: t.filters_rows(params))
+
+    def _split_prefix(self, predicate):
+        for i, step in enumerate(self.steps):
+            transformation = registry.get_transformation(step["transformation"])
+            if transformation is None or not predicate(
+                transformation, step.get("params", {})
+            ):
+                return self.steps[:i], self.steps[i:]
+        return list(self.steps), []
+
+    def projected_columns(self, available: List[str]) -> Optional[List[str]]:
+        """
+        Compute the source columns the pipeline references.
+
+        Column names are followed through renames so that a step referencing
+        a renamed column maps back to the column it was loaded as.
+
+        Args:
+            available: Columns of the input data, in order
+
+        Returns:
+            Referenced input columns in input order, or None if a step cannot
+            tell which columns it needs or nothing is referenced
+        """
+        if self.validate_pipeline():
+            return None
+
+        origins = {column: column for column in available}
+        referenced = set()
+
+        for step in self.steps:
+            transformation = registry.get_transformation(step["transformation"])
+            params = step.get("params", {})
+
+            columns = transformation.input_columns(params)
+            if columns is None:
+                return None
+            referenced.update(origins[c] for c in columns if c in origins)
+
+            renames = transformation.column_renames(params)
+            if renames:
+                origins = {
+                    renames.get(name, name): origin for name, origin in origins.items()
+                }
+
+        projected = [column for column in available if column in referenced]
+        return projected or None
+
+    def _ensure_valid(self):
         validation_errors = self.validate_pipeline()
         if validation_errors:
             raise ValueError(f"Pipeline validation failed: {validation_errors}")
 
-        result = data.copy()
-
-        for i, step in enumerate(self.steps):
+    def _run_steps(
+        self,
+        data: pd.DataFrame,
+        steps: List[Dict[str, Any]],
+        start: int = 0,
+        verbose: bool = True,
+        on_step: Optional[Callable[[int, pd.DataFrame], None]] = None,
+    ) -> pd.DataFrame:
+        result = data
+        log = logger.info if verbose else logger.debug
+
+        for i, step in enumerate(steps, start=start):
             try:
                 transformation_name = step["transformation"]
                 params = step.get("params", {})
 
                 transformation = registry.get_transformation(transformation_name)
 
-                logger.info(
+                log(
                     f"Executing step {i + 1}/{len(self.steps)}: "
                     f"{transformation_name}"
                 )
 
-                result = transformation.transform(result, params)
+                if transformation.modifies_input(params) and not copy_on_write():
+                    result = result.copy()
 
-                logger.info(f"Step {i + 1} completed. " f"Data shape: {result.shape}")
+                if self.head is not None and i == len(self.steps) - 1:
+                    result = transformation.transform_head(result, params, self.head)
+                else:
+                    result = transformation.transform(result, params)
+
+                log(f"Step {i + 1} completed. " f"Data shape: {result.shape}")
+
+                if on_step is not None:
+                    on_step(i, result)
+                if self.progress is not None:
+                    self.progress(i + 1)
 
             except Exception as e:
                 error_msg = (
-                    f"Error in step {i + 1} " f"({transformation_name}): {str(e)}"
+                    f"Error in {self.describe_step(i)} "
+                    f"({transformation_name}): {str(e)}"
                 )
                 logger.error(error_msg)
                 raise Exception(error_msg) from e
 
         return result
 
+    def optimize(self) -> "TransformationPipeline":
+        """
+        Rewrite the steps into an equivalent but cheaper plan.
+
+        Invalid pipelines are returned unchanged so that execution reports the
+        validation errors against the steps as they were written.
+
+        Returns:
+            New pipeline executing the optimized steps
+        """
+        if self.validate_pipeline():
+            return self
+
+        optimizer = PipelineOptimizer(self.steps)
+        steps, optimizations = optimizer.optimize()
+        optimized = TransformationPipeline(steps)
+        optimized.progress = self.progress
+        optimized.head = self.head
+        optimized.original_steps = self.steps
+        optimized.step_sources = optimizer.sources
+        optimized.optimizations = optimizations
+        return optimized
+
+    def describe_step(self, index: int) -> str:
+        """
+        Name a step in messages, by its number in the steps as written.
+
+        Steps of an optimized plan are named after the original steps they
+        were made from, followed by their number in the plan if it differs.
+        """
+        if self.step_sources is None:
+            return f"step {index + 1}"
+
+        sources = self.step_sources[index]
+        if len(sources) == 1:
+            description = f"step {sources[0]}"
+        else:
+            description = "steps " + ", ".join(str(source) for source in sources)
+        if sources != [index + 1]:
+            description += f" (optimized step {index + 1})"
+        return description
+
+    def copy(self) -> "TransformationPipeline":
+        """
+        Copy the pipeline, sharing its steps.
+
+        Settings of a single execution, such as ``head`` or ``progress``, are
+        set on a copy so that they don't leak into later executions of the
+        caller's pipeline.
+        """
+        return copy.copy(self)
+
     def get_pipeline_info(self) -> Dict[str, Any]:
+        if self.original_steps is None:
+            return {
+                "steps": self.steps,
+                "step_count": len(self.steps),
+                "validation_errors": self.validate_pipeline(),
+            }
+
         return {
-            "steps": self.steps,
-            "step_count": len(self.steps),
+            "steps": self.original_steps,
+            "step_count": len(self.original_steps),
             "validation_errors": self.validate_pipeline(),
+            "optimized_steps": self.steps,
+            "optimizations": self.optimizations,
         }
 
     def to_dict(self) -> Dict[str, Any]:
@@ -0,0 +1,75 @@
+import hashlib
+import json
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from app.configs.base import settings
+from app.utils.cache_util import MemoryBudgetLRUCache
+
+
+class PrefixCache:
+    """
+    Process-level cache of the intermediate results of pipelines.
+
+    The DataFrame produced after each step is stored under the identity of the
+    input data plus a hash of the steps that produced it, so pipelines sharing
+    their leading steps resume from the longest prefix already computed.
+    Entries are shared between executions, which is safe because steps never
+    modify the frame they are given (see ``BaseTransformation.modifies_input``).
+    """
+
+    def __init__(self, max_bytes: int):
+        self._cache = MemoryBudgetLRUCache(max_bytes)
+
+    @staticmethod
+    def keys(source: Hashable, steps: List[Dict[str, Any]]) -> List[Tuple]:
+        """
+        Build the cache key of every prefix of the steps.
+
+        Args:
+            source: Identity of the input data
+            steps: Pipeline steps
+
+        Returns:
+            List of keys, the key at index i identifies the result of step i
+        """
+        digest = hashlib.sha256()
+        keys = []
+        for step in steps:
+            digest.update(
+                json.dumps(
+                    [step["transformation"], step.get("params", {})],
+                    sort_keys=True,
+                    separators=(",", ":"),
+                    default=str,
+                ).encode()
+            )
+            keys.append((source, digest.copy().hexdigest()))
+        return keys
+
+    def lookup(self, keys: List[Tuple]) -> Tuple[int, Optional[pd.DataFrame], int]:
+        """
+        Find the longest prefix whose result is cached.
+
+        Returns:
+            Tuple of (number of cached steps, their result, its size in bytes)
+        """
+        for depth in range(len(keys), 0, -1):
+            entry = self._cache.get(keys[depth - 1])
+            if entry is not None:
+                return depth, entry[0], entry[1]
+        return 0, None, 0
+
+    def put(self, key: Tuple, data: pd.DataFrame) -> bool:
+        size = int(data.memory_usage(index=True, deep=True).sum())
+        return self._cache.put(key, (data, size), size)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+prefix_cache = PrefixCache(settings.PREFIX_CACHE_MAX_BYTES)
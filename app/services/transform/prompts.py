@@ -33,8 +33,12 @@ IMPORTANT VALIDATION RULES:
 Available transformations:
 1. filter: Filter rows based on column conditions
    - column: column name to filter on
-   - operator: one of ['eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'contains']
-   - value: value to compare against
+   - operator: one of ['eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'contains',
+     'in', 'not_in', 'contains_any']
+   - value: value to compare against, a list for 'in', 'not_in' and
+     'contains_any' (literal substrings)
+   - or, instead, a condition tree: "and"/"or" with a list of conditions,
+     "not" with a single condition, nested as needed
 
    Example:
    {
@@ -75,8 +79,9 @@ Available transformations:
    }
 
 4. sort: Sort rows based on column conditions
-   - column: column name to sort on
-   - ascending: boolean indicating ascending or descending order
+   - column: column name to sort on, or list of column names
+   - ascending: boolean indicating ascending or descending order, or list of
+     booleans with one per column
 
    Example:
    {
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import suppress
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from loguru import logger
+
+from app.configs.base import settings
+from app.services.file.storage import get_file_content_hash
+from app.services.transform.options import ExecutionOptions
+from app.utils.cache_util import MemoryBudgetLRUCache
+from app.utils.response_util import dumps
+
+RESULT_FILE_SUFFIX = ".json"
+
+
+class ResultCache:
+    """
+    Cache of pipeline execution results, addressed by content.
+
+    Entries are keyed by the hash of the file content plus a canonical hash of
+    the pipeline steps, execution options and registry configuration, so a
+    changed file or pipeline never matches a stale entry. Results are kept in
+    memory and, when a directory is configured, on disk as well so that they
+    survive restarts and are shared between worker processes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+        disk_max_bytes: int = 0,
+    ):
+        self.ttl = ttl
+        self.directory = directory or None
+        self.disk_max_bytes = disk_max_bytes
+        self._cache = MemoryBudgetLRUCache(max_bytes, ttl=ttl)
+
+    def key(
+        self,
+        filename: str,
+        steps: List[Dict[str, Any]],
+        options: ExecutionOptions,
+        registry_config: Dict[str, bool],
+    ) -> Tuple[str, str]:
+        """
+        Build the cache key of an execution.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        normalized_steps = [
+            {"transformation": step["transformation"], "params": step.get("params", {})}
+            for step in steps
+        ]
+        canonical = json.dumps(
+            {
+                "content": get_file_content_hash(filename),
+                "steps": normalized_steps,
+                "options": asdict(options),
+                "registry": registry_config,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return filename, hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        result = self._cache.get(key)
+        if result is not None or self.directory is None:
+            return result
+
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                _remove(path)
+                return None
+            with open(path, "rb") as file:
+                payload = file.read()
+        except FileNotFoundError:
+            return None
+
+        result = orjson.loads(payload)
+        self._cache.put(key, result, len(payload))
+        return result
+
+    def put(self, key: Tuple[str, str], result: Dict[str, Any], size: int) -> bool:
+        """
+        Store an execution result.
+
+        Args:
+            key: Cache key of the execution
+            result: Execution result
+            size: Size of the result data in memory, in bytes
+
+        Returns:
+            True if the result was stored in memory or on disk
+        """
+        stored = self._cache.put(key, result, size)
+        if self.directory is None:
+            return stored
+
+        # Only encoded for the disk tier, as the response would be
+        payload = dumps(result)
+        if len(payload) <= self.disk_max_bytes:
+            try:
+                self._write(key, payload)
+                stored = True
+            except OSError as e:
+                logger.error(f"Error writing cached result for {key[0]}: {e}")
+
+        return stored
+
+    def invalidate(self, filename: str) -> int:
+        """
+        Remove every result computed from a file.
+
+        Returns:
+            Number of removed entries
+        """
+        removed = self._cache.invalidate(lambda key: key[0] == filename)
+        for path in self._disk_entries():
+            if self._filename(path) == filename:
+                _remove(path)
+                removed += 1
+        return removed
+
+    def clear(self):
+        self._cache.clear()
+        for path in self._disk_entries():
+            _remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def _write(self, key: Tuple[str, str], payload: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(payload)
+        os.replace(temp_path, path)
+
+        # Evict the oldest results until the disk tier is within its budget
+        entries = []
+        for entry in self._disk_entries():
+            with suppress(FileNotFoundError):
+                stat = os.stat(entry)
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            total -= size
+            _remove(entry)
+
+    def _path(self, key: Tuple[str, str]) -> str:
+        filename, digest = key
+        return os.path.join(self.directory, f"{filename}.{digest}{RESULT_FILE_SUFFIX}")
+
+    def _disk_entries(self) -> List[str]:
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(RESULT_FILE_SUFFIX)
+        ]
+
+    @staticmethod
+    def _filename(path: str) -> str:
+        return os.path.basename(path)[: -len(RESULT_FILE_SUFFIX)].rsplit(".", 1)[0]
+
+
+def _remove(path: str):
+    # Another worker process may have removed the entry already
+    with suppress(FileNotFoundError):
+        os.remove(path)
+
+
+result_cache = ResultCache(
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    ttl=settings.RESULT_CACHE_TTL or None,
+    directory=settings.RESULT_CACHE_DIRECTORY,
+    disk_max_bytes=settings.RESULT_CACHE_DISK_MAX_BYTES,
+)
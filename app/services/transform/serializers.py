@@ -0,0 +1,259 @@
+import gzip
+import io
+import json
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from app.services.transform.batch import PipelineBatch
+from app.services.transform.stream import PipelineStream
+
+
+def _dumps(value: Dict[str, Any]) -> str:
+    return json.dumps(value, default=str)
+
+
+def _records(batch: pd.DataFrame, lines: bool = False) -> str:
+    return batch.to_json(
+        orient="records", lines=lines, date_format="iso", double_precision=15
+    )
+
+
+def _trailer(stream: PipelineStream) -> Dict[str, Any]:
+    return {
+        "original_shape": stream.original_shape,
+        "transformed_shape": stream.transformed_shape,
+        "execution_info": stream.execution_info,
+    }
+
+
+def _error(e: Exception) -> Dict[str, Any]:
+    logger.error(f"Error streaming transformation result: {e}")
+    return {
+        "error": {
+            "code": "PIPELINE_ERROR",
+            "message": "Pipeline execution failed",
+            "details": {"error": str(e)},
+        }
+    }
+
+
+class _ByteSink(io.RawIOBase):
+    """
+    Write-only file buffering what is written until it is drained.
+
+    Unlike a truncated ``BytesIO`` it keeps reporting the total number of bytes
+    written as its position, which the Parquet writer relies on.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_batches(stream: PipelineStream) -> Iterator[pa.Table]:
+    # The schema is fixed by the first table written. A column entirely missing
+    # from a batch doesn't tell its type (it is read as null or float), so
+    # batches are held back until every column has values in one of them
+    schema, types, pending, empty = None, {}, [], pd.DataFrame()
+    for batch in stream:
+        if batch.empty:
+            empty = batch
+            continue
+        if schema is not None:
+            yield _arrow_table(batch, schema)
+            continue
+
+        pending.append(batch)
+        table = pa.Table.from_pandas(batch, preserve_index=False)
+        for column, field in zip(table.columns, table.schema):
+            if column.null_count < len(column):
+                types.setdefault(field.name, field.type)
+        if len(types) < len(table.schema):
+            continue
+
+        schema = _arrow_schema(pending[0], types)
+        for batch in pending:
+            yield _arrow_table(batch, schema)
+        pending.clear()
+
+    if pending:
+        schema = _arrow_schema(pending[0], types)
+        for batch in pending:
+            yield _arrow_table(batch, schema)
+    elif schema is None:
+        yield pa.Table.from_pandas(empty, preserve_index=False)
+
+
+def _arrow_schema(batch: pd.DataFrame, types: Dict[str, pa.DataType]) -> pa.Schema:
+    schema = pa.Schema.from_pandas(batch, preserve_index=False)
+    return pa.schema(
+        [field.with_type(types.get(field.name, field.type)) for field in schema],
+        metadata=schema.metadata,
+    )
+
+
+def _arrow_table(batch: pd.DataFrame, schema: pa.Schema) -> pa.Table:
+    # Missing values held as objects convert to any type
+    missing = batch.columns[batch.isna().all().to_numpy()]
+    if len(missing):
+        batch = batch.astype({name: object for name in missing})
+    return pa.Table.from_pandas(batch, schema=schema, preserve_index=False)
+
+
+def ndjson_rows(stream: PipelineStream) -> Iterator[str]:
+    """
+    Serialize the rows of a pipeline stream as newline-delimited JSON.
+
+    Yields one string per non-empty batch, each row on its own line.
+    """
+    for batch in stream:
+        if len(batch):
+            yield _records(batch, lines=True)
+
+
+def ndjson_stream(stream: PipelineStream) -> Iterator[str]:
+    """
+    Serialize a pipeline stream as newline-delimited JSON.
+
+    The first line is a header object holding the pipeline info, every
+    following line is a row, and the last line is a trailer object holding
+    the shapes and the pipeline info added during execution (or the error
+    if execution failed midway).
+    """
+    yield _dumps({"pipeline_info": stream.pipeline_info}) + "\n"
+    try:
+        yield from ndjson_rows(stream)
+        yield _dumps(_trailer(stream)) + "\n"
+    except Exception as e:
+        yield _dumps(_error(e)) + "\n"
+
+
+def json_array_stream(stream: PipelineStream) -> Iterator[str]:
+    """
+    Serialize a pipeline stream as a single chunked JSON document.
+
+    The document has the same keys as ``TransformResponse``, the shapes are
+    written after the data array once they are known, along with the
+    pipeline info added during execution as ``execution_info``.
+    """
+    yield '{"pipeline_info": ' + _dumps(stream.pipeline_info) + ', "data": ['
+    separator = ""
+    try:
+        for batch in stream:
+            if len(batch):
+                yield separator + _records(batch)[1:-1]
+                separator = ","
+        yield "], " + _dumps(_trailer(stream))[1:]
+    except Exception as e:
+        yield "], " + _dumps(_error(e))[1:]
+
+
+def batch_ndjson_stream(batch: PipelineBatch) -> Iterator[str]:
+    """
+    Serialize the results of a pipeline batch as newline-delimited JSON.
+
+    Results are written as the pipelines complete. Each one starts with a
+    header object holding the pipeline name and info, followed by its rows and
+    a trailer object holding the name and the shapes. If execution fails the
+    last line is an error object.
+    """
+    try:
+        for name, result in batch:
+            header = {"pipeline": name, "pipeline_info": result["pipeline_info"]}
+            yield _dumps(header) + "\n"
+            if len(result["data"]):
+                yield _records(result["data"], lines=True)
+            yield _dumps(
+                {
+                    "pipeline": name,
+                    "original_shape": result["original_shape"],
+                    "transformed_shape": result["transformed_shape"],
+                }
+            ) + "\n"
+    except Exception as e:
+        yield _dumps(_error(e)) + "\n"
+
+
+def arrow_stream(stream: PipelineStream) -> Iterator[bytes]:
+    """
+    Serialize a pipeline stream in the Arrow IPC streaming format.
+
+    Each row batch of the stream is written as a record batch as soon as it is
+    produced. Execution errors abort the stream, leaving it incomplete.
+    """
+    sink, writer = _ByteSink(), None
+    try:
+        for table in _arrow_batches(stream):
+            writer = writer or pa.ipc.new_stream(sink, table.schema)
+            writer.write_table(table)
+            yield sink.drain()
+    except Exception as e:
+        logger.error(f"Error streaming transformation result: {e}")
+        raise
+    if writer is not None:
+        writer.close()
+    yield sink.drain()
+
+
+def parquet_stream(stream: PipelineStream) -> Iterator[bytes]:
+    """
+    Serialize a pipeline stream as a Parquet file.
+
+    Each row batch of the stream is written as a row group as soon as it is
+    produced, the footer follows the last one. Execution errors abort the
+    stream, leaving it incomplete.
+    """
+    sink, writer = _ByteSink(), None
+    try:
+        for table in _arrow_batches(stream):
+            writer = writer or pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table)
+            yield sink.drain()
+    except Exception as e:
+        logger.error(f"Error streaming transformation result: {e}")
+        raise
+    if writer is not None:
+        writer.close()
+    yield sink.drain()
+
+
+def csv_gzip_stream(stream: PipelineStream) -> Iterator[bytes]:
+    """
+    Serialize a pipeline stream as gzip compressed CSV.
+
+    Execution errors abort the stream, leaving it incomplete.
+    """
+    sink = _ByteSink()
+    with gzip.GzipFile(fileobj=sink, mode="wb") as file:
+        header = True
+        try:
+            for batch in stream:
+                if batch.empty and not header:
+                    continue
+                file.write(batch.to_csv(index=False, header=header).encode())
+                header = False
+                yield sink.drain()
+        except Exception as e:
+            logger.error(f"Error streaming transformation result: {e}")
+            raise
+    yield sink.drain()
@@ -0,0 +1,169 @@
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from app.configs.base import settings
+from app.services.file.cache import dataframe_cache
+from app.services.file.storage import get_file_content_hash, get_upload_file_path
+from app.services.transform.engines import get_engine
+from app.services.transform.loader import (
+    ShapeTracker,
+    iter_upload_chunks,
+    read_upload,
+    read_upload_columns,
+)
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+
+
+class PipelineStream:
+    """
+    Lazily executed pipeline whose result is produced in row batches.
+
+    The shapes are only known once the stream has been fully consumed. The
+    optional progress callback is called with the number of completed steps of
+    ``self.pipeline`` after each step.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        pipeline: TransformationPipeline,
+        options: ExecutionOptions,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.filename = filename
+        # Settings of this execution are kept off the caller's pipeline
+        self.pipeline = pipeline.optimize() if options.optimize else pipeline.copy()
+        if progress is not None:
+            self.pipeline.progress = progress
+        if options.limit is not None:
+            # Only the rows up to the end of the page are computed, see
+            # ``BaseTransformation.transform_head``
+            self.pipeline.head = options.offset + options.limit
+        self.options = options
+        self.engine = get_engine(options.engine or settings.EXECUTION_ENGINE)
+        self.pipeline_info = self.pipeline.get_pipeline_info()
+        self.pipeline_info["engine"] = self.engine.name
+        if options.limit is not None or options.offset:
+            self.pipeline_info["pagination"] = {
+                "offset": options.offset,
+                "limit": options.limit,
+            }
+        self.original_shape = None
+        self.transformed_shape = None
+        # Details added to the pipeline info during execution
+        self.execution_info: Dict[str, Any] = {}
+
+        self.available_columns: Optional[List[str]] = None
+        self.columns: Optional[List[str]] = None
+        if options.project_columns:
+            self.available_columns = read_upload_columns(filename)
+            self.columns = self.pipeline.projected_columns(self.available_columns)
+            self.pipeline_info["projected_columns"] = self.columns
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for result in self._results():
+            yield from self._split(result)
+
+    def collect(self) -> pd.DataFrame:
+        """
+        Execute the pipeline and return the whole result at once.
+
+        Returns:
+            Transformed DataFrame
+        """
+        results = list(self._results())
+        return results[0] if len(results) == 1 else pd.concat(results)
+
+    def _results(self) -> Iterator[pd.DataFrame]:
+        # Chunked execution is specific to the pandas engine, other engines
+        # stream internally
+        pandas_engine = self.engine.name == "pandas"
+        push_down_filters = pandas_engine and self._push_down_filters()
+        if pandas_engine and (self.options.streaming or push_down_filters):
+            tracker = ShapeTracker()
+            chunks = tracker.track(
+                iter_upload_chunks(
+                    self.filename,
+                    columns=self.columns,
+                    arrow_strings=self.options.arrow_strings,
+                )
+            )
+            results = self.pipeline.execute_chunks(
+                chunks, filters_only=not self.options.streaming
+            )
+        else:
+            data = read_upload(self.filename, self.columns, self.options.arrow_strings)
+            tracker = None
+            self.original_shape = data.shape
+            result, details = self.engine.execute(self.pipeline, data, self._source())
+            self._add_execution_info(details)
+            results = [result]
+
+        rows, columns = 0, 0
+        for result in self._paginate(results):
+            rows += len(result)
+            columns = len(result.columns)
+            yield result
+
+        if tracker:
+            self.original_shape = tracker.shape
+        if self.available_columns is not None:
+            self.original_shape = (self.original_shape[0], len(self.available_columns))
+        self.transformed_shape = (rows, columns)
+
+    def _paginate(self, results: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Keep the rows of the requested page, results are consumed fully."""
+        skip, remaining = self.options.offset, self.options.limit
+        for result in results:
+            if skip:
+                skipped = min(skip, len(result))
+                result, skip = result.iloc[skipped:], skip - skipped
+            if remaining is not None:
+                result = result.iloc[:remaining]
+                remaining -= len(result)
+            yield result
+
+    def _push_down_filters(self) -> bool:
+        """
+        Whether to evaluate the leading row filters during ingestion.
+
+        Only large files that are not cached yet are read that way, small files
+        are loaded whole so that they end up in the DataFrame cache.
+        """
+        leading_filters, _ = self.pipeline.split_leading_filters()
+        if not leading_filters or self.filename in dataframe_cache:
+            return False
+
+        file_size = os.path.getsize(get_upload_file_path(self.filename))
+        if file_size < settings.PREDICATE_PUSHDOWN_MIN_BYTES:
+            return False
+
+        self._add_execution_info({"pushed_down_steps": len(leading_filters)})
+        return True
+
+    def _add_execution_info(self, details: Dict[str, Any]):
+        self.execution_info.update(details)
+        self.pipeline_info.update(details)
+
+    def _source(self) -> tuple:
+        """Identity of the data read for the pipeline, for the prefix cache."""
+        columns = tuple(self.columns) if self.columns is not None else None
+        return (
+            get_file_content_hash(self.filename),
+            columns,
+            self.options.arrow_strings,
+        )
+
+    @staticmethod
+    def _split(data: pd.DataFrame) -> Iterator[pd.DataFrame]:
+        if data.empty:
+            # Keeps the columns of an empty result known to the serializers
+            yield data
+            return
+
+        batch_size = settings.STREAMING_CHUNK_ROWS
+        for start in range(0, len(data), batch_size):
+            yield data.iloc[start : start + batch_size]
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from loguru import logger
+
+from app.exception.errors import ExecutionTimeoutError, ExecutorBusyError
+
+
+class ExecutionPool:
+    """
+    Bounded pool running CPU-bound jobs off the event loop.
+
+    Jobs beyond ``size`` running plus ``queue_size`` waiting are rejected
+    instead of piling up, and a job taking longer than ``timeout`` seconds is
+    reported as timed out. A timed out job cannot be interrupted and keeps its
+    worker, and its place in the pool, until it finishes.
+    """
+
+    POOL_TYPES = ("thread", "process")
+
+    def __init__(self, pool_type: str, size: int, queue_size: int, timeout: float):
+        if pool_type not in self.POOL_TYPES:
+            raise ValueError(
+                f"Unsupported pool type '{pool_type}', use one of {self.POOL_TYPES}"
+            )
+        self.pool_type = pool_type
+        self.size = size
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor: Executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_process_pool(self) -> bool:
+        return self.pool_type == "process"
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run a function in the pool and wait for its result.
+
+        For process pools the function and its arguments are pickled, pass
+        file names and plain configuration rather than DataFrames.
+
+        Raises:
+            ExecutorBusyError: If the pool and its queue are full
+            ExecutionTimeoutError: If the job exceeds the configured timeout
+        """
+        self._acquire()
+        try:
+            job = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Released once the job is done, not when the caller stops waiting
+        job.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), self.timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Job {func.__name__} timed out after {self.timeout}s")
+            raise ExecutionTimeoutError(
+                message=f"Execution timed out after {self.timeout} seconds",
+                details={"timeout": self.timeout},
+            )
+
+    def hold(self, iterator: Iterable) -> Iterator:
+        """
+        Hold a place in the pool while an iterator is consumed.
+
+        Streamed responses are produced by the server as they are sent rather
+        than by the pool, they count against its size and queue all the same.
+        The place is released once the iterator is exhausted, fails, is closed
+        or is dropped, and iteration fails once it exceeds the timeout.
+
+        Raises:
+            ExecutorBusyError: If the pool and its queue are full
+        """
+        self._acquire()
+        return _HeldIterator(iterator, self._release, self.timeout)
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.size + self.queue_size:
+                raise ExecutorBusyError(
+                    message="Execution queue is full, try again later",
+                    details={"pending": self._pending},
+                )
+            self._pending += 1
+
+    def _release(self, job: Optional[Future]):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "type": self.pool_type,
+            "size": self.size,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.is_process_pool:
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="pipeline"
+                )
+        return self._executor
+
+
+class _HeldIterator:
+    """Iterator calling ``release`` once, when it is done with or dropped."""
+
+    def __init__(
+        self,
+        iterator: Iterable,
+        release: Callable[[Optional[Future]], None],
+        timeout: float,
+    ):
+        self._iterator = iter(iterator)
+        self._timeout = timeout
+        self._deadline = time.monotonic() + timeout
+        self._release = weakref.finalize(self, release, None)
+
+    def __iter__(self) -> "_HeldIterator":
+        return self
+
+    def __next__(self) -> Any:
+        if not self._release.alive:
+            raise StopIteration
+        if time.monotonic() > self._deadline:
+            self.close()
+            logger.error(f"Stream timed out after {self._timeout}s")
+            raise ExecutionTimeoutError(
+                message=f"Execution timed out after {self._timeout} seconds",
+                details={"timeout": self._timeout},
+            )
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
+        self._release()
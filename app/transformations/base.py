@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
+import polars as pl
 
 
 @dataclass
@@ -37,6 +38,153 @@ class BaseTransformation(ABC):
         """
         pass
 
+    def supports_lazy(self, params: Dict[str, Any]) -> bool:
+        """
+        Whether the transformation can be compiled into a lazy Polars query.
+
+        Transformations that don't support it are executed with pandas by the
+        Polars engine, on the data collected from the preceding steps.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            True if ``transform_lazy`` is implemented for these parameters
+        """
+        return False
+
+    def transform_lazy(
+        self, data: pl.LazyFrame, params: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        """
+        Add the transformation to a lazy Polars query.
+
+        Must produce the same result as ``transform``.
+
+        Args:
+            data: Lazy query producing the input data
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            Lazy query producing the transformed data
+        """
+        raise NotImplementedError(f"{self.name} cannot be executed lazily")
+
+    def transform_head(
+        self, data: pd.DataFrame, params: Dict[str, Any], n: int
+    ) -> pd.DataFrame:
+        """
+        Apply the transformation and return the first rows of the result.
+
+        Used when only the first rows of a pipeline result are requested.
+        Transformations that can produce them without computing the whole
+        result, e.g. a sort selecting the top rows, override it.
+
+        Args:
+            data: Input DataFrame to transform
+            params: Dictionary of parameters for the transformation
+            n: Number of rows to return
+
+        Returns:
+            The first ``n`` rows of the transformed DataFrame
+        """
+        return self.transform(data, params).head(n)
+
+    def is_row_wise(self, params: Dict[str, Any]) -> bool:
+        """
+        Whether the transformation only looks at one row at a time.
+
+        Row-wise steps can be applied chunk by chunk during streaming
+        execution, steps that need the whole dataset run once at the end.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            True if the transformation can be applied to independent chunks
+        """
+        return False
+
+    def filters_rows(self, params: Dict[str, Any]) -> bool:
+        """
+        Whether the transformation only drops rows, leaving columns and values
+        untouched.
+
+        Leading row filters are evaluated while the data is being read, so
+        rows that don't match are never kept in memory.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            True if the transformation is a row-wise predicate
+        """
+        return False
+
+    def reads_missing_values(self, params: Dict[str, Any]) -> bool:
+        """
+        Whether the result depends on how missing values of the input columns
+        are represented.
+
+        Polars has a single null for the ``pd.NA`` of nullable columns, e.g.
+        ``string[pyarrow]`` or ``Int64``, and the ``NaN`` of other columns, so
+        these steps run with pandas when they read nullable columns. Row
+        filters compare ``pd.NA`` as unknown.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            True if ``pd.NA`` and ``NaN`` give different results
+        """
+        return self.filters_rows(params)
+
+    def modifies_input(self, params: Dict[str, Any]) -> bool:
+        """
+        Whether the transformation may write into the DataFrame it is given.
+
+        Pipelines hand the same frame to each step without copying it, and
+        that frame may be shared with the caller or the DataFrame cache.
+        Transformations returning False promise to leave their input untouched
+        and to return a new frame, which may share unmodified columns with the
+        input. Transformations that may modify their input receive a private
+        copy unless pandas Copy-on-Write is enabled.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            True if the input DataFrame may be modified in place
+        """
+        return True
+
+    def input_columns(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Columns the transformation reads or writes, by their current names.
+
+        Used to load only the columns a pipeline needs. Returning None means
+        the columns cannot be determined and the whole dataset is needed.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            List of column names, or None if unknown
+        """
+        return None
+
+    def column_renames(self, params: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Columns renamed by the transformation, as an old->new mapping.
+
+        Args:
+            params: Dictionary of parameters for the transformation
+
+        Returns:
+            Mapping of old column names to new ones
+        """
+        return {}
+
     def get_info(self) -> Dict[str, str]:
         """Get information about this transformation."""
         return {
@@ -1,8 +1,32 @@
-from typing import Any, Dict
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from app.transformations.base import BaseTransformation
+from app.utils.aho_corasick import AhoCorasick
+from app.utils.pandas_util import ARROW_STRING_DTYPE, is_string_dtype
+
+# Comparisons evaluated with numpy on numeric columns
+NUMPY_COMPARISONS = {
+    "eq": "equal",
+    "ne": "not_equal",
+    "gt": "greater",
+    "lt": "less",
+    "gte": "greater_equal",
+    "lte": "less_equal",
+}
+
+# Operators comparing a column with a list of values
+LIST_OPERATORS = ("in", "not_in", "contains_any")
+
+# Logical operators combining a list of conditions
+LOGICAL_OPERATORS = {"and": np.logical_and, "or": np.logical_or}
 
 
 class FilterTransformation(BaseTransformation):
@@ -18,41 +42,367 @@ class FilterTransformation(BaseTransformation):
 
         Expected params:
         - column: column name to filter on
-        - operator: one of ['eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'contains']
+        - operator: one of ['eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'contains'],
+          or one of ['in', 'not_in', 'contains_any'] taking a list of values
         - value: value to compare against
+
+        or a tree of conditions, combined into a single mask:
+        - and: list of conditions that must all match
+        - or: list of conditions of which at least one must match
+        - not: condition that must not match
         """
+        return data[self._mask(data, params)]
+
+    def transform_lazy(
+        self, data: pl.LazyFrame, params: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        return data.filter(self._expression(data.schema, params))
+
+    def _expression(
+        self, schema: Dict[str, pl.DataType], params: Dict[str, Any]
+    ) -> pl.Expr:
+        if "and" in params:
+            return pl.all_horizontal(
+                [self._expression(schema, condition) for condition in params["and"]]
+            )
+        if "or" in params:
+            return pl.any_horizontal(
+                [self._expression(schema, condition) for condition in params["or"]]
+            )
+        if "not" in params:
+            return ~self._expression(schema, params["not"])
+
         column = params["column"]
         operator = params["operator"]
         value = params["value"]
 
-        if column not in data.columns:
+        if column not in schema:
             raise ValueError(f"Column '{column}' not found in data")
+        if operator in ("contains", "contains_any") and schema[column] != pl.Utf8:
+            # pandas matches the text of other values, e.g. 'True' for booleans
+            # where Polars casts them to 'true'
+            raise NotImplementedError(
+                f"Cannot match substrings of column '{column}' lazily"
+            )
+        if operator in NUMPY_COMPARISONS or operator in ("in", "not_in"):
+            values = value if operator in ("in", "not_in") else [value]
+            if not all(_is_comparable(schema[column], item) for item in values):
+                # pandas compares values of other types as not equal, where
+                # Polars fails
+                raise NotImplementedError(
+                    f"Cannot compare column '{column}' with {value!r} lazily"
+                )
+
+        expression = pl.col(column)
+        if operator == "eq":
+            condition = expression == value
+        elif operator == "ne":
+            condition = expression != value
+        elif operator == "gt":
+            condition = expression > value
+        elif operator == "lt":
+            condition = expression < value
+        elif operator == "gte":
+            condition = expression >= value
+        elif operator == "lte":
+            condition = expression <= value
+        elif operator == "contains":
+            # Missing values are matched as the string 'nan', like with pandas
+            condition = expression.fill_null("nan").str.contains(str(value))
+        elif operator == "in":
+            condition = expression.is_in(value)
+        elif operator == "not_in":
+            condition = ~expression.is_in(value)
+        elif operator == "contains_any":
+            if not value:
+                return pl.lit(False)
+            text = expression.fill_null("nan")
+            condition = pl.any_horizontal(
+                [text.str.contains(pattern, literal=True) for pattern in value]
+            )
+        else:
+            raise ValueError(f"Unsupported operator: {operator}")
+
+        # Missing values of numpy and object columns don't match, except for
+        # 'ne' and 'not_in', and negating the condition matches them, like
+        # with pandas
+        return condition.fill_null(operator in ("ne", "not_in"))
+
+    def _mask(self, data: pd.DataFrame, params: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate a condition tree into a single boolean mask.
+
+        The tree is compiled once per parameters and column types. Comparisons
+        of numeric columns run on their numpy arrays, other conditions are
+        evaluated with pandas, and the masks are combined in place, so the
+        rows are only selected once whatever the size of the tree.
+        """
+        columns = self.input_columns(params)
+        for column in columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in data")
+
+        numeric = tuple(
+            column for column in columns if _is_numpy_numeric(data[column].dtype)
+        )
+        plan = _compile_condition(
+            json.dumps(params, sort_keys=True, default=str), numeric
+        )
+        mask, _ = self._evaluate(data, plan)
+        return mask
+
+    def _evaluate(
+        self, data: pd.DataFrame, plan: Tuple
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Returns:
+            Tuple of (rows known to match, rows whose match is unknown or None
+            if there are none). Conditions on missing values of nullable
+            columns are unknown, and combined like pandas and Polars do, so
+            negating them doesn't match the rows either.
+        """
+        kind = plan[0]
+        if kind in LOGICAL_OPERATORS:
+            # Every node returns masks of its own, so they are updated in place
+            mask, unknown = self._evaluate(data, plan[1][0])
+            for node in plan[1][1:]:
+                other, other_unknown = self._evaluate(data, node)
+                if kind == "and":
+                    unknown = _and_unknown(mask, unknown, other, other_unknown)
+                    mask &= other
+                else:
+                    mask |= other
+                    unknown = _or_unknown(mask, unknown, other_unknown)
+            return mask, unknown
+        if kind == "not":
+            mask, unknown = self._evaluate(data, plan[1])
+            np.logical_not(mask, out=mask)
+            if unknown is not None:
+                mask &= ~unknown
+            return mask, unknown
+        if kind == "compare":
+            _, column, comparison, value = plan
+            return getattr(np, comparison)(data[column].to_numpy(), value), None
+
+        result = self._condition_mask(data, plan[1])
+        unknown = None
+        if result.hasnans:
+            unknown = result.isna().to_numpy()
+        return result.to_numpy(dtype=bool, na_value=False), unknown
+
+    @staticmethod
+    def _condition_mask(data: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
+        column = params["column"]
+        operator = params["operator"]
+        value = params["value"]
+
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            # Evaluated once per category, missing values being an extra one,
+            # then spread to the rows through their codes
+            values = data[column]
+            uniques = pd.DataFrame({column: _categories_with_missing(values)})
+            mask = FilterTransformation._condition_mask(uniques, params)
+            matched = mask.to_numpy(dtype=bool, na_value=False)
+            return pd.Series(matched[values.cat.codes.to_numpy()], index=data.index)
 
         if operator == "eq":
-            return data[data[column] == value]
+            return data[column] == value
         elif operator == "ne":
-            return data[data[column] != value]
+            return data[column] != value
         elif operator == "gt":
-            return data[data[column] > value]
+            return data[column] > value
         elif operator == "lt":
-            return data[data[column] < value]
+            return data[column] < value
         elif operator == "gte":
-            return data[data[column] >= value]
+            return data[column] >= value
         elif operator == "lte":
-            return data[data[column] <= value]
+            return data[column] <= value
         elif operator == "contains":
-            return data[data[column].astype(str).str.contains(str(value), na=False)]
+            values = data[column]
+            if is_string_dtype(values.dtype):
+                # Arrow's substring kernel on string[pyarrow], missing values
+                # don't match
+                return values.str.contains(str(value), na=False)
+            return values.astype(str).str.contains(str(value), na=False)
+        elif operator == "in":
+            return data[column].isin(value)
+        elif operator == "not_in":
+            return ~data[column].isin(value)
+        elif operator == "contains_any":
+            return _contains_any(data[column], value)
         else:
             raise ValueError(f"Unsupported operator: {operator}")
 
     def validate_params(self, params: Dict[str, Any]) -> bool:
+        for operator in LOGICAL_OPERATORS:
+            if operator in params:
+                conditions = params[operator]
+                return (
+                    isinstance(conditions, list)
+                    and len(conditions) > 0
+                    and all(
+                        isinstance(condition, dict) and self.validate_params(condition)
+                        for condition in conditions
+                    )
+                )
+        if "not" in params:
+            condition = params["not"]
+            return isinstance(condition, dict) and self.validate_params(condition)
+
         required_keys = ["column", "operator", "value"]
         valid_operators = ["eq", "ne", "gt", "lt", "gte", "lte", "contains"]
 
-        return (
-            all(key in params for key in required_keys)
-            and params["operator"] in valid_operators
-        )
+        if not all(key in params for key in required_keys):
+            return False
+        if params["operator"] in LIST_OPERATORS:
+            value = params["value"]
+            if params["operator"] == "contains_any":
+                return isinstance(value, list) and all(
+                    isinstance(pattern, str) for pattern in value
+                )
+            return isinstance(value, list)
+        return params["operator"] in valid_operators
+
+    def is_row_wise(self, params: Dict[str, Any]) -> bool:
+        return True
+
+    def filters_rows(self, params: Dict[str, Any]) -> bool:
+        return True
+
+    def supports_lazy(self, params: Dict[str, Any]) -> bool:
+        return True
+
+    def modifies_input(self, params: Dict[str, Any]) -> bool:
+        return False
+
+    def input_columns(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        conditions = _subconditions(params)
+        if conditions is None:
+            return [params["column"]]
+
+        columns = []
+        for condition in conditions:
+            columns.extend(self.input_columns(condition))
+        return list(dict.fromkeys(columns))
+
+
+def _subconditions(params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Conditions combined by a logical node, None for a single condition."""
+    for operator in LOGICAL_OPERATORS:
+        if operator in params:
+            return params[operator]
+    if "not" in params:
+        return [params["not"]]
+    return None
+
+
+def _is_comparable(dtype: pl.DataType, value: Any) -> bool:
+    """Whether Polars compares a column of the dtype with the value like pandas."""
+    if isinstance(value, bool):
+        return dtype == pl.Boolean
+    if isinstance(value, (int, float)):
+        return dtype in pl.NUMERIC_DTYPES
+    if isinstance(value, str):
+        return dtype == pl.Utf8
+    return False
+
+
+def _and_unknown(
+    mask: np.ndarray,
+    unknown: Optional[np.ndarray],
+    other: np.ndarray,
+    other_unknown: Optional[np.ndarray],
+) -> Optional[np.ndarray]:
+    # Unknown on one side, unless the other side is known not to match
+    if unknown is None and other_unknown is None:
+        return None
+    if unknown is None:
+        return other_unknown & mask
+    if other_unknown is None:
+        return unknown & other
+    return (unknown & (other | other_unknown)) | (other_unknown & (mask | unknown))
+
+
+def _or_unknown(
+    mask: np.ndarray,
+    unknown: Optional[np.ndarray],
+    other_unknown: Optional[np.ndarray],
+) -> Optional[np.ndarray]:
+    # Unknown on either side, unless the combined condition is known to match
+    if unknown is None and other_unknown is None:
+        return None
+    if unknown is None:
+        return other_unknown & ~mask
+    if other_unknown is None:
+        return unknown & ~mask
+    return (unknown | other_unknown) & ~mask
+
+
+def _contains_any(values: pd.Series, patterns: List[str]) -> pd.Series:
+    """
+    Match the values containing any of the literal patterns.
+
+    Each distinct value is scanned once by an automaton built for the
+    patterns, so the cost depends on the distinct values rather than on the
+    rows or the number of patterns.
+    """
+    if not is_string_dtype(values.dtype):
+        values = values.astype(str)
+    # Missing values of string columns get the code -1 and never match
+    codes, uniques = pd.factorize(values)
+    matcher = _substring_matcher(tuple(patterns))
+    matched = np.fromiter(
+        (matcher.search(value) for value in uniques), dtype=bool, count=len(uniques)
+    )
+    return pd.Series(np.append(matched, False)[codes], index=values.index)
+
+
+@lru_cache(maxsize=64)
+def _substring_matcher(patterns: Tuple[str, ...]) -> AhoCorasick:
+    return AhoCorasick(patterns)
+
+
+def _is_numpy_numeric(dtype: Any) -> bool:
+    # Extension dtypes hold missing values as a mask that numpy ignores
+    return isinstance(dtype, np.dtype) and dtype.kind in "iuf"
+
+
+@lru_cache(maxsize=256)
+def _compile_condition(params_json: str, numeric_columns: Tuple[str, ...]) -> Tuple:
+    """
+    Compile a condition tree into an evaluation plan.
+
+    Args:
+        params_json: Filter parameters, as canonical JSON
+        numeric_columns: Columns holding numpy numbers
+
+    Returns:
+        Nested tuples: ``(operator, nodes)`` for ``and``/``or``,
+        ``("not", node)``, ``("compare", column, ufunc name, value)`` for a
+        numeric comparison and ``("mask", condition)`` for a condition
+        evaluated by pandas
+    """
+
+    def compile_node(params: Dict[str, Any]) -> Tuple:
+        for operator in LOGICAL_OPERATORS:
+            if operator in params:
+                return operator, tuple(compile_node(node) for node in params[operator])
+        if "not" in params:
+            return "not", compile_node(params["not"])
+
+        value = params["value"]
+        if (
+            params["column"] in numeric_columns
+            and params["operator"] in NUMPY_COMPARISONS
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and abs(value) < 2**63
+        ):
+            comparison = NUMPY_COMPARISONS[params["operator"]]
+            return "compare", params["column"], comparison, value
+        return "mask", params
+
+    return compile_node(json.loads(params_json))
 
 
 class MapColumnTransformation(BaseTransformation):
@@ -72,17 +422,18 @@ class MapColumnTransformation(BaseTransformation):
         - mapping: dictionary of old->new mappings
         - column: (for value_map) column to apply value mapping to
         """
-        result = data.copy()
+        # Only the mapped column is replaced, the others are shared with the input
+        result = data.copy(deep=False)
         map_type = params["type"]
         mapping = params["mapping"]
 
         if map_type == "rename":
-            result = result.rename(columns=mapping)
+            result = result.rename(columns=mapping, copy=False)
         elif map_type == "value_map":
             column = params["column"]
             if column not in result.columns:
                 raise ValueError(f"Column '{column}' not found in data")
-            result[column] = result[column].map(mapping).fillna(result[column])
+            result[column] = _map_values(result[column], mapping)
         else:
             raise ValueError(f"Unsupported map type: {map_type}")
 
@@ -101,6 +452,135 @@ class MapColumnTransformation(BaseTransformation):
 
         return isinstance(params["mapping"], dict)
 
+    def transform_lazy(
+        self, data: pl.LazyFrame, params: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        mapping = params["mapping"]
+
+        if params["type"] == "rename":
+            # Like pandas, names missing from the data are ignored
+            columns = data.columns
+            return data.rename(
+                {old: new for old, new in mapping.items() if old in columns}
+            )
+
+        column = params["column"]
+        schema = data.schema
+        if column not in schema:
+            raise ValueError(f"Column '{column}' not found in data")
+        if schema[column] != pl.Utf8:
+            # Mapping keys are strings, which pandas leaves unmatched in other
+            # columns where Polars fails to convert them
+            raise NotImplementedError(f"Cannot map values of column '{column}' lazily")
+        return data.with_columns(pl.col(column).replace(mapping))
+
+    def is_row_wise(self, params: Dict[str, Any]) -> bool:
+        return True
+
+    def supports_lazy(self, params: Dict[str, Any]) -> bool:
+        if params["type"] == "rename":
+            return True
+
+        # pandas changes the dtype of the column when values are mapped to
+        # another type, only string to string mappings keep the same result
+        return all(
+            isinstance(old, str) and isinstance(new, str)
+            for old, new in params["mapping"].items()
+        )
+
+    def modifies_input(self, params: Dict[str, Any]) -> bool:
+        return False
+
+    def input_columns(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        if params["type"] == "rename":
+            return list(params["mapping"])
+        return [params["column"]]
+
+    def column_renames(self, params: Dict[str, Any]) -> Dict[str, str]:
+        if params["type"] == "rename":
+            return dict(params["mapping"])
+        return {}
+
+
+def _map_values(values: pd.Series, mapping: Dict[Any, Any]) -> pd.Series:
+    """
+    Replace the mapped values of a column, other values are kept.
+
+    The mapping is applied to the distinct values of the column rather than
+    to every row: categorical columns only have their categories mapped, and
+    other columns are factorized, each distinct value is looked up once and
+    the rows take the mapped value of their code. The cost of a lookup doesn't
+    depend on the size of the mapping.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return _map_categories(values, mapping)
+
+    if values.dtype == ARROW_STRING_DTYPE and all(
+        isinstance(old, str) and isinstance(new, str) for old, new in mapping.items()
+    ):
+        array = pa.array(values.array)
+        # Position of each value in the mapping, null when it isn't mapped
+        positions = pc.index_in(array, value_set=pa.array(list(mapping), array.type))
+        mapped = pc.take(pa.array(list(mapping.values()), array.type), positions)
+        result = pc.if_else(pc.is_null(positions), array, mapped)
+        return pd.Series(
+            pd.arrays.ArrowStringArray(result), index=values.index, name=values.name
+        )
+
+    # Missing values get a code of their own, they are kept unless mapped
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    if not any(value in mapping for value in uniques):
+        return values
+
+    mapped = pd.Series([_lookup(mapping, value) for value in uniques])
+    return pd.Series(mapped.array.take(codes), index=values.index, name=values.name)
+
+
+def _map_categories(values: pd.Series, mapping: Dict[Any, Any]) -> pd.Series:
+    return _transform_categories(
+        values, lambda uniques: uniques.map(lambda value: _lookup(mapping, value))
+    )
+
+
+def _categories_with_missing(values: pd.Series) -> pd.Series:
+    """
+    Categories of a categorical column followed by a missing value, so that
+    the codes of the column, where -1 is missing, index into them.
+    """
+    categories = values.cat.categories
+    return pd.Series(categories).reindex(range(len(categories) + 1))
+
+
+def _transform_categories(
+    values: pd.Series, transform: Callable[[pd.Series], pd.Series]
+) -> pd.Series:
+    """
+    Apply an elementwise transformation to the categories of a categorical
+    column instead of its rows.
+
+    Categories transformed into the same value are merged. Unordered results
+    keep their categories sorted, so that sorting by the column still sorts
+    by value.
+    """
+    transformed = transform(_categories_with_missing(values))
+    try:
+        positions, categories = pd.factorize(transformed, sort=not values.cat.ordered)
+    except TypeError:
+        # Values of different types can't be sorted
+        positions, categories = pd.factorize(transformed)
+    result = pd.Categorical.from_codes(
+        positions[values.cat.codes.to_numpy()],
+        categories=categories,
+        ordered=values.cat.ordered,
+    )
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def _lookup(mapping: Dict[Any, Any], value: Any) -> Any:
+    # Values mapped to a missing value are kept, like ``map().fillna()``
+    new = mapping.get(value)
+    return value if new is None or new != new else new
+
 
 class UppercaseTransformation(BaseTransformation):
 
@@ -116,20 +596,24 @@ class UppercaseTransformation(BaseTransformation):
         Expected params:
         - columns: list of column names to convert (or 'all' for all string columns)
         """
-        result = data.copy()
+        # Only the converted columns are replaced, the others are shared with
+        # the input
+        result = data.copy(deep=False)
         columns = params.get("columns", "all")
 
         if columns == "all":
             # Apply to all string/object columns
-            string_columns = result.select_dtypes(include=["object"]).columns
+            string_columns = result.select_dtypes(
+                include=["object", "string", "category"]
+            ).columns
             for col in string_columns:
-                result[col] = result[col].astype(str).str.upper()
+                result[col] = _uppercase(result[col])
         else:
             # Apply to specified columns
             for col in columns:
                 if col not in result.columns:
                     raise ValueError(f"Column '{col}' not found in data")
-                result[col] = result[col].astype(str).str.upper()
+                result[col] = _uppercase(result[col])
 
         return result
 
@@ -140,6 +624,56 @@ class UppercaseTransformation(BaseTransformation):
         columns = params["columns"]
         return columns == "all" or isinstance(columns, list)
 
+    def is_row_wise(self, params: Dict[str, Any]) -> bool:
+        # 'all' depends on the dtypes inferred for each chunk, so it is only
+        # row-wise when the columns are listed explicitly
+        return params.get("columns", "all") != "all"
+
+    def transform_lazy(
+        self, data: pl.LazyFrame, params: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        columns = params.get("columns", "all")
+
+        if columns == "all":
+            selection = pl.col(pl.Utf8)
+        else:
+            missing = [col for col in columns if col not in data.columns]
+            if missing:
+                raise ValueError(f"Column '{missing[0]}' not found in data")
+            selection = pl.col(columns)
+
+        # pandas converts missing values to the string 'nan' before converting,
+        # except in nullable columns, see ``reads_missing_values``
+        return data.with_columns(
+            selection.cast(pl.Utf8).str.to_uppercase().fill_null("NAN")
+        )
+
+    def supports_lazy(self, params: Dict[str, Any]) -> bool:
+        return True
+
+    def reads_missing_values(self, params: Dict[str, Any]) -> bool:
+        # Missing values of string[pyarrow] columns stay missing, other
+        # nullable columns give '<NA>'
+        return True
+
+    def modifies_input(self, params: Dict[str, Any]) -> bool:
+        return False
+
+    def input_columns(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        # 'all' touches every string column, which all survive to the output
+        columns = params.get("columns", "all")
+        return None if columns == "all" else list(columns)
+
+
+def _uppercase(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return _transform_categories(values, lambda uniques: _uppercase(uniques))
+    if is_string_dtype(values.dtype):
+        # Arrow's utf8_upper kernel on string[pyarrow], missing values stay
+        # missing
+        return values.str.upper()
+    return values.astype(str).str.upper()
+
 
 class SortTransformation(BaseTransformation):
 
@@ -153,16 +687,107 @@ class SortTransformation(BaseTransformation):
         Sort rows based on conditions.
 
         Expected params:
-        - column: column name to sort on
-        - ascending: boolean indicating ascending or descending order
+        - column: column name to sort on, or list of column names
+        - ascending: boolean indicating ascending or descending order, or list
+          of booleans, one per column
         """
-        column = params["column"]
+        columns, ascending = self.sort_keys(params)
+
+        # A stable sort keeps ties in their incoming order, which makes the
+        # result independent of how earlier steps are ordered
+        return data.sort_values(by=columns, ascending=ascending, kind="stable")
+
+    def transform_head(
+        self, data: pd.DataFrame, params: Dict[str, Any], n: int
+    ) -> pd.DataFrame:
+        """
+        Select the first rows of the sorted data without sorting all of it.
+
+        Numeric columns use a partial selection, keeping ties in their
+        incoming order like the stable sort. Missing values sort last. Other
+        columns and multi-column keys are fully sorted.
+        """
+        columns, ascending = self.sort_keys(params)
+        if len(columns) > 1:
+            return super().transform_head(data, params, n)
+
+        column, ascending = columns[0], ascending[0]
+        values = data[column]
+        if (
+            n >= len(data)
+            or not pd.api.types.is_numeric_dtype(values)
+            or pd.api.types.is_bool_dtype(values)
+        ):
+            return super().transform_head(data, params, n)
+
+        # Select by position, the index of the data may have duplicates
+        keys = values.reset_index(drop=True)
+        top = (keys.nsmallest if ascending else keys.nlargest)(n, keep="first")
+        result = data.take(np.sort(top.index.to_numpy())).sort_values(
+            by=column, ascending=ascending, kind="stable"
+        )
+
+        missing = n - len(result)
+        if missing > 0 and values.hasnans:
+            nans = np.flatnonzero(values.isna().to_numpy())[:missing]
+            result = pd.concat([result, data.take(nans)])
+        return result
+
+    def transform_lazy(
+        self, data: pl.LazyFrame, params: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        columns, ascending = self.sort_keys(params)
+        if all(ascending):
+            return data.sort(columns, nulls_last=True, maintain_order=True)
+
+        # Polars reverses the order of missing values sorted in descending
+        # order, ties are broken by row number to keep them in incoming order
+        row = "__row"
+        while row in data.columns:
+            row = f"_{row}"
+        return (
+            data.with_row_count(row)
+            .sort(
+                [*columns, row],
+                descending=[not value for value in ascending] + [False],
+                nulls_last=True,
+            )
+            .drop(row)
+        )
+
+    @staticmethod
+    def sort_keys(params: Dict[str, Any]) -> Tuple[List[str], List[bool]]:
+        """
+        Returns:
+            Tuple of (sort columns, sort direction of each column)
+        """
+        columns = params["column"]
+        if not isinstance(columns, list):
+            columns = [columns]
         ascending = params["ascending"]
+        if not isinstance(ascending, list):
+            ascending = [ascending] * len(columns)
+        return columns, ascending
+
+    def supports_lazy(self, params: Dict[str, Any]) -> bool:
+        return True
 
-        return data.sort_values(by=column, ascending=ascending)
+    def modifies_input(self, params: Dict[str, Any]) -> bool:
+        return False
 
     def validate_params(self, params: Dict[str, Any]) -> bool:
-        if "column" not in params:
+        if "column" not in params or "ascending" not in params:
             return False
 
-        return isinstance(params["ascending"], bool)
+        column, ascending = params["column"], params["ascending"]
+        if isinstance(column, list):
+            if not column or not all(isinstance(name, str) for name in column):
+                return False
+            if isinstance(ascending, list):
+                return len(ascending) == len(column) and all(
+                    isinstance(value, bool) for value in ascending
+                )
+        return isinstance(ascending, bool)
+
+    def input_columns(self, params: Dict[str, Any]) -> Optional[List[str]]:
+        return self.sort_keys(params)[0]
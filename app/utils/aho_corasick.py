@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class AhoCorasick:
+    """
+    Automaton matching many literal substrings in a single scan of a text.
+
+    The patterns are stored in a trie whose nodes are linked to the node of
+    their longest proper suffix that is also in the trie, so a text is read
+    once, one character at a time, whatever the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._match: List[bool] = [False]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                goto = self._goto[state]
+                if char not in goto:
+                    goto[char] = self._add_state()
+                state = goto[char]
+            self._match[state] = True
+
+        self._link()
+
+    def _add_state(self) -> int:
+        self._goto.append({})
+        self._fail.append(0)
+        self._match.append(False)
+        return len(self._goto) - 1
+
+    def _link(self):
+        # Breadth first, so the suffix of a node is linked before the node
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._match[child] = (
+                    self._match[child] or self._match[self._fail[child]]
+                )
+                queue.append(child)
+
+    def search(self, text: str) -> bool:
+        """Whether any of the patterns occurs in the text."""
+        goto, fail, match = self._goto, self._fail, self._match
+        if match[0]:
+            return True
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if match[state]:
+                return True
+        return False
@@ -0,0 +1,52 @@
+import pandas as pd
+
+
+def set_copy_on_write(enabled: bool):
+    """
+    Enable or disable pandas Copy-on-Write for the current process.
+
+    With Copy-on-Write, frames derived from one another share their buffers
+    until one of them is written to, so in-place writes never leak into
+    other frames.
+    """
+    pd.set_option("mode.copy_on_write", bool(enabled))
+
+
+def copy_on_write() -> bool:
+    """Whether pandas Copy-on-Write is enabled in the current process."""
+    return bool(pd.get_option("mode.copy_on_write"))
+
+
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+def is_string_dtype(dtype) -> bool:
+    """Whether a dtype is a pandas string dtype, e.g. ``string[pyarrow]``."""
+    return isinstance(dtype, pd.StringDtype)
+
+
+def is_nullable_dtype(dtype) -> bool:
+    """
+    Whether the missing values of a dtype are ``pd.NA``, e.g. ``Int64``.
+
+    Comparisons with them are unknown rather than false.
+    """
+    return getattr(dtype, "na_value", None) is pd.NA
+
+
+def to_arrow_strings(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the string columns of a DataFrame to ``string[pyarrow]``.
+
+    Object columns holding only strings and missing values are converted,
+    their missing values become ``pd.NA``. Columns mixing other types are
+    left as they are.
+    """
+    columns = [
+        column
+        for column in data.select_dtypes(include=["object"]).columns
+        if pd.api.types.infer_dtype(data[column], skipna=True) == "string"
+    ]
+    if not columns:
+        return data
+    return data.astype({column: ARROW_STRING_DTYPE for column in columns})
@@ -0,0 +1,39 @@
+from typing import Any
+
+import orjson
+import pandas as pd
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON response encoded with orjson.
+
+    Returning a response from an endpoint skips the validation and encoding of
+    its content against the response model, which for transformation results
+    means every row, so the content must already have the shape of the model.
+    NaN, NaT and missing values are encoded as null, numpy scalars and
+    timestamps natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as ``FastJSONResponse`` does."""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def _default(value: Any) -> Any:
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
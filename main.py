@@ -11,6 +11,8 @@ from app.api import router
 from app.configs import settings
 from app.middlewares.error import ErrorHandlerMiddleware
 from app.middlewares.security import SecurityMiddleware
+from app.services.jobs import job_manager
+from app.services.transform import pipeline_executor
 
 
 def init_services():
@@ -56,6 +58,9 @@ def get_application():
         return await call_next(request)
 
     _app.add_exception_handler(HTTPException, invalid_path_exception_handler)
+    _app.add_event_handler("startup", job_manager.recover)
+    _app.add_event_handler("shutdown", pipeline_executor.shutdown)
+    _app.add_event_handler("shutdown", job_manager.shutdown)
 
     return _app
 
@@ -0,0 +1,46 @@
+import time
+
+from app.utils.cache_util import MemoryBudgetLRUCache
+
+
+class TestMemoryBudgetLRUCache:
+    def setup_method(self):
+        self.cache = MemoryBudgetLRUCache(max_bytes=100)
+
+    def test_evicts_least_recently_used_entries(self):
+        self.cache.put("a", 1, 40)
+        self.cache.put("b", 2, 40)
+        assert self.cache.get("a") == 1
+
+        self.cache.put("c", 3, 40)
+
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == 1
+        assert self.cache.get("c") == 3
+        stats = self.cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] == 80
+        assert (stats["hits"], stats["misses"]) == (3, 1)
+
+    def test_rejects_entries_bigger_than_budget(self):
+        assert not self.cache.put("big", 1, 101)
+        assert self.cache.stats()["entries"] == 0
+
+    def test_invalidate_by_predicate(self):
+        self.cache.put(("x.csv", 1), 1, 10)
+        self.cache.put(("x.csv", 2), 2, 10)
+        self.cache.put(("y.csv", 1), 3, 10)
+
+        assert self.cache.invalidate(lambda key: key[0] == "x.csv") == 2
+        assert self.cache.stats()["bytes"] == 10
+
+    def test_entries_expire_after_ttl(self):
+        cache = MemoryBudgetLRUCache(max_bytes=100, ttl=0.01)
+        cache.put("a", 1, 10)
+        assert cache.get("a") == 1
+
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
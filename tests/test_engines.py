@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import registry
+from app.services.transform.engines import get_engine
+from app.services.transform.pipeline import TransformationPipeline
+from app.transformations.base import BaseTransformation
+
+DATA = pd.DataFrame(
+    {
+        "name": ["alice", "bob", np.nan, "diana", "eve"],
+        "age": [25, 30, 35, 28, 41],
+        "score": [1.5, np.nan, 3.0, 2.5, 0.5],
+        "status": ["active", "inactive", "active", "active", "inactive"],
+    }
+)
+
+PIPELINES = [
+    [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gte", "value": 28},
+        },
+        {"transformation": "sort", "params": {"column": "score", "ascending": False}},
+    ],
+    [
+        {
+            "transformation": "filter",
+            "params": {
+                "and": [
+                    {"column": "status", "operator": "eq", "value": "active"},
+                    {"column": "name", "operator": "contains", "value": "a"},
+                ]
+            },
+        },
+        {"transformation": "uppercase", "params": {"columns": "all"}},
+    ],
+    [
+        {
+            "transformation": "filter",
+            "params": {
+                "or": [
+                    {"column": "score", "operator": "lt", "value": 2},
+                    {"not": {"column": "status", "operator": "eq", "value": "active"}},
+                ]
+            },
+        },
+    ],
+    [
+        {
+            "transformation": "filter",
+            "params": {
+                "and": [
+                    {"column": "age", "operator": "not_in", "value": [30, 41]},
+                    {
+                        "column": "name",
+                        "operator": "contains_any",
+                        "value": ["li", "n"],
+                    },
+                ]
+            },
+        },
+        {
+            "transformation": "filter",
+            "params": {"column": "status", "operator": "in", "value": ["active"]},
+        },
+    ],
+    [
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"name": "first_name"}},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["first_name", "age"]}},
+        {
+            "transformation": "sort",
+            "params": {"column": "first_name", "ascending": True},
+        },
+    ],
+    [
+        {
+            "transformation": "map_column",
+            "params": {
+                "type": "value_map",
+                "column": "status",
+                "mapping": {"active": "on", "inactive": "off"},
+            },
+        },
+        {
+            "transformation": "map_column",
+            "params": {"type": "value_map", "column": "age", "mapping": {30: 31}},
+        },
+    ],
+    [
+        {
+            "transformation": "sort",
+            "params": {"column": ["status", "score"], "ascending": [False, True]},
+        },
+    ],
+]
+
+
+class _Negate(BaseTransformation):
+    def __init__(self):
+        super().__init__(name="negate")
+
+    def transform(self, data, params):
+        data = data.copy()
+        data[params["column"]] = -data[params["column"]]
+        return data
+
+    def validate_params(self, params):
+        return "column" in params
+
+
+@pytest.mark.parametrize("steps", PIPELINES)
+def test_polars_engine_matches_pandas_engine(steps):
+    pipeline = TransformationPipeline(steps)
+
+    expected, _ = get_engine("pandas").execute(pipeline, DATA)
+    result, _ = get_engine("polars").execute(pipeline, DATA)
+
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True),
+        expected.reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+MISSING_DATA = pd.DataFrame(
+    {
+        "name": ["alice", "bob", np.nan, None, "eve"],
+        "age": [25, 30, 35, 28, 41],
+        "score": [1.5, np.nan, 3.0, None, 0.5],
+    }
+)
+
+MISSING_CONDITIONS = [
+    {"column": "score", "operator": "ne", "value": 1.5},
+    {"column": "name", "operator": "ne", "value": "bob"},
+    {"not": {"column": "score", "operator": "gt", "value": 2}},
+    {"not": {"column": "name", "operator": "eq", "value": "bob"}},
+    {"column": "name", "operator": "not_in", "value": ["bob"]},
+    {"not": {"column": "name", "operator": "in", "value": ["bob"]}},
+    {"column": "name", "operator": "contains", "value": "i"},
+    {
+        "or": [
+            {"column": "score", "operator": "lt", "value": 2},
+            {"not": {"column": "name", "operator": "gte", "value": "c"}},
+        ]
+    },
+    {"column": "age", "operator": "eq", "value": "30"},
+    {"column": "age", "operator": "ne", "value": "30"},
+    {"column": "name", "operator": "eq", "value": 1},
+    {"column": "score", "operator": "in", "value": ["1.5"]},
+]
+
+
+@pytest.mark.parametrize("name_dtype", [None, "string[pyarrow]", "category"])
+@pytest.mark.parametrize("condition", MISSING_CONDITIONS)
+def test_polars_filters_match_pandas_on_missing_values(condition, name_dtype):
+    data = MISSING_DATA
+    if name_dtype is not None:
+        data = data.astype({"name": name_dtype})
+    pipeline = TransformationPipeline(
+        [{"transformation": "filter", "params": condition}]
+    )
+
+    expected, _ = get_engine("pandas").execute(pipeline, data)
+    result, _ = get_engine("polars").execute(pipeline, data)
+
+    assert result["age"].tolist() == expected["age"].tolist()
+
+
+@pytest.mark.parametrize("columns", [["name"], "all"])
+def test_polars_uppercase_keeps_missing_arrow_strings(columns):
+    data = MISSING_DATA.astype({"name": "string[pyarrow]"})
+    pipeline = TransformationPipeline(
+        [{"transformation": "uppercase", "params": {"columns": columns}}]
+    )
+
+    expected, _ = get_engine("pandas").execute(pipeline, data)
+    result, details = get_engine("polars").execute(pipeline, data)
+
+    assert details == {"pandas_steps": [1]}
+    assert result["name"].isna().sum() == 2
+    pd.testing.assert_series_equal(result["name"], expected["name"])
+
+
+@pytest.mark.parametrize(
+    "column, ascending",
+    [("name", False), ("score", False), (["score", "name"], [False, True])],
+)
+def test_polars_sorts_keep_missing_values_in_incoming_order(column, ascending):
+    pipeline = TransformationPipeline(
+        [
+            {
+                "transformation": "sort",
+                "params": {"column": column, "ascending": ascending},
+            }
+        ]
+    )
+
+    expected, _ = get_engine("pandas").execute(pipeline, MISSING_DATA)
+    result, _ = get_engine("polars").execute(pipeline, MISSING_DATA)
+
+    assert result["age"].tolist() == expected["age"].tolist()
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"column": "flag", "operator": "contains", "value": "True"},
+        {"column": "flag", "operator": "contains_any", "value": ["Fa"]},
+        {"column": "age", "operator": "contains", "value": "3"},
+    ],
+)
+def test_polars_substring_filters_of_other_columns_match_pandas(condition):
+    data = MISSING_DATA.assign(flag=[True, False, True, True, False])
+    pipeline = TransformationPipeline(
+        [{"transformation": "filter", "params": condition}]
+    )
+
+    expected, _ = get_engine("pandas").execute(pipeline, data)
+    result, details = get_engine("polars").execute(pipeline, data)
+
+    assert details == {"pandas_steps": [1]}
+    assert len(expected)
+    assert result["age"].tolist() == expected["age"].tolist()
+
+
+@pytest.mark.parametrize("column, values", [("age", [25, 30]), ("flag", [True, False])])
+def test_polars_value_maps_of_other_columns_run_with_pandas(column, values):
+    data = pd.DataFrame({column: values})
+    pipeline = TransformationPipeline(
+        [
+            {
+                "transformation": "map_column",
+                "params": {
+                    "type": "value_map",
+                    "column": column,
+                    "mapping": {str(values[0]): "mapped"},
+                },
+            }
+        ]
+    )
+
+    expected, _ = get_engine("pandas").execute(pipeline, data)
+    result, details = get_engine("polars").execute(pipeline, data)
+
+    assert details == {"pandas_steps": [1]}
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_polars_engine_runs_pandas_only_steps_with_pandas():
+    registry.register(_Negate())
+    try:
+        pipeline = TransformationPipeline(
+            [
+                {
+                    "transformation": "sort",
+                    "params": {"column": "age", "ascending": True},
+                },
+                {"transformation": "negate", "params": {"column": "age"}},
+                {
+                    "transformation": "filter",
+                    "params": {"column": "age", "operator": "lt", "value": -29},
+                },
+            ]
+        )
+        result, details = get_engine("polars").execute(pipeline, DATA)
+    finally:
+        registry.unregister("negate")
+
+    assert details == {"pandas_steps": [2]}
+    assert result["age"].tolist() == [-30, -35, -41]
+    assert DATA["age"].tolist() == [25, 30, 35, 28, 41]
+
+
+def test_polars_engine_keeps_arrow_strings():
+    data = DATA.astype({"name": "string[pyarrow]", "status": "string[pyarrow]"})
+    pipeline = TransformationPipeline(
+        [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+    )
+
+    result, _ = get_engine("polars").execute(pipeline, data)
+
+    assert result["name"].dtype == "string[pyarrow]"
+    assert result["name"].isna().sum() == 1
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        get_engine("spark")
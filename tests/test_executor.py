@@ -0,0 +1,995 @@
+import asyncio
+import hashlib
+import importlib
+import io
+import json
+import os
+import time
+import warnings
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.configs.base import settings
+from app.enums.transform import FileResultMode
+from app.exception.errors import (
+    ExecutionTimeoutError,
+    ExecutorBusyError,
+    FileError,
+    PipelineError,
+)
+from app.services import registry
+from app.services.file.cache import dataframe_cache
+from app.services.file.columnar import (
+    get_columnar_sidecar_path,
+    iter_columnar_sidecar,
+    read_columnar_sidecar,
+    write_columnar_sidecar,
+)
+from app.services.file.schema import (
+    get_schema,
+    read_csv_typed,
+    read_schema_sidecar,
+    write_schema_sidecar,
+)
+from app.services.file.storage import (
+    delete_file,
+    get_file_content_hash,
+    open_memory_mapped,
+)
+from app.services.transform import pipeline_executor, prefix_cache
+from app.services.transform.executor import (
+    PipelineExecutor,
+    resolve_files,
+    run_sized_pipeline_job,
+)
+from app.services.transform.loader import iter_upload_chunks
+from app.services.transform.options import ExecutionOptions
+from app.services.transform.pipeline import TransformationPipeline
+from app.services.transform.result_cache import ResultCache
+from app.services.transform.serializers import (
+    arrow_stream,
+    batch_ndjson_stream,
+    csv_gzip_stream,
+    json_array_stream,
+    ndjson_stream,
+    parquet_stream,
+)
+from app.services.transform.stream import PipelineStream
+from app.services.transform.worker_pool import ExecutionPool
+
+
+@pytest.fixture
+def uploaded_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(settings, "STREAMING_CHUNK_ROWS", 2)
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+    dataframe_cache.clear()
+    prefix_cache.clear()
+    pd.DataFrame(
+        {
+            "name": ["alice", "bob", "charlie", "diana", "eve"],
+            "age": [25, 30, 35, 28, 41],
+            "city": ["paris", "london", "paris", "tokyo", "paris"],
+        }
+    ).to_csv(tmp_path / "people.csv", index=False)
+    return "people.csv"
+
+
+def _execute(filename, steps, executor=pipeline_executor, **options):
+    pipeline = TransformationPipeline(steps)
+    return asyncio.run(
+        executor.execute_pipeline(filename, pipeline, ExecutionOptions(**options))
+    )
+
+
+def test_streaming_matches_in_memory_execution(uploaded_file):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "paris"},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["name"]}},
+        {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+    ]
+
+    in_memory = _execute(uploaded_file, steps)
+    streamed = _execute(uploaded_file, steps, streaming=True)
+
+    assert streamed["original_shape"] == in_memory["original_shape"] == (5, 3)
+    assert streamed["transformed_shape"] == in_memory["transformed_shape"]
+    assert streamed["data"] == in_memory["data"]
+    assert [row["name"] for row in streamed["data"]] == ["EVE", "CHARLIE", "ALICE"]
+
+
+@pytest.mark.parametrize("optimize", [False, True])
+def test_streams_keep_settings_off_the_callers_pipeline(uploaded_file, optimize):
+    pipeline = TransformationPipeline(
+        [
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+        ]
+    )
+    completed = []
+
+    stream = PipelineStream(
+        uploaded_file,
+        pipeline,
+        ExecutionOptions(limit=2, optimize=optimize),
+        progress=completed.append,
+    )
+    stream.collect()
+
+    assert completed[-1] == 2
+    assert pipeline.progress is None
+    assert pipeline.head is None
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_streamed_responses_match_json_response(uploaded_file, streaming):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gte", "value": 28},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["city"]}},
+    ]
+    expected = _execute(uploaded_file, steps)
+    pipeline = TransformationPipeline(steps)
+    options = ExecutionOptions(streaming=streaming)
+
+    lines = "".join(
+        ndjson_stream(
+            PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+        )
+    ).splitlines()
+    header, rows, trailer = lines[0], lines[1:-1], lines[-1]
+    assert json.loads(header)["pipeline_info"]["step_count"] == 2
+    assert [json.loads(row) for row in rows] == expected["data"]
+    trailer = json.loads(trailer)
+    # The in-memory execution resumes from the steps cached by the first one
+    assert ("prefix_cache" in trailer.pop("execution_info")) is not streaming
+    assert trailer == {
+        "original_shape": [5, 3],
+        "transformed_shape": list(expected["transformed_shape"]),
+    }
+
+    document = json.loads(
+        "".join(
+            json_array_stream(
+                PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+            )
+        )
+    )
+    assert document["data"] == expected["data"]
+    assert document["original_shape"] == [5, 3]
+
+
+def test_streamed_responses_report_execution_details(uploaded_file):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "ne", "value": "30"},
+        }
+    ]
+    expected = _execute(uploaded_file, steps, engine="polars")
+    assert expected["pipeline_info"]["pandas_steps"] == [1]
+    pipeline = TransformationPipeline(steps)
+    options = ExecutionOptions(engine="polars")
+
+    lines = "".join(
+        ndjson_stream(
+            PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+        )
+    ).splitlines()
+    assert json.loads(lines[-1])["execution_info"] == {"pandas_steps": [1]}
+
+    document = json.loads(
+        "".join(
+            json_array_stream(
+                PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+            )
+        )
+    )
+    assert document["execution_info"] == {"pandas_steps": [1]}
+
+
+DOWNLOAD_READERS = [
+    (arrow_stream, lambda payload: pa.ipc.open_stream(payload).read_pandas()),
+    (parquet_stream, lambda payload: pd.read_parquet(io.BytesIO(payload))),
+    (
+        csv_gzip_stream,
+        lambda payload: pd.read_csv(io.BytesIO(payload), compression="gzip"),
+    ),
+]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("serializer, read", DOWNLOAD_READERS)
+def test_download_formats_match_json_response(
+    uploaded_file, streaming, serializer, read
+):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gte", "value": 28},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["city"]}},
+    ]
+    expected = _execute(uploaded_file, steps)
+    pipeline = TransformationPipeline(steps)
+    options = ExecutionOptions(streaming=streaming)
+
+    result = read(
+        b"".join(
+            serializer(
+                PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+            )
+        )
+    )
+
+    assert result.to_dict(orient="records") == expected["data"]
+
+
+@pytest.mark.parametrize("serializer, read", DOWNLOAD_READERS)
+def test_download_formats_keep_columns_of_empty_result(uploaded_file, serializer, read):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gt", "value": 99},
+        }
+    ]
+    pipeline = TransformationPipeline(steps)
+    options = ExecutionOptions(streaming=True)
+
+    result = read(
+        b"".join(
+            serializer(
+                PipelineExecutor.stream_pipeline(uploaded_file, pipeline, options)
+            )
+        )
+    )
+
+    assert list(result.columns) == ["name", "age", "city"]
+    assert result.empty
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("serializer, read", DOWNLOAD_READERS[:2])
+def test_download_formats_type_columns_missing_from_first_batch(
+    uploaded_file, tmp_path, streaming, serializer, read
+):
+    (tmp_path / "gaps.csv").write_text(
+        "name,age,status\nalice,25,\nbob,30,\ncarol,35,\ndan,28,active\n"
+    )
+    pipeline = TransformationPipeline(
+        [{"transformation": "uppercase", "params": {"columns": ["name"]}}]
+    )
+    options = ExecutionOptions(streaming=streaming)
+
+    result = read(
+        b"".join(
+            serializer(PipelineExecutor.stream_pipeline("gaps.csv", pipeline, options))
+        )
+    )
+
+    assert result["status"].tolist() == [None, None, None, "active"]
+
+
+@pytest.mark.parametrize("sidecar", [False, True])
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gt", "value": 30},
+            }
+        ],
+        [{"transformation": "uppercase", "params": {"columns": "all"}}],
+        [{"transformation": "sort", "params": {"column": "age", "ascending": True}}],
+    ],
+)
+def test_streaming_header_only_upload(uploaded_file, tmp_path, steps, sidecar):
+    (tmp_path / "empty.csv").write_text("name,age,city\n")
+    if sidecar:
+        write_columnar_sidecar("empty.csv")
+    assert [chunk.shape for chunk in iter_upload_chunks("empty.csv")] == [(0, 3)]
+
+    result = _execute("empty.csv", steps, streaming=True)
+
+    assert result["data"] == []
+    assert result["original_shape"] == (0, 3)
+    assert result["transformed_shape"] == (0, 3)
+
+
+def test_columnar_sidecar_matches_csv(uploaded_file, tmp_path):
+    (tmp_path / "gaps.csv").write_text("name,score,city\nalice,1.5,\n,,paris\n")
+    expected = pd.read_csv(tmp_path / "gaps.csv")
+
+    write_columnar_sidecar("gaps.csv")
+
+    assert get_columnar_sidecar_path("gaps.csv") is not None
+    pd.testing.assert_frame_equal(read_columnar_sidecar("gaps.csv"), expected)
+    chunks = list(iter_columnar_sidecar("gaps.csv", chunk_size=1))
+    assert len(chunks) == 2
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+@pytest.mark.parametrize("sidecar", [False, True])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_arrow_strings_keep_missing_values(
+    uploaded_file, tmp_path, streaming, sidecar, engine
+):
+    (tmp_path / "gaps.csv").write_text(
+        "name,age,status\nalice,25,active\n,30,inactive\ncarol,35,\ndan,28,active\n"
+    )
+    if sidecar:
+        write_columnar_sidecar("gaps.csv")
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {
+                "or": [
+                    {"column": "name", "operator": "contains", "value": "a"},
+                    {"column": "age", "operator": "eq", "value": 30},
+                ]
+            },
+        },
+        {"transformation": "uppercase", "params": {"columns": "all"}},
+        {
+            "transformation": "map_column",
+            "params": {
+                "type": "value_map",
+                "column": "status",
+                "mapping": {"ACTIVE": "on", "INACTIVE": "off"},
+            },
+        },
+    ]
+
+    options = {"streaming": streaming, "engine": engine}
+    result = _execute("gaps.csv", steps, arrow_strings=True, **options)
+    default = _execute("gaps.csv", steps, **options)
+
+    assert result["data"] == [
+        {"name": "ALICE", "age": 25, "status": "on"},
+        {"name": None, "age": 30, "status": "off"},
+        {"name": "CAROL", "age": 35, "status": None},
+        {"name": "DAN", "age": 28, "status": "on"},
+    ]
+    # Object columns hold missing values as NaN, uppercased to 'NAN'
+    assert [row["name"] for row in default["data"]] == ["ALICE", "NAN", "CAROL", "DAN"]
+
+
+def test_stale_columnar_sidecar_is_ignored(uploaded_file, tmp_path):
+    write_columnar_sidecar(uploaded_file)
+    sidecar_path = get_columnar_sidecar_path(uploaded_file)
+    os.utime(sidecar_path, (0, 0))
+
+    assert get_columnar_sidecar_path(uploaded_file) is None
+
+
+def test_delete_file_removes_columnar_sidecar(uploaded_file, tmp_path):
+    write_schema_sidecar(uploaded_file)
+    write_columnar_sidecar(uploaded_file)
+    sidecar_path = get_columnar_sidecar_path(uploaded_file)
+
+    asyncio.run(delete_file(uploaded_file))
+
+    assert not os.path.exists(sidecar_path)
+    assert not os.path.exists(tmp_path / f"{uploaded_file}.schema.json")
+    assert not os.path.exists(tmp_path / uploaded_file)
+
+
+def test_schema_sidecar_describes_upload(uploaded_file, monkeypatch):
+    monkeypatch.setattr(settings, "SCHEMA_CATEGORY_MAX_RATIO", 0.6)
+    schema = write_schema_sidecar(uploaded_file)
+
+    assert read_schema_sidecar(uploaded_file) == get_schema(uploaded_file) == schema
+    assert schema == {
+        "rows": 5,
+        "columns": [
+            {"name": "name", "dtype": "object", "nullable": False, "categories": None},
+            {"name": "age", "dtype": "int64", "nullable": False, "categories": None},
+            {
+                "name": "city",
+                "dtype": "object",
+                "nullable": False,
+                "categories": ["london", "paris", "tokyo"],
+            },
+        ],
+    }
+    assert read_csv_typed(uploaded_file)["city"].dtype == "category"
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_schema_typed_reads_match_inferred_dtypes(
+    uploaded_file, monkeypatch, engine, streaming, columnar
+):
+    monkeypatch.setattr(settings, "SCHEMA_CATEGORY_MAX_RATIO", 0.6)
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "lt", "value": "q"},
+        },
+        {
+            "transformation": "map_column",
+            "params": {
+                "type": "value_map",
+                "column": "city",
+                "mapping": {"london": "uk", "paris": "fr"},
+            },
+        },
+        {"transformation": "uppercase", "params": {"columns": "all"}},
+        {
+            "transformation": "sort",
+            "params": {"column": ["city", "age"], "ascending": [True, False]},
+        },
+    ]
+    options = {"engine": engine, "streaming": streaming}
+    expected = _execute(uploaded_file, steps, **options)
+
+    assert write_schema_sidecar(uploaded_file)["columns"][2]["categories"]
+    if columnar:
+        write_columnar_sidecar(uploaded_file)
+    dataframe_cache.clear()
+    prefix_cache.clear()
+
+    assert _execute(uploaded_file, steps, **options) == expected
+
+
+def test_schema_not_matching_upload_falls_back_to_inferred_dtypes(
+    uploaded_file, tmp_path
+):
+    schema = write_schema_sidecar(uploaded_file)
+    schema["columns"][0]["dtype"] = "int64"
+    (tmp_path / f"{uploaded_file}.schema.json").write_text(json.dumps(schema))
+
+    data = read_csv_typed(uploaded_file)
+
+    assert data["name"].tolist()[:2] == ["alice", "bob"]
+
+
+def test_repeated_execution_is_served_from_dataframe_cache(uploaded_file):
+    steps = [{"transformation": "uppercase", "params": {"columns": ["name"]}}]
+    hits = dataframe_cache.stats()["hits"]
+
+    first = _execute(uploaded_file, steps)
+    second = _execute(uploaded_file, steps)
+
+    assert second["data"] == first["data"]
+    assert dataframe_cache.stats()["hits"] == hits + 1
+    assert dataframe_cache.stats()["entries"] == 1
+
+    asyncio.run(delete_file(uploaded_file))
+    assert dataframe_cache.stats()["entries"] == 0
+
+
+def test_process_pool_applies_parent_registry_configuration(uploaded_file):
+    executor = PipelineExecutor(
+        ExecutionPool(pool_type="process", size=1, queue_size=0, timeout=60)
+    )
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+    try:
+        result = _execute(uploaded_file, steps, executor=executor)
+        assert [row["age"] for row in result["data"]] == [25, 28, 30, 35, 41]
+
+        registry.disable("sort")
+        with pytest.raises(PipelineError):
+            _execute(uploaded_file, steps, executor=executor)
+    finally:
+        registry.enable("sort")
+        executor.shutdown()
+
+
+def test_execution_pool_rejects_and_times_out_jobs():
+    pool = ExecutionPool(pool_type="thread", size=1, queue_size=0, timeout=0.05)
+
+    async def scenario():
+        slow = asyncio.ensure_future(pool.run(time.sleep, 0.2))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorBusyError):
+            await pool.run(time.sleep, 0)
+        with pytest.raises(ExecutionTimeoutError):
+            await slow
+
+        # The timed out job holds its slot until it actually finishes
+        with pytest.raises(ExecutorBusyError):
+            await pool.run(time.sleep, 0)
+        await asyncio.sleep(0.3)
+        await pool.run(time.sleep, 0)
+        assert pool.stats()["pending"] == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_execution_pool_holds_places_for_streams():
+    pool = ExecutionPool(pool_type="thread", size=1, queue_size=1, timeout=0.05)
+
+    first = pool.hold(iter([1, 2]))
+    dropped = pool.hold(iter([1]))
+    with pytest.raises(ExecutorBusyError):
+        pool.hold(iter([]))
+
+    assert list(first) == [1, 2]
+    del dropped
+    assert pool.stats()["pending"] == 0
+
+    slow = pool.hold(iter([1, 2]))
+    assert next(slow) == 1
+    time.sleep(0.1)
+    with pytest.raises(ExecutionTimeoutError):
+        next(slow)
+    assert pool.stats()["pending"] == 0
+
+
+def test_open_memory_mapped_is_consumed_by_the_csv_parser(uploaded_file, tmp_path):
+    with open_memory_mapped(uploaded_file) as buffer:
+        data = pd.read_csv(buffer)
+    pd.testing.assert_frame_equal(data, pd.read_csv(tmp_path / uploaded_file))
+
+    (tmp_path / "empty.csv").write_bytes(b"")
+    with open_memory_mapped("empty.csv") as buffer:
+        assert buffer.read() == b""
+
+    with pytest.raises(FileNotFoundError):
+        with open_memory_mapped("missing.csv"):
+            pass
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_project_columns_loads_only_referenced_columns(uploaded_file, streaming):
+    steps = [
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"name": "full_name"}},
+        },
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "lt", "value": 30},
+        },
+    ]
+
+    result = _execute(uploaded_file, steps, streaming=streaming, project_columns=True)
+
+    assert result["original_shape"] == (5, 3)
+    assert result["pipeline_info"]["projected_columns"] == ["name", "age"]
+    assert result["data"] == [
+        {"full_name": "alice", "age": 25},
+        {"full_name": "diana", "age": 28},
+    ]
+
+
+def test_leading_filters_are_pushed_into_ingestion(uploaded_file, monkeypatch):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "paris"},
+        },
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gt", "value": 30},
+        },
+        {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+    ]
+    expected = _execute(uploaded_file, steps, optimize=False)
+    assert "pushed_down_steps" not in expected["pipeline_info"]
+
+    dataframe_cache.clear()
+    monkeypatch.setattr(settings, "PREDICATE_PUSHDOWN_MIN_BYTES", 0)
+    result = _execute(uploaded_file, steps, optimize=False)
+
+    assert result["pipeline_info"]["pushed_down_steps"] == 2
+    assert result["original_shape"] == expected["original_shape"]
+    assert result["data"] == expected["data"]
+    assert uploaded_file not in dataframe_cache
+
+
+def test_repeated_execution_is_served_from_result_cache(
+    uploaded_file, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+    cache = ResultCache(
+        max_bytes=1024 * 1024,
+        directory=str(tmp_path / "results"),
+        disk_max_bytes=1024 * 1024,
+    )
+    executor = PipelineExecutor(pool=pipeline_executor.pool, cache=cache)
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+
+    first = _execute(uploaded_file, steps, executor=executor)
+    second = _execute(uploaded_file, steps, executor=executor)
+
+    assert "cached" not in first["pipeline_info"]
+    assert second["pipeline_info"]["cached"] is True
+    assert second["data"] == first["data"]
+    assert cache.stats()["hits"] == 1
+
+    # The disk tier serves results once the memory tier is gone
+    cache._cache.clear()
+    assert _execute(uploaded_file, steps, executor=executor)["data"] == first["data"]
+
+    # Other options or file content are different entries
+    _execute(uploaded_file, steps, executor=executor, optimize=False)
+    assert cache.stats()["hits"] == 1
+    pd.DataFrame({"age": [1]}).to_csv(tmp_path / uploaded_file, index=False)
+    assert _execute(uploaded_file, steps, executor=executor)["data"] == [{"age": 1}]
+
+    # Deleting the file removes its results
+    cache_module = importlib.import_module("app.services.transform.result_cache")
+    monkeypatch.setattr(cache_module, "result_cache", cache)
+    asyncio.run(delete_file(uploaded_file))
+    assert cache.stats()["entries"] == 0
+    assert not os.listdir(tmp_path / "results")
+
+
+def test_result_cache_is_budgeted_by_result_data_size(uploaded_file, monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+    cache = ResultCache(max_bytes=1024 * 1024)
+    executor = PipelineExecutor(pool=pipeline_executor.pool, cache=cache)
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+
+    result = _execute(uploaded_file, steps, executor=executor)
+
+    expected, size = run_sized_pipeline_job(uploaded_file, steps, ExecutionOptions())
+    assert result["data"] == expected["data"]
+    assert cache.stats()["bytes"] == size > 0
+
+
+def test_file_content_hash_reads_file_in_blocks(uploaded_file, tmp_path):
+    content = (tmp_path / uploaded_file).read_bytes() * 50000
+    (tmp_path / uploaded_file).write_bytes(content)
+
+    assert len(content) > 1 << 20
+    assert get_file_content_hash(uploaded_file) == hashlib.blake2b(content).hexdigest()
+
+
+def test_pipelines_sharing_leading_steps_resume_from_prefix_cache(uploaded_file):
+    shared = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "paris"},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["name"]}},
+    ]
+    first = _execute(
+        uploaded_file,
+        shared
+        + [{"transformation": "sort", "params": {"column": "age", "ascending": False}}],
+    )
+    second = _execute(
+        uploaded_file,
+        shared
+        + [{"transformation": "sort", "params": {"column": "name", "ascending": True}}],
+    )
+
+    assert first["pipeline_info"]["prefix_cache"]["hit_depth"] == 0
+    assert second["pipeline_info"]["prefix_cache"]["hit_depth"] == 2
+    assert second["pipeline_info"]["prefix_cache"]["bytes_saved"] > 0
+    assert [row["name"] for row in second["data"]] == ["ALICE", "CHARLIE", "EVE"]
+
+
+def test_polars_engine_can_be_chosen_per_request(uploaded_file):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "paris"},
+        },
+        {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+    ]
+    expected = _execute(uploaded_file, steps)
+    result = _execute(uploaded_file, steps, engine="polars")
+
+    assert expected["pipeline_info"]["engine"] == "pandas"
+    assert result["pipeline_info"]["engine"] == "polars"
+    assert result["data"] == expected["data"]
+    assert result["original_shape"] == expected["original_shape"]
+    assert result["transformed_shape"] == expected["transformed_shape"]
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_batch_matches_individual_executions(uploaded_file, engine):
+    paris = {
+        "transformation": "filter",
+        "params": {"column": "city", "operator": "eq", "value": "paris"},
+    }
+    pipelines = {
+        "by_age": [
+            paris,
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+        ],
+        "by_name": [
+            paris,
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {
+                "transformation": "sort",
+                "params": {"column": "name", "ascending": False},
+            },
+        ],
+        "paris": [paris],
+        "everyone": [],
+    }
+
+    results = asyncio.run(
+        pipeline_executor.execute_batch(
+            uploaded_file,
+            {name: TransformationPipeline(steps) for name, steps in pipelines.items()},
+            ExecutionOptions(engine=engine),
+        )
+    )
+
+    assert list(results) == list(pipelines)
+    for name, steps in pipelines.items():
+        expected = _execute(uploaded_file, steps, engine=engine)
+        assert results[name]["data"] == expected["data"]
+        assert results[name]["original_shape"] == expected["original_shape"]
+        assert results[name]["transformed_shape"] == expected["transformed_shape"]
+    if engine == "pandas":
+        assert results["by_name"]["pipeline_info"]["shared_steps"] == 1
+        assert results["everyone"]["pipeline_info"]["shared_steps"] == 0
+
+
+def test_batch_ndjson_stream_groups_rows_by_pipeline(uploaded_file):
+    pipelines = {
+        "young": TransformationPipeline(
+            [
+                {
+                    "transformation": "filter",
+                    "params": {"column": "age", "operator": "lt", "value": 30},
+                }
+            ]
+        ),
+        "old": TransformationPipeline(
+            [
+                {
+                    "transformation": "filter",
+                    "params": {"column": "age", "operator": "gte", "value": 30},
+                }
+            ]
+        ),
+    }
+    batch = pipeline_executor.stream_batch(uploaded_file, pipelines)
+    lines = [
+        json.loads(line) for line in "".join(batch_ndjson_stream(batch)).splitlines()
+    ]
+
+    rows = {}
+    for line in lines:
+        if "pipeline_info" in line:
+            current = rows.setdefault(line["pipeline"], [])
+        elif "transformed_shape" in line:
+            assert line["transformed_shape"][0] == len(rows[line["pipeline"]])
+        else:
+            current.append(line["name"])
+    assert sorted(rows["young"]) == ["alice", "diana"]
+    assert sorted(rows["old"]) == ["bob", "charlie", "eve"]
+
+
+def test_batch_rejects_invalid_pipelines(uploaded_file):
+    with pytest.raises(PipelineError) as error:
+        pipeline_executor.stream_batch(
+            uploaded_file, {"broken": TransformationPipeline([{"transformation": "x"}])}
+        )
+    assert "broken" in error.value.details["errors"]
+
+
+@pytest.fixture
+def partitioned_files(uploaded_file, tmp_path):
+    people = pd.read_csv(tmp_path / uploaded_file)
+    pd.DataFrame(
+        {
+            "name": ["frank", "grace", "heidi"],
+            "age": [30, 22, 35],
+            "city": ["paris", "tokyo", "paris"],
+        }
+    ).to_csv(tmp_path / "more_people.csv", index=False)
+    pd.concat([people, pd.read_csv(tmp_path / "more_people.csv")]).to_csv(
+        tmp_path / "all_people.csv", index=False
+    )
+    return ["people.csv", "more_people.csv"]
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        [
+            {
+                "transformation": "filter",
+                "params": {"column": "city", "operator": "eq", "value": "paris"},
+            },
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+        ],
+        [
+            {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+            {"transformation": "uppercase", "params": {"columns": "all"}},
+        ],
+        [{"transformation": "uppercase", "params": {"columns": ["city"]}}],
+    ],
+)
+def test_multi_file_execution_matches_concatenated_file(partitioned_files, steps):
+    executor = PipelineExecutor(
+        partition_pool=ExecutionPool(
+            pool_type="process", size=2, queue_size=0, timeout=60
+        )
+    )
+    try:
+        result = asyncio.run(
+            executor.execute_files(partitioned_files, TransformationPipeline(steps))
+        )
+    finally:
+        executor.shutdown()
+
+    expected = _execute("all_people.csv", steps)
+    assert result["data"] == expected["data"]
+    assert result["original_shape"] == expected["original_shape"] == (8, 3)
+    assert result["transformed_shape"] == expected["transformed_shape"]
+    assert result["pipeline_info"]["files"] == partitioned_files
+
+
+def test_multi_file_execution_merges_sorted_partitions(partitioned_files):
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+    result = asyncio.run(
+        pipeline_executor.execute_files(
+            partitioned_files, TransformationPipeline(steps)
+        )
+    )
+
+    assert result["pipeline_info"]["merged_sort"] is True
+    # Equal ages keep the order of the files
+    assert [row["name"] for row in result["data"]] == [
+        "grace",
+        "alice",
+        "diana",
+        "bob",
+        "frank",
+        "charlie",
+        "heidi",
+        "eve",
+    ]
+
+
+def test_multi_file_execution_per_file(partitioned_files):
+    filenames = resolve_files(pattern="*people.csv")
+    assert filenames == ["all_people.csv", "more_people.csv", "people.csv"]
+
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "tokyo"},
+        }
+    ]
+    results = asyncio.run(
+        pipeline_executor.execute_files(
+            filenames,
+            TransformationPipeline(steps),
+            combine=FileResultMode.PER_FILE,
+        )
+    )["results"]
+
+    assert list(results) == filenames
+    for filename in filenames:
+        assert results[filename]["data"] == _execute(filename, steps)["data"]
+
+
+def test_multi_file_selection_is_checked(partitioned_files):
+    with pytest.raises(FileError):
+        resolve_files(pattern="../*.csv")
+    with pytest.raises(FileError):
+        resolve_files(pattern="*.parquet")
+    with pytest.raises(FileError):
+        resolve_files(["people.csv", "missing.csv"])
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"streaming": True}, {"engine": "polars"}, {"optimize": False}],
+)
+def test_pagination_returns_page_of_full_result(uploaded_file, options):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gt", "value": 26},
+        },
+        {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+    ]
+    expected = _execute(uploaded_file, steps, **options)["data"]
+
+    page = _execute(uploaded_file, steps, limit=2, offset=1, **options)
+
+    assert page["data"] == expected[1:3]
+    assert page["transformed_shape"] == (2, 3)
+    assert page["pipeline_info"]["pagination"] == {"offset": 1, "limit": 2}
+
+
+def test_pagination_does_not_cache_partial_results(uploaded_file, monkeypatch):
+    monkeypatch.setattr(settings, "PREFIX_CACHE_ENABLED", True)
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+
+    assert len(_execute(uploaded_file, steps, limit=1)["data"]) == 1
+    assert len(_execute(uploaded_file, steps)["data"]) == 5
+
+
+def test_multi_file_pagination_applies_to_combined_result(partitioned_files):
+    steps = [{"transformation": "sort", "params": {"column": "age", "ascending": True}}]
+    expected = _execute("all_people.csv", steps)["data"]
+
+    result = asyncio.run(
+        pipeline_executor.execute_files(
+            partitioned_files,
+            TransformationPipeline(steps),
+            ExecutionOptions(limit=3, offset=2),
+        )
+    )
+
+    assert result["data"] == expected[2:5]
+
+
+def test_multi_file_execution_leaves_out_empty_partitions(uploaded_file, tmp_path):
+    pd.DataFrame({"name": ["alice", "bob"], "height": [1.6, 1.8]}).to_csv(
+        tmp_path / "heights.csv", index=False
+    )
+    # Filtered out entirely, the heights of this file would be read as text
+    pd.DataFrame({"name": ["ivan"], "height": ["unknown"]}).to_csv(
+        tmp_path / "more_heights.csv", index=False
+    )
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "name", "operator": "eq", "value": "bob"},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["name"]}},
+    ]
+    pipeline = TransformationPipeline(steps)
+    executor = PipelineExecutor(
+        partition_pool=ExecutionPool(
+            pool_type="process", size=2, queue_size=0, timeout=60
+        )
+    )
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = asyncio.run(
+                executor.execute_files(
+                    ["heights.csv", "more_heights.csv"],
+                    pipeline,
+                    ExecutionOptions(limit=5, optimize=False),
+                )
+            )
+    finally:
+        executor.shutdown()
+
+    assert result["data"] == [{"name": "BOB", "height": 1.8}]
+    # The page is not set on the caller's pipeline
+    assert pipeline.head is None
+
+
+@pytest.mark.parametrize(
+    "sort",
+    [
+        {"column": "age", "ascending": False},
+        {"column": ["city", "age"], "ascending": [True, False]},
+    ],
+)
+def test_streaming_sort_spills_sorted_runs(uploaded_file, tmp_path, monkeypatch, sort):
+    monkeypatch.setattr(settings, "EXTERNAL_SORT_RUN_ROWS", 2)
+    monkeypatch.setattr(settings, "EXTERNAL_SORT_DIRECTORY", str(tmp_path))
+    steps = [
+        {"transformation": "uppercase", "params": {"columns": ["name"]}},
+        {"transformation": "sort", "params": sort},
+    ]
+
+    streamed = _execute(uploaded_file, steps, streaming=True)
+    in_memory = _execute(uploaded_file, steps)
+
+    assert streamed["data"] == in_memory["data"]
+    assert streamed["transformed_shape"] == (5, 3)
+    assert [path.name for path in tmp_path.iterdir()] == [uploaded_file]
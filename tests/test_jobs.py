@@ -0,0 +1,103 @@
+import time
+
+import pandas as pd
+import pytest
+
+from app.configs.base import settings
+from app.enums.transform import JobStatus
+from app.exception.errors import JobNotFoundError, JobNotReadyError, PipelineError
+from app.services.jobs.job import Job, utc_now
+from app.services.jobs.manager import JobManager
+from app.services.transform.pipeline import TransformationPipeline
+
+STEPS = [
+    {
+        "transformation": "filter",
+        "params": {"column": "city", "operator": "eq", "value": "paris"},
+    },
+    {"transformation": "uppercase", "params": {"columns": ["name"]}},
+    {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+    pd.DataFrame(
+        {
+            "name": ["alice", "bob", "charlie", "diana", "eve"],
+            "age": [25, 30, 35, 28, 41],
+            "city": ["paris", "london", "paris", "tokyo", "paris"],
+        }
+    ).to_csv(tmp_path / "people.csv", index=False)
+
+    manager = JobManager(directory=str(tmp_path / "jobs"), workers=1, queue_size=4)
+    yield manager
+    manager.shutdown()
+
+
+def _wait(manager, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.is_finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_job_result_is_persisted(manager):
+    job = manager.submit("people.csv", TransformationPipeline(STEPS))
+    assert job.status == JobStatus.QUEUED
+
+    job = _wait(manager, job.id)
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.completed_steps == job.total_steps == 3
+    assert job.transformed_shape == [3, 3]
+    result = pd.read_json(manager.result_path(job.id), lines=True)
+    assert result["name"].tolist() == ["EVE", "CHARLIE", "ALICE"]
+
+
+def test_failed_job_reports_error(manager):
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "country", "operator": "eq", "value": "fr"},
+        }
+    ]
+    job = _wait(manager, manager.submit("people.csv", TransformationPipeline(steps)).id)
+
+    assert job.status == JobStatus.FAILED
+    assert "country" in job.error["details"]["error"]
+    with pytest.raises(JobNotReadyError):
+        manager.result_path(job.id)
+
+
+def test_invalid_pipeline_and_unknown_job_are_rejected(manager):
+    with pytest.raises(PipelineError):
+        manager.submit("people.csv", TransformationPipeline([{"transformation": "x"}]))
+    with pytest.raises(JobNotFoundError):
+        manager.get("../people.csv")
+
+
+def test_interrupted_jobs_are_queued_again(manager):
+    interrupted = Job(
+        id="0" * 32,
+        filename="people.csv",
+        steps=STEPS,
+        options={},
+        status=JobStatus.RUNNING,
+        created_at=utc_now(),
+        completed_steps=1,
+    )
+    manager.store.save(interrupted)
+
+    assert manager.recover() == [interrupted.id]
+    job = _wait(manager, interrupted.id)
+
+    assert job.status == JobStatus.SUCCEEDED
+    manager.delete(job.id)
+    with pytest.raises(JobNotFoundError):
+        manager.get(job.id)
@@ -0,0 +1,242 @@
+import pandas as pd
+import pytest
+
+from app.services.transform.engines import get_engine
+from app.services.transform.pipeline import TransformationPipeline
+
+DATA = pd.DataFrame(
+    {
+        "name": ["alice", "bob", "charlie", "dave", "eve"],
+        "age": [25, 30, 35, 30, 40],
+        "city": ["paris", "london", "paris", "berlin", "paris"],
+    }
+)
+
+
+def _optimize(steps):
+    return TransformationPipeline(steps).optimize()
+
+
+def test_filter_is_pushed_ahead_of_uppercase_and_sort():
+    pipeline = _optimize(
+        [
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gt", "value": 28},
+            },
+        ]
+    )
+
+    assert [step["transformation"] for step in pipeline.steps] == [
+        "filter",
+        "uppercase",
+        "sort",
+    ]
+    assert len(pipeline.optimizations) == 2
+
+
+def test_filter_is_not_pushed_ahead_of_step_changing_its_column():
+    steps = [
+        {"transformation": "uppercase", "params": {"columns": ["city"]}},
+        {
+            "transformation": "filter",
+            "params": {"column": "city", "operator": "eq", "value": "PARIS"},
+        },
+    ]
+
+    assert _optimize(steps).steps == steps
+
+
+def test_filter_is_pushed_ahead_of_rename_using_source_column():
+    pipeline = _optimize(
+        [
+            {
+                "transformation": "map_column",
+                "params": {"type": "rename", "mapping": {"city": "town"}},
+            },
+            {
+                "transformation": "filter",
+                "params": {"column": "town", "operator": "eq", "value": "paris"},
+            },
+        ]
+    )
+
+    assert pipeline.steps[0]["params"]["column"] == "city"
+    assert pipeline.steps[1]["transformation"] == "map_column"
+
+
+def test_filter_condition_tree_is_renamed_when_pushed():
+    pipeline = _optimize(
+        [
+            {
+                "transformation": "map_column",
+                "params": {"type": "rename", "mapping": {"city": "town"}},
+            },
+            {
+                "transformation": "filter",
+                "params": {
+                    "or": [
+                        {"column": "town", "operator": "eq", "value": "paris"},
+                        {
+                            "not": {
+                                "column": "town",
+                                "operator": "contains",
+                                "value": "o",
+                            }
+                        },
+                    ]
+                },
+            },
+        ]
+    )
+
+    conditions = pipeline.steps[0]["params"]["or"]
+    assert conditions[0]["column"] == "city"
+    assert conditions[1]["not"]["column"] == "city"
+
+
+def test_adjacent_filters_are_fused():
+    pipeline = _optimize(
+        [
+            {
+                "transformation": "filter",
+                "params": {"column": "city", "operator": "eq", "value": "paris"},
+            },
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gt", "value": 30},
+            },
+        ]
+    )
+
+    assert len(pipeline.steps) == 1
+    assert len(pipeline.steps[0]["params"]["and"]) == 2
+
+
+def test_sort_superseded_by_later_sort_is_dropped():
+    pipeline = _optimize(
+        [
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+        ]
+    )
+
+    assert [step["transformation"] for step in pipeline.steps] == [
+        "uppercase",
+        "sort",
+    ]
+
+
+def test_sort_on_other_key_is_kept():
+    steps = [
+        {"transformation": "sort", "params": {"column": "name", "ascending": True}},
+        {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+    ]
+
+    assert _optimize(steps).steps == steps
+
+
+def test_consecutive_renames_are_collapsed():
+    pipeline = _optimize(
+        [
+            {
+                "transformation": "map_column",
+                "params": {"type": "rename", "mapping": {"city": "town"}},
+            },
+            {
+                "transformation": "map_column",
+                "params": {
+                    "type": "rename",
+                    "mapping": {"town": "place", "age": "years"},
+                },
+            },
+        ]
+    )
+
+    assert pipeline.steps == [
+        {
+            "transformation": "map_column",
+            "params": {
+                "type": "rename",
+                "mapping": {"city": "place", "age": "years"},
+            },
+        }
+    ]
+
+
+def test_optimized_pipeline_produces_the_same_result():
+    steps = [
+        {"transformation": "sort", "params": {"column": "name", "ascending": False}},
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"city": "town"}},
+        },
+        {"transformation": "uppercase", "params": {"columns": ["name"]}},
+        {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+        {
+            "transformation": "filter",
+            "params": {"column": "town", "operator": "eq", "value": "paris"},
+        },
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gte", "value": 30},
+        },
+    ]
+    pipeline = TransformationPipeline(steps)
+    optimized = pipeline.optimize()
+
+    assert optimized.optimizations
+    assert optimized.get_pipeline_info()["steps"] == steps
+    pd.testing.assert_frame_equal(
+        optimized.execute(DATA).reset_index(drop=True),
+        pipeline.execute(DATA).reset_index(drop=True),
+    )
+
+
+def test_errors_name_the_steps_as_written():
+    steps = [
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"city": "town"}},
+        },
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"age": "years"}},
+        },
+        {"transformation": "sort", "params": {"column": "years", "ascending": True}},
+        {
+            "transformation": "map_column",
+            "params": {"type": "value_map", "column": "missing", "mapping": {"a": 1}},
+        },
+    ]
+    optimized = TransformationPipeline(steps).optimize()
+
+    assert optimized.step_sources == [[1, 2], [3], [4]]
+    assert optimized.describe_step(0) == "steps 1, 2 (optimized step 1)"
+    assert optimized.describe_step(2) == "step 4 (optimized step 3)"
+    with pytest.raises(Exception, match=r"Error in step 4 \(optimized step 3\)"):
+        optimized.execute(DATA)
+    with pytest.raises(Exception, match=r"Error in step 4 \(optimized step 3\)"):
+        get_engine("polars").execute(optimized, DATA)
+
+
+def test_sources_follow_filters_pushed_ahead_and_fused():
+    optimized = _optimize(
+        [
+            {"transformation": "sort", "params": {"column": "age", "ascending": True}},
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gte", "value": 30},
+            },
+            {
+                "transformation": "filter",
+                "params": {"column": "city", "operator": "eq", "value": "paris"},
+            },
+        ]
+    )
+
+    assert [step["transformation"] for step in optimized.steps] == ["filter", "sort"]
+    assert optimized.step_sources == [[2, 3], [1]]
@@ -1,6 +1,9 @@
 import pandas as pd
 
+from app.services import registry
 from app.services.transform.pipeline import TransformationPipeline
+from app.services.transform.prefix_cache import prefix_cache
+from app.transformations.base import BaseTransformation
 
 
 def test_complete_pipeline_workflow():
@@ -48,3 +51,116 @@ def test_pipeline_formats():
     yaml_result = TransformationPipeline.from_yaml(yaml_pipeline)
 
     assert json_result.steps == yaml_result.steps
+
+
+def test_execute_chunks_matches_in_memory_execution():
+    data = pd.DataFrame(
+        {
+            "name": ["alice", "bob", "charlie", "diana", "eve"],
+            "age": [25, 30, 35, 28, 41],
+        }
+    )
+    pipeline = TransformationPipeline(
+        [
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gt", "value": 26},
+            },
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {"transformation": "sort", "params": {"column": "age", "ascending": False}},
+        ]
+    )
+
+    row_wise, remaining = pipeline.split_row_wise()
+    assert [step["transformation"] for step in row_wise] == ["filter", "uppercase"]
+    assert [step["transformation"] for step in remaining] == ["sort"]
+
+    chunks = [data.iloc[i : i + 2] for i in range(0, len(data), 2)]
+    batches = list(pipeline.execute_chunks(chunks))
+
+    assert len(batches) == 1
+    pd.testing.assert_frame_equal(batches[0], pipeline.execute(data))
+
+
+def test_projected_columns_follow_renames():
+    available = ["id", "first_name", "last_name", "age", "city", "status"]
+    pipeline = TransformationPipeline(
+        [
+            {
+                "transformation": "map_column",
+                "params": {"type": "rename", "mapping": {"first_name": "name"}},
+            },
+            {"transformation": "uppercase", "params": {"columns": ["name"]}},
+            {
+                "transformation": "filter",
+                "params": {"column": "age", "operator": "gt", "value": 30},
+            },
+        ]
+    )
+
+    assert pipeline.projected_columns(available) == ["first_name", "age"]
+
+    pipeline.add_step("uppercase", {"columns": "all"})
+    assert pipeline.projected_columns(available) is None
+
+
+class _IncrementInPlace(BaseTransformation):
+    def __init__(self):
+        super().__init__(name="increment_in_place")
+
+    def transform(self, data, params):
+        data[params["column"]] += 1
+        return data
+
+    def validate_params(self, params):
+        return "column" in params
+
+
+def test_execute_does_not_modify_input():
+    data = pd.DataFrame({"name": ["alice", "bob"], "age": [25, 30]})
+    registry.register(_IncrementInPlace())
+    try:
+        result = TransformationPipeline(
+            [
+                {
+                    "transformation": "map_column",
+                    "params": {"type": "rename", "mapping": {"name": "first_name"}},
+                },
+                {"transformation": "increment_in_place", "params": {"column": "age"}},
+                {"transformation": "uppercase", "params": {"columns": ["first_name"]}},
+            ]
+        ).execute(data)
+    finally:
+        registry.unregister("increment_in_place")
+
+    assert result["age"].tolist() == [26, 31]
+    assert result["first_name"].tolist() == ["ALICE", "BOB"]
+    assert data.to_dict(orient="list") == {"name": ["alice", "bob"], "age": [25, 30]}
+
+
+def test_execute_resumes_from_longest_cached_prefix():
+    data = pd.DataFrame({"name": ["bob", "alice", "carol"], "age": [30, 25, 35]})
+    prefix_cache.clear()
+    steps = [
+        {
+            "transformation": "filter",
+            "params": {"column": "age", "operator": "gt", "value": 26},
+        },
+        {
+            "transformation": "map_column",
+            "params": {"type": "rename", "mapping": {"name": "first_name"}},
+        },
+    ]
+    TransformationPipeline(steps).execute(data, source="people")
+
+    pipeline = TransformationPipeline(
+        steps + [{"transformation": "uppercase", "params": {"columns": ["first_name"]}}]
+    )
+    result = pipeline.execute(data, source="people")
+
+    assert pipeline.prefix_cache_info["hit_depth"] == 2
+    assert result["first_name"].tolist() == ["BOB", "CAROL"]
+
+    other = TransformationPipeline(steps)
+    other.execute(data, source="other people")
+    assert other.prefix_cache_info["hit_depth"] == 0
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.dtos.transform.response import TransformResponse
+from app.utils.response_util import FastJSONResponse
+
+
+def test_fast_json_response_matches_response_model():
+    result = {
+        "original_shape": (3, 2),
+        "transformed_shape": (3, 2),
+        "pipeline_info": {"steps": [], "step_count": 0},
+        "data": pd.DataFrame({"name": ["a", "b", "c"], "age": [1, 2, 3]}).to_dict(
+            orient="records"
+        ),
+    }
+
+    body = json.loads(FastJSONResponse(result).body)
+
+    assert body == json.loads(TransformResponse(**result).model_dump_json())
+
+
+def test_fast_json_response_encodes_missing_values_and_numpy_scalars():
+    data = pd.DataFrame(
+        {
+            "score": [1.5, np.nan],
+            "seen": [pd.Timestamp("2024-01-02 03:04:05"), pd.NaT],
+            "name": ["a", None],
+        }
+    ).to_dict(orient="records")
+
+    body = json.loads(
+        FastJSONResponse({"data": data, "total": np.int64(2), "na": pd.NA}).body
+    )
+
+    assert body == {
+        "data": [
+            {"score": 1.5, "seen": "2024-01-02T03:04:05", "name": "a"},
+            {"score": None, "seen": None, "name": None},
+        ],
+        "total": 2,
+        "na": None,
+    }
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -9,6 +10,7 @@ from app.transformations.implementations import (
     SortTransformation,
     UppercaseTransformation,
 )
+from app.utils.aho_corasick import AhoCorasick
 
 
 class TestFilterTransformation:
@@ -41,13 +43,72 @@ class TestFilterTransformation:
         assert len(result) == 1
         assert result.iloc[0]["city"] == "London"
 
+    def test_filter_condition_tree(self):
+        params = {
+            "or": [
+                {
+                    "and": [
+                        {"column": "age", "operator": "gte", "value": 28},
+                        {"not": {"column": "city", "operator": "eq", "value": "Paris"}},
+                    ]
+                },
+                {"column": "name", "operator": "contains", "value": "lic"},
+            ]
+        }
+        result = self.filter_transform.transform(self.test_data, params)
+        assert result["name"].tolist() == ["Alice", "Bob", "Diana"]
+
+    def test_filter_condition_tree_with_missing_values(self):
+        data = pd.DataFrame({"score": pd.array([1, None, 3], dtype="Int64")})
+        params = {"not": {"column": "score", "operator": "gt", "value": 2}}
+        result = self.filter_transform.transform(data, params)
+        assert result.index.tolist() == [0]
+
+    def test_filter_in_and_not_in(self):
+        params = {"column": "age", "operator": "in", "value": [25, 35, 99]}
+        result = self.filter_transform.transform(self.test_data, params)
+        assert result["name"].tolist() == ["Alice", "Charlie"]
+
+        params = {"column": "city", "operator": "not_in", "value": ["Paris", "Tokyo"]}
+        result = self.filter_transform.transform(self.test_data, params)
+        assert result["name"].tolist() == ["Alice", "Bob"]
+
+    def test_filter_contains_any(self):
+        params = {
+            "column": "city",
+            "operator": "contains_any",
+            "value": ["ari", "York", "o.*"],
+        }
+        result = self.filter_transform.transform(self.test_data, params)
+        assert result["city"].tolist() == ["New York", "Paris"]
+
+    def test_contains_any_automaton_shares_prefixes(self):
+        automaton = AhoCorasick(["banana"] * 1000 + ["band"])
+        # The root, one state per character of "banana" and one for the "d"
+        assert len(automaton._goto) == 8
+        assert automaton.search("a bandana")
+        assert not automaton.search("ananas")
+
     def test_validate_params(self):
         valid_params = {"column": "age", "operator": "eq", "value": 30}
         assert self.filter_transform.validate_params(valid_params)
+        assert self.filter_transform.validate_params(
+            {"column": "age", "operator": "in", "value": [25, 30]}
+        )
+        assert not self.filter_transform.validate_params(
+            {"column": "age", "operator": "in", "value": 25}
+        )
+        assert not self.filter_transform.validate_params(
+            {"column": "city", "operator": "contains_any", "value": ["on", 1]}
+        )
 
         invalid_params = {"column": "age", "operator": "invalid", "value": 30}
         assert not self.filter_transform.validate_params(invalid_params)
 
+        assert self.filter_transform.validate_params({"not": valid_params})
+        assert not self.filter_transform.validate_params({"or": []})
+        assert not self.filter_transform.validate_params({"not": [valid_params]})
+
 
 class TestMapColumnTransformation:
     def setup_method(self):
@@ -71,6 +132,40 @@ class TestMapColumnTransformation:
         result = self.map_transform.transform(self.test_data, params)
         assert result["status"].tolist() == [1, 0]
 
+    def test_value_mapping_keeps_unmapped_and_missing_values(self):
+        data = pd.DataFrame({"status": ["active", np.nan, "closed", "active"]})
+        params = {"type": "value_map", "column": "status", "mapping": {"active": "on"}}
+        result = self.map_transform.transform(data, params)
+        assert result["status"].tolist()[::2] == ["on", "closed"]
+        assert pd.isna(result["status"].iloc[1])
+        assert result["status"].iloc[3] == "on"
+
+    def test_value_mapping_on_categories(self):
+        data = pd.DataFrame(
+            {"status": pd.Categorical(["active", "inactive", None, "pending"])}
+        )
+        params = {
+            "type": "value_map",
+            "column": "status",
+            "mapping": {"active": "open", "pending": "open", "unused": "x"},
+        }
+        result = self.map_transform.transform(data, params)
+
+        assert isinstance(result["status"].dtype, pd.CategoricalDtype)
+        assert list(result["status"].cat.categories) == ["inactive", "open"]
+        assert result["status"].tolist()[:2] == ["open", "inactive"]
+        assert pd.isna(result["status"].iloc[2])
+        assert result["status"].iloc[3] == "open"
+
+    def test_value_mapping_leaves_input_untouched(self):
+        params = {"type": "value_map", "column": "status", "mapping": {"active": 1}}
+        result = self.map_transform.transform(self.test_data, params)
+
+        assert self.test_data["status"].tolist() == ["active", "inactive"]
+        assert np.shares_memory(
+            result["first_name"].to_numpy(), self.test_data["first_name"].to_numpy()
+        )
+
     def test_validate_params(self):
         valid_params = {"type": "rename", "mapping": {"old": "new"}}
         assert self.map_transform.validate_params(valid_params)
@@ -99,6 +194,15 @@ class TestUppercaseTransformation:
         assert result["name"].tolist() == ["ALICE", "BOB"]
         assert result["city"].tolist() == ["new york", "london"]  # unchanged
 
+    def test_uppercase_leaves_input_untouched(self):
+        params = {"columns": ["name"]}
+        result = self.uppercase_transform.transform(self.test_data, params)
+
+        assert self.test_data["name"].tolist() == ["alice", "bob"]
+        assert np.shares_memory(
+            result["city"].to_numpy(), self.test_data["city"].to_numpy()
+        )
+
     def test_validate_params(self):
         valid_params = {"columns": ["name"]}
         assert self.uppercase_transform.validate_params(valid_params)
@@ -255,6 +359,41 @@ class TestSortTransformation:
         result = self.sort_transform.transform(self.test_data, params)
         assert result["name"].tolist() == ["charlie", "bob", "alice"]
 
+    def test_sort_on_several_columns_is_stable(self):
+        data = pd.DataFrame(
+            {
+                "name": list("abcdef"),
+                "city": ["paris", "tokyo", "paris", "tokyo", "paris", "tokyo"],
+                "age": [30, 25, 35, 25, 30, np.nan],
+            }
+        )
+        params = {"column": ["city", "age"], "ascending": [True, False]}
+
+        assert self.sort_transform.validate_params(params)
+        result = self.sort_transform.transform(data, params)
+        assert result["name"].tolist() == ["c", "a", "e", "b", "d", "f"]
+
+    def test_sort_rejects_mismatched_directions(self):
+        params = {"column": ["city", "age"], "ascending": [True]}
+        assert not self.sort_transform.validate_params(params)
+
+    @pytest.mark.parametrize("ascending", [True, False])
+    @pytest.mark.parametrize("n", [1, 3, 5, 10])
+    def test_sort_head_matches_full_sort(self, ascending, n):
+        data = pd.DataFrame(
+            {
+                "name": list("abcdefgh"),
+                "score": [2.0, np.nan, 1.0, 2.0, 3.0, np.nan, 1.0, 2.0],
+            },
+            index=[0, 0, 1, 1, 2, 2, 3, 3],
+        )
+        params = {"column": "score", "ascending": ascending}
+
+        result = self.sort_transform.transform_head(data, params, n)
+
+        expected = self.sort_transform.transform(data, params).head(n)
+        assert result["name"].tolist() == expected["name"].tolist()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])